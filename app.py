@@ -2,24 +2,42 @@
 # Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Viana Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
 # EN: This file runs the Flask web app for accessibility analysis. Why? To provide an accessible interface for URL analysis and predictive guides. How? Uses Flask routes and SpeechSynthesis.
 # PT: Este arquivo executa a aplicação web Flask para análise de acessibilidade. Por quê? Para fornecer uma interface acessível para análise de URLs e guias preditivos. Como? Usa rotas Flask e SpeechSynthesis.
-from flask import Flask, render_template, request, session, g, redirect, url_for
+from flask import (
+    Flask,
+    render_template,
+    request,
+    session,
+    g,
+    redirect,
+    url_for,
+    jsonify,
+    make_response,
+    Response,
+    stream_with_context,
+    has_request_context,
+)
 from flask_babel import Babel, gettext, ngettext, _, lazy_gettext
 from datetime import timedelta  # FIX: Import pra permanent session
-import joblib
-import pandas as pd
-from collector import analisar_url_rapida, analisar_url_completa
+from collector import analisar_url_rapida, analisar_url_completa, analisar_site
 import logging
-from tenacity import RetryError
-import torch
-import torch.nn as nn
-import numpy as np
 import os
-
-# EN: Setup logging for web app. Why? To track requests and errors for debugging.
-# PT: Configura o logging para a aplicação web. Por quê? Para rastrear requisições e erros para depuração.
-logging.basicConfig(
-    filename="erros_app.log", level=logging.ERROR, format="%(asctime)s - %(message)s"
-)
+import json
+import time
+import threading
+import functools
+from utils.log import configurar_logging, PayloadLimitado
+from utils.fila_jobs import FilaJobs, FilaCheia, NA_FILA, EXECUTANDO, FALHOU
+from utils.armazem_features import ArmazemFeatures
+from utils.perfilamento import PERFIL_HABILITADO, Perfilador, requisicao_pede_perfil
+from utils.modelo import ModeloAcessibilidade
+from utils.registro_modelos import RegistroModelos
+from utils.triagem import LIMIAR_TRIAGEM, Triagem
+from utils.prazo import PRAZO_COMPLETA_S, PRAZO_RAPIDA_S, Prazo
+
+# EN: Setup logging for web app. Why? To track requests and errors for debugging. How? Queue-backed handler, so writing logs never blocks a request.
+# PT: Configura o logging para a aplicação web. Por quê? Para rastrear requisições e erros para depuração. Como? Handler com fila, para que escrever logs nunca bloqueie uma requisição.
+configurar_logging("erros_app.log", nivel=logging.ERROR)
+logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config["SECRET_KEY"] = (
     "dev"  # TODO: Em produção, use um valor secreto gerado por os.urandom(24)
@@ -48,66 +66,55 @@ def inject_locale():
     return dict(locale=get_locale())
 
 
-# ALTERAÇÃO: Definir a classe AccessibilityNet ANTES do try, para evitar "name not defined", e com BatchNorm para matching the trainer.
-class AccessibilityNet(nn.Module):
-    def __init__(self, input_size):
-        super(AccessibilityNet, self).__init__()
-        self.fc1 = nn.Linear(input_size, 512)  # Wider layers from option 5
-        self.bn1 = nn.BatchNorm1d(512)  # BatchNorm for stable gradients
-        self.dropout1 = nn.Dropout(0.3)  # Increased to 0.3 for less overfit
-        self.fc2 = nn.Linear(512, 256)
-        self.bn2 = nn.BatchNorm1d(256)
-        self.dropout2 = nn.Dropout(0.3)
-        self.fc3 = nn.Linear(256, 128)
-        self.bn3 = nn.BatchNorm1d(128)
-        self.dropout3 = nn.Dropout(0.3)
-        self.fc4 = nn.Linear(128, 1)
-
-    def forward(self, x):
-        x = torch.relu(self.bn1(self.fc1(x)))
-        x = self.dropout1(x)
-        x = torch.relu(self.bn2(self.fc2(x)))
-        x = self.dropout2(x)
-        x = torch.relu(self.bn3(self.fc3(x)))
-        x = self.dropout3(x)
-        x = self.fc4(x)
-        return x
-
-
-# ALTERAÇÃO: Lógica de carregamento do modelo e dos artefatos
+# ALTERAÇÃO: Carregamento do modelo e dos artefatos (rede, scaler e features em utils.modelo)
+# EN: Model registry (utils.registro_modelos). Why? New versions published under models/<version>/ go live without a restart. How? Loads the newest valid version now and rescans every PREVISIA_MODELOS_INTERVALO_S seconds; each request or job pins the model it started with.
+# PT: Registro de modelos (utils.registro_modelos). Por quê? Novas versões publicadas em models/<versão>/ entram no ar sem reinício. Como? Carrega agora a versão válida mais nova e reexamina a cada PREVISIA_MODELOS_INTERVALO_S segundos; cada requisição ou job fixa o modelo com que começou.
 DIRETORIO_MODELO = "models"
-modelo = None
-scaler = None
-feature_names = None
+registro = RegistroModelos(DIRETORIO_MODELO)
 try:
-    # Carrega os nomes das features e o scaler, que foram salvos com joblib
-    path_features = os.path.join(DIRETORIO_MODELO, "feature_names.pkl")
-    path_scaler = os.path.join(DIRETORIO_MODELO, "scaler.pkl")
-    path_modelo = os.path.join(
-        DIRETORIO_MODELO, "modelo_acessibilidade.pt"
-    )  # Usar o arquivo .pt
-    feature_names = joblib.load(path_features)
-    scaler = joblib.load(path_scaler)
-
-    # Instancia o modelo com o número correto de features de entrada
-    input_size = len(feature_names)
-    modelo = AccessibilityNet(input_size)
-
-    # Carrega os pesos (o estado) do modelo treinado
-    modelo.load_state_dict(torch.load(path_modelo))
-
-    # Coloca o modelo em modo de avaliação (importante para camadas como Dropout)
-    modelo.eval()
-
-    print("Modelo PyTorch, scaler e features carregados com sucesso.")
-except FileNotFoundError as e:
-    logging.error(
-        f"EN: Model artifact not found: {e}. PT: Artefato do modelo não encontrado: {e}."
-    )
-    print(f"Erro: Arquivo do modelo não encontrado. Verifique o caminho: {e}")
+    registro.verificar()
 except Exception as e:
-    logging.error(f"EN: Error loading model: {e}. PT: Erro ao carregar o modelo: {e}.")
-    print(f"Erro ao carregar o modelo: {e}")
+    logger.error(
+        "EN: Error loading model: %s. PT: Erro ao carregar o modelo: %s.", e, e
+    )
+if registro.atual() is not None:
+    print(
+        f"Modelo PyTorch, scaler e features carregados com sucesso (versão {registro.versao})."
+    )
+else:
+    logger.error(
+        "EN: No valid model version in %s. PT: Nenhuma versão válida do modelo em %s.",
+        DIRETORIO_MODELO,
+        DIRETORIO_MODELO,
+    )
+    print(
+        f"Erro: nenhuma versão válida do modelo em {DIRETORIO_MODELO}. Verifique o caminho."
+    )
+registro.iniciar()
+
+
+def modelo_da_requisicao() -> ModeloAcessibilidade | None:
+    """
+    The model pinned to the current request (the active one at its first use).
+
+    EN: Why? A swap in the middle of a request must not mix versions in one response. How? Stored in flask.g; outside a request it is simply the active model.
+    PT: Por quê? Uma troca no meio de uma requisição não pode misturar versões em uma resposta. Como? Guardado em flask.g; fora de uma requisição é simplesmente o modelo ativo.
+    """
+    if not has_request_context():
+        return registro.atual()
+    if "modelo" not in g:
+        g.modelo = registro.atual()
+        g.versao_modelo = g.modelo.versao if g.modelo is not None else None
+    return g.modelo
+
+
+@app.after_request
+def informar_versao_modelo(resposta):
+    # Versão que produziu a resposta (a do job, nos resultados de análises completas)
+    versao = g.get("versao_modelo")
+    if versao:
+        resposta.headers["X-PrevisIA-Modelo"] = versao
+    return resposta
 
 
 def gerar_guia_preditivo(features, score, url):
@@ -218,106 +225,508 @@ def set_language():
     return redirect(url_for("home"))
 
 
+def prever_score(features: dict, modelo: ModeloAcessibilidade = None) -> int:
+    """
+    Predicts the accessibility score (0-100) from extracted features.
+
+    :param features: Dictionary of features from the collector.
+    :param modelo: Model version to use (default: the one pinned to the current request).
+    :return: Score between 0 and 100.
+
+    EN: Why? Shared by the synchronous quick path and the background full-analysis jobs. How? utils.modelo applies the trainer's transformations, the scaler, then AccessibilityNet.
+    PT: Por quê? Compartilhado pelo caminho rápido síncrono e pelos jobs de análise completa em segundo plano. Como? utils.modelo aplica as transformações do trainer, o scaler e depois a AccessibilityNet.
+    """
+    modelo = modelo or modelo_da_requisicao()
+    registro.contar_previsao(modelo.versao)
+    return modelo.prever([features])[0]
+
+
+def executar_analise_completa(
+    url: str,
+    perfilar: bool = False,
+    site: bool = False,
+    decisao: dict = None,
+    prazo: Prazo = None,
+) -> dict:
+    """
+    Runs a full analysis (with quick fallback) inside a background job.
+
+    :param url: URL to analyze.
+    :param perfilar: Profile this analysis (the submitting request opted in).
+    :param site: Crawl and aggregate several pages of the site (collector.analisar_site) instead of the home page only.
+    :param decisao: Triage decision that sent this URL to the audit; logged with the observed error once the audit finishes.
+    :param prazo: Deadline created when /predict submitted the job (it includes the queue wait).
+    :return: Dictionary with url, features, score, the model version that scored it, whether the fallback was used and, if the deadline cut the audit, the step it cut ("parcial").
+    :raises RuntimeError: If no features could be extracted (also when the deadline ran out before the download).
+
+    EN: Why? Chromium must run outside the Flask request. How? Called by the FilaJobs workers; the guide is built later, in the request that renders the result, so it uses that user's locale.
+    PT: Por quê? O Chromium precisa rodar fora da requisição Flask. Como? Chamada pelos workers da FilaJobs; o guia é montado depois, na requisição que renderiza o resultado, para usar o locale daquele usuário.
+    """
+    if perfilar and perfilador is not None:
+        return perfilador.executar(
+            f"{'site' if site else 'completa'}_{url}",
+            executar_analise_completa,
+            url,
+            site=site,
+            decisao=decisao,
+            prazo=prazo,
+        )
+    # Fixa a versão no início: uma troca durante a auditoria não afeta este job
+    modelo = registro.atual()
+    if site:
+        features = analisar_site(url, prazo=prazo)
+    else:
+        features = analisar_url_completa(url, prazo=prazo)
+    fallback = False
+    if decisao is not None and triagem is not None:
+        # Erro observado: previsão rápida contra o score do Axe (sem ele, se a auditoria falhou)
+        triagem.registrar(decisao, (features or {}).get("label_score_acessibilidade"))
+    if features is None:
+        if prazo is not None and prazo.esgotado():
+            raise RuntimeError(
+                f"Prazo de {prazo.segundos:g} s esgotado antes da análise de {url}"
+            )
+        logger.warning("Fallback para análise rápida para %s", url)
+        features = analisar_url_rapida(url, prazo)
+        fallback = True
+    if not features:
+        raise RuntimeError(f"Falha ao extrair características da URL: {url}")
+    return {
+        "url": url,
+        "features": features,
+        "score": prever_score(features, modelo),
+        "versao_modelo": modelo.versao,
+        "fallback": fallback,
+        "parcial": features.get("carga_prazo_esgotado"),
+    }
+
+
+# EN: Background queue for full analyses. Why? Caps concurrent Chromium audits and waiting jobs. How? Jobs live in this process's memory, so run a single app process with threads (e.g. gunicorn --workers 1 --threads 8).
+# PT: Fila em segundo plano para análises completas. Por quê? Limita auditorias Chromium simultâneas e jobs em espera. Como? Os jobs vivem na memória deste processo, então rode um único processo do app com threads (ex.: gunicorn --workers 1 --threads 8).
+WORKERS_AUDITORIA = int(os.environ.get("PREVISIA_WORKERS_AUDITORIA", 2))
+MAX_JOBS_PENDENTES = int(os.environ.get("PREVISIA_MAX_JOBS_PENDENTES", 8))
+fila_completa = FilaJobs(
+    executar_analise_completa,
+    workers=WORKERS_AUDITORIA,
+    max_pendentes=MAX_JOBS_PENDENTES,
+)
+
+
+# EN: Optional confidence-based triage of full analyses (utils.triagem). Why? Skips the Chromium audit when the quick prediction is already certain. How? Only created when PREVISIA_TRIAGEM_LIMIAR is set and the model loaded; decisions and observed errors go to data/triagem.jsonl.
+# PT: Triagem opcional das análises completas por confiança (utils.triagem). Por quê? Dispensa a auditoria no Chromium quando a previsão rápida já é certa. Como? Só é criada com PREVISIA_TRIAGEM_LIMIAR definido e o modelo carregado; decisões e erros observados vão para data/triagem.jsonl.
+# Cada decisão usa o modelo fixado na requisição (triagem.avaliar(..., modelo_da_requisicao()))
+triagem = (
+    Triagem(registro.atual())
+    if registro.atual() is not None and LIMIAR_TRIAGEM > 0
+    else None
+)
+
+
+# EN: Read-only view of the feature store written by the orchestrator. Why? Known sites are answered from stored full audits. How? Freshness policy (PREVISIA_ARMAZEM_MAX_DIAS) decides when to recompute.
+# PT: Visão somente leitura do armazém de features gravado pelo orquestrador. Por quê? Sites conhecidos são respondidos com auditorias completas armazenadas. Como? A política de frescor (PREVISIA_ARMAZEM_MAX_DIAS) decide quando recalcular.
+armazem = ArmazemFeatures(somente_leitura=True)
+
+
+# EN: Opt-in profiler (utils.perfilamento). Why? Shows where a slow /predict spends time and memory. How? Only created when PREVISIA_PROFILE or PREVISIA_PROFILE_TOKEN is set; otherwise the decorator is a None check.
+# PT: Perfilador opcional (utils.perfilamento). Por quê? Mostra onde um /predict lento gasta tempo e memória. Como? Só é criado com PREVISIA_PROFILE ou PREVISIA_PROFILE_TOKEN definidos; caso contrário o decorador é uma checagem de None.
+perfilador = Perfilador() if PERFIL_HABILITADO else None
+
+
+def perfilado(funcao):
+    """
+    Decorator that profiles a view when the request opts in (g.perfilar tells the view).
+    """
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if perfilador is None or not requisicao_pede_perfil(request.headers):
+            return funcao(*args, **kwargs)
+        g.perfilar = True
+        with perfilador.perfilar(f"{request.method}_{request.path}"):
+            return funcao(*args, **kwargs)
+
+    return envoltorio
+
+
+def responder_armazenado(url: str, features: dict):
+    """
+    Answers /predict from a stored full audit (HTML page or a single SSE event).
+    """
+    armazenado_em = features.pop("armazenado_em")
+    aviso = _("Resultado da auditoria completa armazenada em {0}.").format(
+        time.strftime("%d/%m/%Y", time.localtime(armazenado_em))
+    )
+    score = prever_score(features)
+    logger.info("Answered %s from the feature store", url)
+    if "text/event-stream" in request.headers.get("Accept", ""):
+        return resposta_sse(
+            iter(
+                [
+                    formatar_evento_sse(
+                        "completa", dados_resultado(url, features, score, aviso)
+                    )
+                ]
+            )
+        )
+    return renderizar_resultado(url, features, score, aviso)
+
+
+def renderizar_erro(mensagem: str, url: str = "", status: int = 200):
+    """
+    Renders the result page with an error message.
+    """
+    return (
+        render_template("resultado.html", error=mensagem, url=url, features={}),
+        status,
+    )
+
+
+def renderizar_resultado(
+    url: str, features: dict, score: int, aviso: str = None, eventos_url: str = None
+):
+    """
+    Renders the result page with score, guide and features.
+
+    :param eventos_url: SSE endpoint the page subscribes to for the full-analysis update (progressive mode).
+    """
+    guia = gerar_guia_preditivo(features, score, url)
+    logger.debug(
+        "Prediction details",
+        extra={
+            "dados": {
+                "url": url,
+                "score": score,
+                "features": PayloadLimitado(features),
+                "guia": PayloadLimitado(guia),
+            }
+        },
+    )
+
+    logger.info("Analysis completed for %s: %s.", url, score)
+    return render_template(
+        "resultado.html",
+        url=url,
+        score=score,
+        guia=guia,
+        features=features,
+        aviso=aviso,
+        eventos_url=eventos_url,
+    )
+
+
+# EN: Server-Sent Events for progressive results. Why? The quick result shows immediately and the full one arrives on the same page. How? A heartbeat keeps proxies from closing the idle stream while the job runs.
+# PT: Server-Sent Events para resultados progressivos. Por quê? O resultado rápido aparece na hora e o completo chega na mesma página. Como? Um heartbeat evita que proxies fechem o stream ocioso enquanto o job roda.
+SSE_HEARTBEAT_S = 15
+SSE_ESPERA_MAX_S = int(os.environ.get("PREVISIA_SSE_ESPERA_MAX_S", 600))
+# EN: Open streams limit. Why? Each stream holds a server thread while its job runs, so a few result pages could take every thread (--threads 8) and starve the bounded queue's own requests. How? A semaphore below the thread count; a page that finds it full gets an `ocupado` event and polls /jobs/<id> instead.
+# PT: Limite de streams abertos. Por quê? Cada stream segura uma thread do servidor enquanto seu job roda, então poucas páginas de resultado poderiam ocupar todas as threads (--threads 8) e deixar sem atendimento as requisições da própria fila limitada. Como? Um semáforo abaixo do número de threads; a página que o encontra cheio recebe um evento `ocupado` e consulta /jobs/<id> no lugar.
+MAX_STREAMS_SSE = int(os.environ.get("PREVISIA_MAX_STREAMS_SSE", 4))
+_vagas_sse = threading.BoundedSemaphore(MAX_STREAMS_SSE)
+
+
+def formatar_evento_sse(evento: str, dados: dict) -> str:
+    """
+    Formats one SSE message.
+    """
+    return f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n"
+
+
+def dados_resultado(
+    url: str, features: dict, score: int, aviso: str = None, versao_modelo: str = None
+) -> dict:
+    """
+    Builds the JSON payload of a result event (score, model version, contrast failures, guide, features).
+    """
+    return {
+        "url": url,
+        "score": score,
+        "versao_modelo": versao_modelo or g.get("versao_modelo"),
+        "falhas_contraste": features.get("falhas_contraste", 0),
+        "guia": gerar_guia_preditivo(features, score, url),
+        "features": features,
+        "aviso": aviso,
+    }
+
+
+def gerar_eventos_job(job):
+    """
+    Yields SSE messages until a full-analysis job finishes.
+
+    EN: Why? Pushes the updated score, contrast failures and guide as soon as the Axe audit ends. How? Waits on the job's completion event, emitting `status` heartbeats, then one `completa` or `erro` event. Without a free stream slot (MAX_STREAMS_SSE), emits a single `ocupado` event with the job's status and result URLs for polling.
+    PT: Por quê? Envia o score, as falhas de contraste e o guia atualizados assim que a auditoria Axe termina. Como? Espera o evento de conclusão do job, emitindo heartbeats de `status`, e depois um evento `completa` ou `erro`. Sem vaga de stream livre (MAX_STREAMS_SSE), emite um único evento `ocupado` com as URLs de status e resultado do job para consulta periódica.
+    """
+    if not _vagas_sse.acquire(blocking=False):
+        yield formatar_evento_sse(
+            "ocupado",
+            {
+                "status_url": url_for("status_job", job_id=job.id),
+                "resultado_url": url_for("resultado_job", job_id=job.id),
+            },
+        )
+        return
+    try:
+        yield from _eventos_do_job(job)
+    finally:
+        # Também ao desconectar: o servidor fecha o gerador
+        _vagas_sse.release()
+
+
+def _eventos_do_job(job):
+    inicio = time.monotonic()
+    while not job.aguardar(SSE_HEARTBEAT_S):
+        if time.monotonic() - inicio > SSE_ESPERA_MAX_S:
+            yield formatar_evento_sse(
+                "erro",
+                {
+                    "mensagem": _(
+                        "A análise completa demorou demais; mantivemos a análise rápida."
+                    )
+                },
+            )
+            return
+        yield formatar_evento_sse("status", {"status": job.status})
+    if job.status == FALHOU:
+        yield formatar_evento_sse(
+            "erro",
+            {"mensagem": _("A análise completa falhou; mantivemos a análise rápida.")},
+        )
+        return
+    resultado = job.resultado
+    if resultado["fallback"]:
+        yield formatar_evento_sse(
+            "erro",
+            {"mensagem": _("A análise completa falhou; mantivemos a análise rápida.")},
+        )
+        return
+    if resultado.get("parcial"):
+        yield formatar_evento_sse(
+            "erro",
+            {
+                "mensagem": _(
+                    "A análise completa não terminou no prazo; mantivemos a análise rápida."
+                )
+            },
+        )
+        return
+    yield formatar_evento_sse(
+        "completa",
+        dados_resultado(
+            resultado["url"],
+            resultado["features"],
+            resultado["score"],
+            versao_modelo=resultado.get("versao_modelo"),
+        ),
+    )
+
+
+def resposta_sse(gerador) -> Response:
+    """
+    Wraps a generator as a text/event-stream response, keeping the request context (locale) alive.
+    """
+    return Response(
+        stream_with_context(gerador),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/predict", methods=["POST"])
+@perfilado
 def predict():
-    if not all([modelo, scaler, feature_names]):
-        logging.error(
+    if modelo_da_requisicao() is None:
+        logger.error(
             "EN: Model or artifacts not available. PT: Modelo ou artefatos não disponíveis."
         )
-        return render_template(
-            "resultado.html",
-            error=_(
+        return renderizar_erro(
+            _(
                 "Modelo ou seus componentes não estão disponíveis. Verifique a configuração do servidor."
-            ),
-            url="",
-            features={},
+            )
         )
 
     url = request.form["url"]
     if not url.startswith("http"):
         url = f"https://{url}"
     tipo_analise = request.form.get("tipo_analise", "rapida")
+    # Prazos ponta a ponta: o da análise completa começa a contar já na fila
+    prazo = Prazo(PRAZO_RAPIDA_S)
+    prazo_completa = Prazo(PRAZO_COMPLETA_S)
+
+    logger.debug("Locale durante previsão: %s", get_locale())
+
+    # Sites já auditados pelo orquestrador são respondidos do armazém, sem rede nem Chromium;
+    # o armazém só tem a página inicial, então a análise de site não o consulta
+    armazenado = armazem.buscar(url=url) if tipo_analise != "site" else None
+    if armazenado is not None:
+        return responder_armazenado(url, armazenado)
+
+    if tipo_analise in ("completa", "site"):
+        # Análise completa vai para a fila; a página de resultado consulta o status
+        site = tipo_analise == "site"
+        decisao = None
+        if tipo_analise == "completa" and triagem is not None:
+            # Triagem: a análise rápida decide se a auditoria no Chromium é necessária
+            features = analisar_url_rapida(url, prazo)
+            if features:
+                armazenado = armazem.buscar(sha256=features.get("html_sha256"))
+                if armazenado is not None:
+                    return responder_armazenado(url, armazenado)
+                decisao = triagem.avaliar(url, features, modelo_da_requisicao())
+                if not decisao["auditar"]:
+                    triagem.registrar(decisao)
+                    registro.contar_previsao(decisao["versao_modelo"])
+                    aviso = _(
+                        "A previsão rápida foi considerada confiável (incerteza de {0} pontos); a auditoria completa foi dispensada."
+                    ).format(decisao["incerteza"])
+                    return renderizar_resultado(url, features, decisao["score"], aviso)
+        try:
+            job = fila_completa.submeter(
+                f"site:{url}" if site else url,
+                url,
+                g.get("perfilar", False),
+                site,
+                decisao,
+                prazo_completa,
+            )
+        except FilaCheia as e:
+            logger.warning("Full-analysis queue full, refusing %s", url)
+            resposta = make_response(
+                renderizar_erro(
+                    _(
+                        "O servidor está ocupado com outras análises completas. Tente novamente em {0} segundos ou use a análise rápida."
+                    ).format(e.espera_s),
+                    url=url,
+                    status=503,
+                )
+            )
+            resposta.headers["Retry-After"] = str(e.espera_s)
+            return resposta
+        return redirect(url_for("resultado_job", job_id=job.id))
 
-    # DEBUG: Print locale durante previsão
-    print(f"Locale durante previsão: {get_locale()}")
-
-    aviso = None
     try:
-        if tipo_analise == "completa":
-            features = analisar_url_completa(url)
-            if features is None:
-                print(f"Fallback para análise rápida para {url}")
-                features = analisar_url_rapida(url)
-                aviso = _(
-                    "A análise completa falhou; usamos a análise rápida como fallback para {0}."
-                ).format(url)
-        else:
-            features = analisar_url_rapida(url)
+        features = analisar_url_rapida(url, prazo)
         if not features:
-            logging.error(
-                f"EN: Failed to analyze URL {url}. PT: Falha ao analisar URL {url}."
+            logger.error(
+                "EN: Failed to analyze URL %s. PT: Falha ao analisar URL %s.", url, url
+            )
+            return renderizar_erro(
+                _("Falha ao extrair características da URL: {0}").format(url), url=url
+            )
+        # Mesmo HTML de uma página já auditada (ex.: alias ou URL com parâmetros): reaproveita
+        armazenado = armazem.buscar(sha256=features.get("html_sha256"))
+        if armazenado is not None:
+            return responder_armazenado(url, armazenado)
+        score = prever_score(features)
+        if tipo_analise != "progressiva":
+            return renderizar_resultado(url, features, score)
+
+        # Progressiva: resultado rápido agora, análise completa em segundo plano via SSE
+        aviso = None
+        try:
+            job = fila_completa.submeter(
+                url, url, g.get("perfilar", False), False, None, prazo_completa
             )
-            return render_template(
-                "resultado.html",
-                error=_("Falha ao extrair características da URL: {0}").format(url),
-                url=url,
-                features={},
+        except FilaCheia:
+            job = None
+            aviso = _(
+                "O servidor está ocupado com outras análises completas; mostramos apenas a análise rápida."
             )
+        if "text/event-stream" in request.headers.get("Accept", ""):
 
-        # Lógica de Previsão with PyTorch
-        # 1. Garantir que todas as features esperadas pelo modelo estejam presentes.
-        features_df = pd.DataFrame([features])
-        features_df = features_df.reindex(columns=feature_names, fill_value=0)
-        # 2. Aplicar as mesmas transformações do treinamento (log e clipping)
-        skew_features = ["falhas_contraste", "imagens_sem_alt", "videos_sem_captions"]
-        for feat in skew_features:
-            if feat in features_df.columns:
-                features_df[feat] = np.log1p(features_df[feat])
-                # In trainer, we clipped. Ideally, save the clip values.
-                # For simplicity, assume input values won't be extreme outliers.
+            def gerar():
+                yield formatar_evento_sse(
+                    "rapida", dados_resultado(url, features, score, aviso)
+                )
+                if job is not None:
+                    yield from gerar_eventos_job(job)
 
-        # 3. Escalonar os dados with o scaler carregado
-        X_scaled = scaler.transform(features_df)
+            return resposta_sse(gerar())
+        eventos_url = url_for("eventos_job", job_id=job.id) if job else None
+        return renderizar_resultado(url, features, score, aviso, eventos_url)
 
-        # 4. Converter para um Tensor PyTorch
-        X_tensor = torch.tensor(X_scaled, dtype=torch.float32)
+    except Exception as e:
+        logger.exception("Error in prediction for %s: %s.", url, e)
+        return renderizar_erro(
+            _("Ocorreu um erro inesperado during the analysis: {0}").format(e), url=url
+        )
 
-        # 5. Fazer a previsão (dentro de um bloco 'no_grad' for efficiency)
-        with torch.no_grad():
-            prediction_normalized = modelo(X_tensor)
 
-        # 6. Processar o resultado
-        # The trainer normalized 'y' to 0-1 (dividing by 100). Need to reverse.
-        score_pred = prediction_normalized.numpy().flatten()[0] * 100
-        score = round(max(0, min(100, score_pred)))  # Ensure score between 0 and 100
+@app.route("/jobs/<job_id>", methods=["GET"])
+def status_job(job_id):
+    """
+    Returns a full-analysis job's status as JSON, for polling.
+    """
+    job = fila_completa.obter(job_id)
+    if job is None:
+        return jsonify({"id": job_id, "status": None, "erro": "job not found"}), 404
+    dados = job.para_dict()
+    dados["resultado_url"] = url_for("resultado_job", job_id=job_id)
+    return jsonify(dados)
 
-        print(f"Score: {score}, Features: {features}, URL: {url}")
 
-        guia = gerar_guia_preditivo(features, score, url)
-        print(f"Guia: {guia}")
+@app.route("/jobs/<job_id>/eventos", methods=["GET"])
+def eventos_job(job_id):
+    """
+    Streams a full-analysis job's outcome as Server-Sent Events.
+    """
+    job = fila_completa.obter(job_id)
+    if job is None:
+        return jsonify({"id": job_id, "status": None, "erro": "job not found"}), 404
+    return resposta_sse(gerar_eventos_job(job))
+
 
-        logging.info(f"Analysis completed for {url}: {score}.")
+@app.route("/jobs/<job_id>/resultado", methods=["GET"])
+def resultado_job(job_id):
+    """
+    Renders a full-analysis job's result, or the waiting page while it runs.
+    """
+    job = fila_completa.obter(job_id)
+    if job is None:
+        return renderizar_erro(
+            _("Análise não encontrada ou expirada. Faça uma nova análise."), status=404
+        )
+    # A chave de deduplicação pode ter prefixo (ex.: "site:"); a URL é o primeiro argumento
+    url = job.args[0]
+    if job.status in (NA_FILA, EXECUTANDO):
         return render_template(
-            "resultado.html",
+            "aguardando.html", job_id=job_id, url=url, status=job.status
+        )
+    if job.status == FALHOU:
+        return renderizar_erro(
+            _("Ocorreu um erro inesperado during the analysis: {0}").format(job.erro),
             url=url,
-            score=score,
-            guia=guia,
-            features=features,
-            aviso=aviso,
         )
 
-    except Exception as e:
-        logging.error(f"Error in prediction for {url}: {str(e)}.")
-        print(f"Erro na previsão: {str(e)}")
-        import traceback
-
-        logging.error(traceback.format_exc())
-        return render_template(
-            "resultado.html",
-            error=_("Ocorreu um erro inesperado during the analysis: {0}").format(e),
-            url=url,
-            features={},
+    resultado = job.resultado
+    g.versao_modelo = resultado.get("versao_modelo")
+    aviso = None
+    if resultado["fallback"]:
+        aviso = _(
+            "A análise completa falhou; usamos a análise rápida como fallback para {0}."
+        ).format(resultado["url"])
+    elif resultado.get("parcial"):
+        aviso = _(
+            "A análise completa não terminou no prazo de {0} segundos; mostramos o resultado da análise estática."
+        ).format(f"{PRAZO_COMPLETA_S:g}")
+    elif "site_paginas" in resultado["features"]:
+        features = resultado["features"]
+        aviso = _(
+            "Pontuação média de {0} páginas do site; a pior foi {1} (pontuação {2})."
+        ).format(
+            features["site_paginas"],
+            features["site_pior_url"],
+            features["site_score_min"],
         )
+    return renderizar_resultado(
+        resultado["url"], resultado["features"], resultado["score"], aviso
+    )
+
+
+@app.route("/metricas", methods=["GET"])
+def metricas():
+    """
+    Returns model registry metrics as JSON: active version, load time, recent swaps, rejected versions and predictions per version.
+    """
+    return jsonify({"modelo": registro.metricas()})
 
 
 if __name__ == "__main__":
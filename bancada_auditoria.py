@@ -0,0 +1,128 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file benchmarks the dynamic audit (Playwright + Axe) against recorded network traffic. Why? Timings measured on live sites mix our changes with network and site noise. How? A recording pass saves one HAR archive per URL (utils.rede_gravada); replay passes audit each URL several times offline and report median/min/max durations and whether the score stayed the same.
+# PT: Este arquivo mede a auditoria dinâmica (Playwright + Axe) sobre tráfego de rede gravado. Por quê? Tempos medidos em sites ao vivo misturam nossas mudanças com ruído da rede e dos sites. Como? Uma passada de gravação salva um arquivo HAR por URL (utils.rede_gravada); as passadas de reprodução auditam cada URL várias vezes offline e relatam as durações mediana/mínima/máxima e se o score se manteve.
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+
+from collector import PERFIL_AXE_PADRAO, analisar_site, gerar_label_e_features_dinamicas
+from pontuar_lote import ler_urls
+from utils.log import configurar_logging
+from utils.rede_gravada import DIRETORIO_HAR, GRAVAR, REPRODUZIR, RedeGravada
+
+logger = logging.getLogger(__name__)
+
+AO_VIVO = "ao-vivo"
+REPETICOES = 5
+
+
+def auditar_uma_vez(url: str, perfil: str, rede: RedeGravada, site: bool) -> dict:
+    """
+    Runs one audit and times it.
+
+    :return: Dict with duracao_s, score (None on failure) and the axe/carga durations reported by the audit.
+    """
+    inicio = time.perf_counter()
+    if site:
+        registro = analisar_site(url, perfil, rede=rede) or {}
+        score = registro.get("label_score_acessibilidade")
+        colunas = registro
+    else:
+        score, _, colunas = gerar_label_e_features_dinamicas(url, perfil, rede=rede)
+        score = None if score == -1 else score
+    return {
+        "duracao_s": time.perf_counter() - inicio,
+        "score": score,
+        "axe_duracao_s": colunas.get("axe_duracao_s"),
+        "carga_duracao_s": colunas.get("carga_duracao_s"),
+    }
+
+
+def medir(
+    urls, rede: RedeGravada, repeticoes: int, perfil: str, site: bool = False
+) -> list:
+    """
+    Audits each URL `repeticoes` times and summarizes the timings.
+
+    :param urls: Iterable of (line number, URL), as from pontuar_lote.ler_urls.
+    :param rede: Network fixtures (None = live network).
+    :param repeticoes: Audits per URL; failed ones count in falhas and are left out of the timings.
+    :param perfil: Axe profile name.
+    :param site: Benchmark the site crawl (async engine, shared context) instead of the single-page audit.
+    :return: One dict per URL with url, execucoes, falhas, mediana_s, min_s, max_s, axe_mediana_s, carga_mediana_s and scores (distinct values; more than one means the run was not deterministic).
+    """
+    resumo = []
+    for _, url in urls:
+        execucoes = [
+            auditar_uma_vez(url, perfil, rede, site) for _ in range(repeticoes)
+        ]
+        validas = [e for e in execucoes if e["score"] is not None]
+        duracoes = [e["duracao_s"] for e in validas]
+
+        def mediana(chave):
+            valores = [e[chave] for e in validas if e[chave] is not None]
+            return round(statistics.median(valores), 3) if valores else None
+
+        item = {
+            "url": url,
+            "execucoes": len(execucoes),
+            "falhas": len(execucoes) - len(validas),
+            "mediana_s": mediana("duracao_s"),
+            "min_s": round(min(duracoes), 3) if duracoes else None,
+            "max_s": round(max(duracoes), 3) if duracoes else None,
+            "axe_mediana_s": mediana("axe_duracao_s"),
+            "carga_mediana_s": mediana("carga_duracao_s"),
+            "scores": sorted({e["score"] for e in validas}),
+        }
+        logger.info("Benchmark finished", extra={"dados": item})
+        resumo.append(item)
+    return resumo
+
+
+if __name__ == "__main__":
+    # Uso: python bancada_auditoria.py urls.txt --modo gravar; depois python bancada_auditoria.py urls.txt
+    parser = argparse.ArgumentParser(
+        description="Mede a auditoria dinâmica sobre tráfego de rede gravado (HAR)."
+    )
+    parser.add_argument(
+        "entrada",
+        nargs="?",
+        default="-",
+        help="Arquivo com uma URL por linha (padrão: stdin).",
+    )
+    parser.add_argument(
+        "--modo",
+        choices=[GRAVAR, REPRODUZIR, AO_VIVO],
+        default=REPRODUZIR,
+        help="gravar: audita uma vez e salva o HAR de cada URL; reproduzir: audita offline a partir dos HARs; ao-vivo: rede real.",
+    )
+    parser.add_argument("--har-dir", default=DIRETORIO_HAR)
+    parser.add_argument(
+        "--repeticoes",
+        type=int,
+        default=REPETICOES,
+        help="Auditorias por URL (a gravação faz uma só).",
+    )
+    parser.add_argument("--perfil", default=PERFIL_AXE_PADRAO)
+    parser.add_argument(
+        "--site",
+        action="store_true",
+        help="Mede o rastreamento de site (motor assíncrono) em vez da auditoria de uma página.",
+    )
+    args = parser.parse_args()
+    if args.repeticoes < 1:
+        parser.error("--repeticoes deve ser positivo.")
+
+    configurar_logging("erros_bancada.log", nivel=logging.ERROR)
+    rede = None if args.modo == AO_VIVO else RedeGravada(args.modo, args.har_dir)
+    repeticoes = 1 if args.modo == GRAVAR else args.repeticoes
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    try:
+        for item in medir(ler_urls(entrada), rede, repeticoes, args.perfil, args.site):
+            print(json.dumps(item, ensure_ascii=False))
+    finally:
+        entrada.close()
@@ -5,18 +5,34 @@
 import requests
 from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 from axe_playwright_python.sync_playwright import Axe
+from axe_playwright_python.async_playwright import Axe as AxeAsync
+import asyncio
+import collections
 import logging
-import json
-from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
-
-# EN: Setup logging to track analysis errors. Why? Facilitates debugging with NVDA, saving errors to file.
-# PT: Configura o logging para rastrear erros de análise. Por quê? Facilita depuração com NVDA, salvando erros em arquivo.
-logging.basicConfig(
-    filename="erros_collector.log",
-    level=logging.ERROR,
-    format='{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}',
+import hashlib
+import math
+import os
+import re
+import time
+from urllib.parse import urlsplit
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_fixed,
+    retry_if_not_exception_type,
 )
+from utils.log import PayloadLimitado
+from utils.arquivo_snapshots import ArquivoSnapshots
+from utils.navegacao import PoliticaNavegacao
+from utils.prazo import MINIMO_ETAPA_S, Prazo, PrazoEsgotado
+from utils.rede_gravada import GRAVAR, RedeGravada, rede_padrao
+from utils.validate_url import normalizar_url
+
+# EN: Module logger; handlers are installed by the entry point via utils.log.configurar_logging. Why? A library module must not configure logging at import.
+# PT: Logger do módulo; os handlers são instalados pelo ponto de entrada via utils.log.configurar_logging. Por quê? Um módulo de biblioteca não deve configurar o logging no import.
+logger = logging.getLogger(__name__)
 # EN: Constants for HTTP headers and accessibility checks. Why? Avoids hardcoding and improves maintainability.
 # PT: Constantes para cabeçalhos HTTP e verificações de acessibilidade. Por quê? Evita hardcoding e melhora a manutenção.
 HEADERS = {
@@ -50,6 +66,254 @@ LAYOUT_TAGS = {
     "carousel": ['div[class*="carousel"]', 'div[class*="slider"]'],
     "form": ["form"],
 }
+# EN: Named Axe audit profiles, passed to axe.run as `runOnly`. Why? The full rule set is slow; the quick profile runs only the rules behind our features. How? Rule or tag lists from axe-core; "completo" runs every rule.
+# PT: Perfis nomeados de auditoria Axe, passados ao axe.run como `runOnly`. Por quê? O conjunto completo de regras é lento; o perfil rápido roda só as regras por trás das nossas features. Como? Listas de regras ou tags do axe-core; "completo" roda todas as regras.
+PERFIS_AXE = {
+    "rapido": {
+        "type": "rule",
+        "values": [
+            "color-contrast",
+            "image-alt",
+            "link-name",
+            "label",
+            "button-name",
+            "html-has-lang",
+            "document-title",
+        ],
+    },
+    "wcag2a": {"type": "tag", "values": ["wcag2a", "wcag21a"]},
+    "wcag2aa": {"type": "tag", "values": ["wcag2a", "wcag2aa", "wcag21a", "wcag21aa"]},
+    "completo": None,
+}
+PERFIL_AXE_PADRAO = os.environ.get("PREVISIA_AXE_PERFIL", "completo")
+# EN: Rules that get their own dataset columns; any other violated rule is summed into "outras". Why? Keeps the dataset schema fixed across profiles and sites.
+# PT: Regras que ganham colunas próprias no dataset; qualquer outra regra violada é somada em "outras". Por quê? Mantém o schema do dataset fixo entre perfis e sites.
+REGRAS_AXE_COLUNAS = PERFIS_AXE["rapido"]["values"] + [
+    "heading-order",
+    "region",
+    "landmark-one-main",
+    "aria-allowed-attr",
+    "aria-required-attr",
+    "aria-valid-attr-value",
+    "duplicate-id-aria",
+    "list",
+    "listitem",
+    "frame-title",
+    "meta-viewport",
+    "select-name",
+    "input-image-alt",
+]
+# EN: Chromium flags shared by the single-page audit and the site crawl.
+# PT: Flags do Chromium compartilhadas pela auditoria de página única e pelo rastreamento de site.
+ARGS_CHROMIUM = [
+    "--log-level=3",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-application-cache",
+    "--window-size=1280,720",
+    "--ignore-certificate-errors",
+    "--ignore-ssl-errors=yes",  # Extra para SSL problemático
+    "--disable-web-security",
+    "--disable-blink-features=AutomationControlled",
+    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
+    "--enable-webgl",
+]
+# EN: Site crawl budgets. Why? Deeper pages are often worse than the home page, but a crawl must stay bounded. How? Page cap, wall-clock budget and pages audited at once, overridable by env vars.
+# PT: Orçamentos do rastreamento de site. Por quê? Páginas internas costumam ser piores que a inicial, mas um rastreamento precisa de limites. Como? Limite de páginas, orçamento de tempo e páginas auditadas ao mesmo tempo, sobrescrevíveis por variáveis de ambiente.
+SITE_MAX_PAGINAS = int(os.environ.get("PREVISIA_SITE_MAX_PAGINAS", 5))
+SITE_ORCAMENTO_S = float(os.environ.get("PREVISIA_SITE_ORCAMENTO_S", 180))
+SITE_CONCORRENCIA = int(os.environ.get("PREVISIA_SITE_CONCORRENCIA", 3))
+# EN: Resource blocking for dataset rows. Why? Blocking images, media and fonts changes some Axe labels compared with the existing dataset. How? Off unless PREVISIA_COLETA_BLOQUEAR=1; used by the orchestrator's single-page audits and as the site crawl's default, and every row records the policy in carga_bloqueio, so mixed datasets can be filtered.
+# PT: Bloqueio de recursos para linhas do dataset. Por quê? Bloquear imagens, mídia e fontes muda alguns labels do Axe em relação ao dataset existente. Como? Desligado a menos que PREVISIA_COLETA_BLOQUEAR=1; usado nas auditorias de página única do orquestrador e como padrão do rastreamento de site, e toda linha registra a política em carga_bloqueio, para filtrar datasets mistos.
+BLOQUEAR_NA_COLETA = os.environ.get("PREVISIA_COLETA_BLOQUEAR", "0") == "1"
+_RE_NAO_HTML = re.compile(
+    r"\.(pdf|zip|rar|gz|jpe?g|png|gif|svg|webp|ico|mp3|mp4|avi|mov|docx?|xlsx?|pptx?|csv|xml|json)$",
+    re.I,
+)
+# Links na ordem de prioridade da fronteira: navegação primeiro, depois o resto da página
+_JS_LINKS = """
+() => {
+    const hrefs = sel => Array.from(document.querySelectorAll(sel), a => a.href);
+    return hrefs('nav a[href], header a[href], [role="navigation"] a[href]').concat(hrefs('a[href]'));
+}
+"""
+# EN: Streaming download limits. Why? Multi-megabyte pages spike memory in web workers; the features we extract sit in the first few hundred KB. How? Body read in chunks up to the byte cap (0 disables the cap).
+# PT: Limites do download em streaming. Por quê? Páginas de vários megabytes estouram a memória dos workers web; as features que extraímos estão nas primeiras centenas de KB. Como? Corpo lido em blocos até o limite de bytes (0 desativa o limite).
+MAX_HTML_BYTES = int(os.environ.get("PREVISIA_MAX_HTML_BYTES", 2 * 1024 * 1024))
+TAMANHO_BLOCO_HTML = 64 * 1024
+# EN: Per-step timeouts. Why? Each is also capped by the analysis deadline (utils.prazo), when one is given.
+# PT: Timeouts por etapa. Por quê? Cada um também é limitado pelo prazo da análise (utils.prazo), quando há um.
+TIMEOUT_HTTP_S = 30
+TIMEOUT_PAGINA_MS = 180000  # Aumentado para 3 min
+TIMEOUT_BODY_MS = 60000  # 1 min para body
+ESPERA_RETRY_S = 2
+# EN: Axe run raced against the remaining deadline. Why? page.evaluate has no timeout of its own. How? Resolves to null when the timer wins.
+# PT: Execução do Axe disputando com o prazo restante. Por quê? O page.evaluate não tem timeout próprio. Como? Resolve como null quando o timer vence.
+_JS_AXE_COM_PRAZO = """
+([opcoes, limiteMs]) => Promise.race([
+    axe.run(document, opcoes),
+    new Promise(resolve => setTimeout(() => resolve(null), limiteMs)),
+])
+"""
+
+
+def parsear_html(corpo: bytes, encoding: str = None) -> BeautifulSoup:
+    """
+    Parses downloaded HTML bytes with html.parser.
+
+    :param corpo: Raw body bytes (up to the byte cap).
+    :param encoding: Charset from the Content-Type header (None = detect).
+    :return: The parsed BeautifulSoup object.
+
+    EN: Why? Pages that declare their encoding only in the HTTP header, or nowhere, must decode like BeautifulSoup(bytes) would, or html_* features shift with the lost characters. How? The header charset is tried first; otherwise bs4's EncodingDetector (via UnicodeDammit) checks the BOM, the meta charset and falls back to utf-8 then windows-1252.
+    PT: Por quê? Páginas que declaram o encoding só no cabeçalho HTTP, ou em lugar nenhum, precisam decodificar como o BeautifulSoup(bytes) faria, ou as features html_* mudam com os caracteres perdidos. Como? O charset do cabeçalho é tentado primeiro; senão o EncodingDetector do bs4 (via UnicodeDammit) verifica o BOM e o meta charset e recorre a utf-8 e depois windows-1252.
+    """
+    return BeautifulSoup(corpo, "html.parser", from_encoding=encoding)
+
+
+def baixar_e_parsear(
+    url: str,
+    max_bytes: int = MAX_HTML_BYTES,
+    snapshot: dict = None,
+    prazo: Prazo = None,
+) -> tuple[BeautifulSoup, dict]:
+    """
+    Downloads a page in streaming mode up to a byte cap and parses it.
+
+    :param url: URL to fetch.
+    :param max_bytes: Maximum body bytes to read (0 = no cap).
+    :param snapshot: If given, receives the bytes read ("html_cru") and the header charset ("encoding") for the snapshot archive.
+    :param prazo: Deadline of the analysis; caps the connect/read timeout, and a body still arriving when it runs out is cut like the byte cap.
+    :return: Tuple of (soup, html_* columns: bytes read, truncated flag, download+parse time, SHA-256 of the bytes read).
+    :raises utils.prazo.PrazoEsgotado: If the deadline has run out before the request.
+
+    EN: Why? response.content loaded whole pages into memory with no limit before parsing. How? requests stream=True + iter_content up to the cap or the deadline (flagging truncation), then parsear_html on the bytes read.
+    PT: Por quê? response.content carregava páginas inteiras na memória sem limite antes do parsing. Como? requests stream=True + iter_content até o limite ou o prazo (marcando truncamento), depois parsear_html nos bytes lidos.
+    """
+    inicio = time.perf_counter()
+    timeout = prazo.limitar(TIMEOUT_HTTP_S, "download") if prazo else TIMEOUT_HTTP_S
+    with requests.get(url, headers=HEADERS, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        encoding = response.encoding if "charset" in content_type.lower() else None
+        blocos = []
+        resumo = hashlib.sha256()
+        lidos = 0
+        truncado = 0
+        for bloco in response.iter_content(chunk_size=TAMANHO_BLOCO_HTML):
+            if max_bytes and lidos + len(bloco) > max_bytes:
+                bloco = bloco[: max_bytes - lidos]
+                truncado = 1
+            lidos += len(bloco)
+            if bloco:
+                resumo.update(bloco)
+                blocos.append(bloco)
+            # Prazo esgotado no meio do corpo: fica com o que chegou, como no limite de bytes
+            if prazo is not None and prazo.esgotado():
+                truncado = 1
+            if truncado:
+                break
+    corpo = b"".join(blocos)
+    soup = parsear_html(corpo, encoding)
+    if snapshot is not None:
+        snapshot["html_cru"] = corpo
+        snapshot["encoding"] = encoding
+    colunas = {
+        "html_bytes": lidos,
+        "html_truncado": truncado,
+        "html_tempo_s": round(time.perf_counter() - inicio, 3),
+        "html_sha256": resumo.hexdigest(),
+    }
+    logger.info("HTML fetched and parsed", extra={"dados": {"url": url, **colunas}})
+    return soup, colunas
+
+
+def impressao_digital(url: str, max_bytes: int = MAX_HTML_BYTES) -> dict:
+    """
+    Resolves a URL's final address and fingerprints its HTML.
+
+    :param url: URL to fetch (redirects are followed).
+    :param max_bytes: Maximum body bytes hashed.
+    :return: Dictionary with dedup_url_final (normalized) and dedup_sha256.
+
+    EN: Why? Regional and alias domains often redirect to, or serve, the same page; the orchestrator audits each equivalent page only once. How? Streaming GET hashing the body with SHA-256 up to the byte cap.
+    PT: Por quê? Domínios regionais e aliases frequentemente redirecionam para a mesma página, ou a servem; o orquestrador audita cada página equivalente uma só vez. Como? GET em streaming calculando o SHA-256 do corpo até o limite de bytes.
+    """
+    resumo = hashlib.sha256()
+    lidos = 0
+    with requests.get(
+        url, headers=HEADERS, timeout=TIMEOUT_HTTP_S, stream=True
+    ) as response:
+        response.raise_for_status()
+        for bloco in response.iter_content(chunk_size=TAMANHO_BLOCO_HTML):
+            if max_bytes and lidos + len(bloco) > max_bytes:
+                bloco = bloco[: max_bytes - lidos]
+            lidos += len(bloco)
+            resumo.update(bloco)
+            if max_bytes and lidos >= max_bytes:
+                break
+        url_final = response.url
+    return {
+        "dedup_url_final": normalizar_url(url_final),
+        "dedup_sha256": resumo.hexdigest(),
+    }
+
+
+def opcoes_axe(perfil: str) -> dict:
+    """
+    Builds axe.run options for a named profile.
+
+    :param perfil: Profile name from PERFIS_AXE.
+    :return: Options dict for axe.run.
+
+    EN: Why? Centralizes profile validation. How? Adds `runOnly` unless the profile runs every rule.
+    PT: Por quê? Centraliza a validação do perfil. Como? Adiciona `runOnly`, exceto quando o perfil roda todas as regras.
+    """
+    if perfil not in PERFIS_AXE:
+        raise ValueError(
+            f"Perfil Axe desconhecido: {perfil}. Opções: {', '.join(PERFIS_AXE)}"
+        )
+    opcoes = {"resultTypes": ["violations"]}
+    if PERFIS_AXE[perfil] is not None:
+        opcoes["runOnly"] = PERFIS_AXE[perfil]
+    return opcoes
+
+
+def resumir_violacoes(violations: list) -> dict:
+    """
+    Summarizes Axe violations into per-rule violation and node counts.
+
+    :param violations: `violations` list from the Axe response.
+    :return: Dictionary of axe_* columns with a fixed set of keys.
+
+    EN: Why? Keeps which rules failed instead of discarding everything but the total. How? One flag and one node count per rule in REGRAS_AXE_COLUNAS, the rest summed into "outras".
+    PT: Por quê? Mantém quais regras falharam em vez de descartar tudo além do total. Como? Uma flag e uma contagem de nós por regra de REGRAS_AXE_COLUNAS, o restante somado em "outras".
+    """
+    resumo = {"axe_total_violacoes": len(violations)}
+    for regra in REGRAS_AXE_COLUNAS + ["outras"]:
+        chave = regra.replace("-", "_")
+        resumo[f"axe_viol_{chave}"] = 0
+        resumo[f"axe_nos_{chave}"] = 0
+    for v in violations:
+        chave = v["id"].replace("-", "_") if v["id"] in REGRAS_AXE_COLUNAS else "outras"
+        resumo[f"axe_viol_{chave}"] += 1
+        resumo[f"axe_nos_{chave}"] += len(v.get("nodes", []))
+    return resumo
+
+
+def pontuar_violacoes(violations: list) -> tuple[int, int]:
+    """
+    Scores an Axe result: 100 minus 5 per violated rule, and the color-contrast failing nodes.
+
+    :param violations: `violations` list from the Axe response.
+    :return: Tuple of (score, contrast_failures).
+    """
+    score = max(0, 100 - (len(violations) * 5))
+    contrast_failures = sum(
+        len(v["nodes"]) for v in violations if v["id"] == "color-contrast"
+    )
+    return score, contrast_failures
 
 
 def extrair_features(soup: BeautifulSoup) -> dict:
@@ -137,139 +401,626 @@ def extrair_features(soup: BeautifulSoup) -> dict:
     return features
 
 
+def _politica_padrao(
+    rede: RedeGravada | None, bloquear: bool = True
+) -> PoliticaNavegacao:
+    # Gravando, nada é bloqueado: o arquivo precisa de todos os recursos para medir qualquer política depois
+    if not bloquear or (rede is not None and rede.modo == GRAVAR):
+        return PoliticaNavegacao(tipos_bloqueados=[], hosts_bloqueados=[])
+    return PoliticaNavegacao()
+
+
+def _sem_tempo_para_retry(estado) -> bool:
+    # Não tenta de novo se a espera mais uma etapa mínima já estouraria o prazo
+    prazo = estado.kwargs.get("prazo")
+    return prazo is not None and prazo.restante() < ESPERA_RETRY_S + MINIMO_ETAPA_S
+
+
+def executar_axe(page, opcoes: dict, prazo: Prazo = None) -> dict:
+    """
+    Runs Axe on the page, within the deadline if one is given.
+
+    :param page: Playwright Page, already navigated.
+    :param opcoes: axe.run options (see opcoes_axe).
+    :param prazo: Deadline of the analysis.
+    :return: Full Axe response.
+    :raises utils.prazo.PrazoEsgotado: If the deadline runs out before Axe finishes.
+    """
+    axe = Axe()
+    if prazo is None or prazo.segundos is None:
+        # Sem prazo: nada a disputar com o Axe (e um limite infinito não cabe no timer JS)
+        return axe.run(page, options=opcoes).response
+    limite_ms = prazo.limitar_ms(math.inf, "axe")
+    page.evaluate(axe.axe_script)
+    resposta = page.evaluate(_JS_AXE_COM_PRAZO, [opcoes, limite_ms])
+    if resposta is None:
+        raise PrazoEsgotado("axe")
+    return resposta
+
+
 @retry(
-    stop=stop_after_attempt(2),  # Reduzido para 2 tentativas
-    wait=wait_fixed(2),  # 2s entre retries
-    retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
+    stop=stop_after_attempt(2) | _sem_tempo_para_retry,  # Até 2 tentativas, no prazo
+    wait=wait_fixed(ESPERA_RETRY_S),
+    retry=retry_if_not_exception_type(PrazoEsgotado),
 )
-def gerar_label_e_features_dinamicas(url: str) -> tuple[int, int]:
+def gerar_label_e_features_dinamicas(
+    url: str,
+    perfil: str = PERFIL_AXE_PADRAO,
+    politica: PoliticaNavegacao = None,
+    snapshot: dict = None,
+    prazo: Prazo = None,
+    rede: RedeGravada = None,
+    bloquear: bool = True,
+) -> tuple[int, int, dict]:
     """
-    Generates accessibility score and contrast failures using Axe audit.
+    Generates accessibility score, contrast failures and per-rule counts using Axe audit.
 
     :param url: URL to analyze.
-    :return: Tuple of (score, contrast_failures).
+    :param perfil: Axe profile name from PERFIS_AXE (default: PREVISIA_AXE_PERFIL or "completo").
+    :param politica: Navigation policy (resource blocking and readiness); a fresh default one per attempt if None (without blocking while recording network fixtures).
+    :param snapshot: If given, receives the rendered HTML ("html_renderizado") and the full Axe response ("axe").
+    :param prazo: Deadline of the analysis (pass it by keyword: the retry reads it); caps every Playwright timeout, the Axe run and the retry.
+    :param rede: Network fixtures to record to or replay from (default: PREVISIA_REDE_MODO, None = live network).
+    :param bloquear: Apply the default resource/tracker blocking when no politica is given (False = load everything, as the dataset collection does by default).
+    :return: Tuple of (score, contrast_failures, extra_columns) with axe_* and carga_* columns. Scores are only comparable within the same profile.
+    :raises utils.prazo.PrazoEsgotado: If the deadline runs out; etapa is "navegacao" or "axe".
 
     EN: Why? To quantify accessibility in runtime with precision. How? Uses headless Chromium via Playwright and Axe to audit rendered pages.
     PT: Por quê? Para quantificar acessibilidade em tempo de execução com precisão. Como? Usa Chromium headless via Playwright e Axe para auditar páginas renderizadas.
     """
+    opcoes = opcoes_axe(perfil)
+    prazo = prazo or Prazo()
+    rede = rede or rede_padrao()
     browser = None
+    contexto = None
+    etapa = "navegacao"
     try:
         with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    "--log-level=3",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-extensions",
-                    "--disable-application-cache",
-                    "--window-size=1280,720",
-                    "--ignore-certificate-errors",
-                    "--ignore-ssl-errors=yes",  # Extra para SSL problemático
-                    "--disable-web-security",
-                    "--disable-blink-features=AutomationControlled",
-                    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
-                    "--enable-webgl",
-                ],
+            prazo.verificar(etapa)
+            browser = p.chromium.launch(headless=True, args=ARGS_CHROMIUM)
+            contexto = browser.new_context(
+                **(rede.opcoes_contexto(url) if rede else {})
             )
-            page = browser.new_page()
-            page.set_default_timeout(180000)  # Aumentado para 3 min
-            print(f"Iniciando análise dinâmica para {url}")
-            page.goto(url, wait_until="networkidle", timeout=180000)  # Espera rede idle
-            logging.info(f'{{"url": "{url}", "step": "Navigated to URL"}}')
-            page.wait_for_selector("body", timeout=60000)  # 1 min para body
-            logging.info(f'{{"url": "{url}", "step": "Body loaded"}}')
-            axe = Axe()
-            results = axe.run(page)
-            logging.info(
-                f'{{"url": "{url}", "step": "Axe run completed", "results": "{json.dumps(results.response)}"}}'
+            if rede is not None:
+                rede.instalar(contexto, url)
+            page = contexto.new_page()
+            page.set_default_timeout(prazo.limitar_ms(TIMEOUT_PAGINA_MS, etapa))
+            logger.info("Dynamic analysis started", extra={"dados": {"url": url}})
+            # Bloqueia recursos pesados/rastreadores e espera o DOM estabilizar (em vez de networkidle)
+            politica_pagina = politica or _politica_padrao(rede, bloquear)
+            politica_pagina.instalar(page)
+            colunas_carga = politica_pagina.navegar(page, url, prazo)
+            logger.info("Navigated to URL", extra={"dados": {"url": url}})
+            page.wait_for_selector(
+                "body", timeout=prazo.limitar_ms(TIMEOUT_BODY_MS, etapa)
             )
-
-            violations = results.response.get("violations", [])
-            score = max(0, 100 - (len(violations) * 5))
-            contrast_failures = sum(
-                len(v["nodes"]) for v in violations if v["id"] == "color-contrast"
+            logger.info("Body loaded", extra={"dados": {"url": url}})
+            etapa = "axe"
+            inicio_axe = time.perf_counter()
+            resposta_axe = executar_axe(page, opcoes, prazo)
+            duracao_axe = time.perf_counter() - inicio_axe
+            # Payload verboso: só serializado se DEBUG estiver ativo, amostrado e truncado
+            logger.debug(
+                "Axe run completed",
+                extra={
+                    "dados": {"url": url, "results": PayloadLimitado(resposta_axe)},
+                    "amostrar": True,
+                },
             )
 
-            print(
-                f"Análise dinâmica - URL: {url}, Score: {score}, Violações: {len(violations)}, Falhas de contraste: {contrast_failures}"
+            violations = resposta_axe.get("violations", [])
+            score, contrast_failures = pontuar_violacoes(violations)
+            if snapshot is not None:
+                snapshot["html_renderizado"] = page.content()
+                snapshot["axe"] = resposta_axe
+
+            colunas_axe = resumir_violacoes(violations)
+            colunas_axe["axe_perfil"] = perfil
+            colunas_axe["axe_duracao_s"] = round(duracao_axe, 3)
+            colunas_axe.update(colunas_carga)
+
+            logger.info(
+                "Dynamic analysis - URL: %s, Profile: %s (%.2fs), Score: %s, Violations: %s, Contrast failures: %s",
+                url,
+                perfil,
+                duracao_axe,
+                score,
+                len(violations),
+                contrast_failures,
             )
-            return score, contrast_failures
+            return score, contrast_failures, colunas_axe
+    except PrazoEsgotado:
+        raise
     except PlaywrightTimeoutError as e:
-        logging.error(
-            f'{{"url": "{url}", "error": "Timeout in Axe (retried)", "details": "{str(e)}"}}'
+        if prazo.esgotado():
+            # O timeout veio do prazo, não da página: não adianta tentar de novo
+            raise PrazoEsgotado(etapa) from e
+        logger.error(
+            "Timeout in Axe (retried)", extra={"dados": {"url": url, "details": str(e)}}
         )
-        print(f"Timeout no Axe para {url} (após retry): {str(e)}")
-        return -1, -1
+        return -1, -1, {}
     except Exception as e:
-        logging.error(
-            f'{{"url": "{url}", "error": "Error in Axe (retried)", "details": "{str(e)}"}}'
+        logger.error(
+            "Error in Axe (retried)", extra={"dados": {"url": url, "details": str(e)}}
         )
-        print(f"Erro no Axe para {url} (após retry): {str(e)}")
-        return -1, -1
+        return -1, -1, {}
     finally:
+        if contexto:
+            try:
+                # Fechar o contexto grava o HAR, no modo de gravação
+                contexto.close()
+            except Exception as e:
+                logger.error(
+                    "Error closing browser context",
+                    extra={"dados": {"url": url, "details": str(e)}},
+                )
         if browser:
             try:
                 browser.close()
-                logging.info(f'{{"url": "{url}", "step": "Browser closed"}}')
+                logger.info("Browser closed", extra={"dados": {"url": url}})
             except Exception as e:
                 # Ignora o "Event loop is closed" silenciosamente - não imprime nada
                 pass
 
 
-def analisar_url_completa(url: str) -> dict | None:
+def analisar_url_completa(
+    url: str,
+    perfil: str = PERFIL_AXE_PADRAO,
+    arquivo: ArquivoSnapshots = None,
+    prazo: Prazo = None,
+    bloquear: bool = True,
+) -> dict | None:
     """
     Performs complete URL analysis.
 
     :param url: URL to analyze.
-    :return: Dictionary of features or None if failed.
+    :param perfil: Axe profile name from PERFIS_AXE.
+    :param arquivo: Snapshot archive that receives the raw HTML, rendered HTML and Axe JSON of a successful audit (None = don't archive).
+    :param prazo: Deadline created by the entry point (None = only the per-step timeouts).
+    :param bloquear: Block heavy resources and trackers during the audit (recorded in carga_bloqueio).
+    :return: Dictionary of features (plus axe_* columns) or None if failed. If the deadline runs out after the download, a partial result: the static features only, without label, with carga_prazo_esgotado naming the step that was cut.
 
-    EN: Why? Combines static and dynamic analysis for robust dataset. How? Downloads HTML, extracts features, and runs Axe audit.
-    PT: Por quê? Combina análise estática e dinâmica para dataset robusto. Como? Baixa HTML, extrai features e executa auditoria Axe.
+    EN: Why? Combines static and dynamic analysis for robust dataset. How? Downloads HTML, extracts features, and runs Axe audit, every step within the remaining deadline.
+    PT: Por quê? Combina análise estática e dinâmica para dataset robusto. Como? Baixa HTML, extrai features e executa auditoria Axe, cada etapa dentro do prazo restante.
     """
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+        snapshot = {} if arquivo is not None else None
+        soup, colunas_html = baixar_e_parsear(url, snapshot=snapshot, prazo=prazo)
         features = extrair_features(soup)
+        features.update(colunas_html)
 
-        score, falhas_contraste = gerar_label_e_features_dinamicas(url)
+        try:
+            score, falhas_contraste, colunas_axe = gerar_label_e_features_dinamicas(
+                url, perfil, snapshot=snapshot, prazo=prazo, bloquear=bloquear
+            )
+        except PrazoEsgotado as e:
+            # Resultado parcial: a parte estática já calculada, como na análise rápida
+            logger.warning(
+                "Deadline exhausted, returning static features only",
+                extra={"dados": {"url": url, "etapa": e.etapa, "prazo": repr(prazo)}},
+            )
+            features["falhas_contraste"] = 0
+            features["carga_prazo_esgotado"] = e.etapa
+            return features
         if score == -1:
             return None
+        if arquivo is not None:
+            # O snapshot é acessório: uma falha ao arquivar não descarta a auditoria
+            try:
+                arquivo.gravar(
+                    url,
+                    snapshot["html_cru"],
+                    snapshot.get("html_renderizado"),
+                    snapshot.get("axe"),
+                    perfil,
+                    snapshot["encoding"],
+                    colunas_html["html_sha256"],
+                )
+            except Exception as e:
+                logger.error(
+                    "Error archiving snapshot",
+                    extra={"dados": {"url": url, "details": str(e)}},
+                )
 
         features["falhas_contraste"] = falhas_contraste
         features["label_score_acessibilidade"] = score
-        print(f"Análise completa - Features: {features}")
+        features.update(colunas_axe)
+        logger.debug(
+            "Complete analysis features",
+            extra={"dados": {"url": url, "features": PayloadLimitado(features)}},
+        )
         return features
     except Exception as e:
-        logging.error(
-            f'{{"url": "{url}", "error": "Error analyzing", "details": "{str(e)}"}}'
+        logger.error(
+            "Error analyzing", extra={"dados": {"url": url, "details": str(e)}}
         )
-        print(f"Erro ao analisar {url}: {str(e)}")
         return None
 
 
-def analisar_url_rapida(url: str) -> dict | None:
+def analisar_url_rapida(url: str, prazo: Prazo = None) -> dict | None:
     """
     Performs quick static analysis for prediction.
 
     :param url: URL to analyze.
+    :param prazo: Deadline of the request (the download is cut when it runs out).
     :return: Dictionary of features or None if failed.
 
     EN: Why? Enables fast responses in the web app. How? Uses only static HTML analysis.
     PT: Por quê? Permite respostas rápidas na aplicação web. Como? Usa apenas análise estática de HTML.
     """
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup, colunas_html = baixar_e_parsear(url, prazo=prazo)
         features = extrair_features(soup)
+        features.update(colunas_html)
         features["falhas_contraste"] = 0
-        print(f"Análise rápida - Features: {features}")
+        logger.debug(
+            "Quick analysis features",
+            extra={"dados": {"url": url, "features": PayloadLimitado(features)}},
+        )
         return features
     except Exception as e:
-        logging.error(
-            f'{{"url": "{url}", "error": "Error in quick analysis", "details": "{str(e)}"}}'
+        logger.error(
+            "Error in quick analysis", extra={"dados": {"url": url, "details": str(e)}}
+        )
+        return None
+
+
+def features_de_snapshot(html_cru: bytes, axe: dict, encoding: str = None) -> dict:
+    """
+    Recomputes a row's features, label and axe_* columns from an archived snapshot.
+
+    :param html_cru: Raw HTML bytes as downloaded.
+    :param axe: Full Axe response of the audit.
+    :param encoding: Header charset used when the page was collected.
+    :return: Features dict as analisar_url_completa builds it (layout included), without html_*/carga_* columns.
+
+    EN: Why? Lets the dataset be rebuilt after extrair_features or LAYOUT_TAGS change, without network. How? Same parsing and decoding as baixar_e_parsear (parsear_html), and the same Axe summary as the live audit.
+    PT: Por quê? Permite reconstruir o dataset depois de mudanças em extrair_features ou LAYOUT_TAGS, sem rede. Como? Mesmo parsing e decodificação do baixar_e_parsear (parsear_html), e o mesmo resumo Axe da auditoria ao vivo.
+    """
+    features = extrair_features(parsear_html(html_cru, encoding))
+    violations = axe.get("violations", [])
+    (
+        features["label_score_acessibilidade"],
+        features["falhas_contraste"],
+    ) = pontuar_violacoes(violations)
+    features.update(resumir_violacoes(violations))
+    return features
+
+
+def links_mesma_origem(links: list, url_base: str) -> list:
+    """
+    Keeps the crawlable links of the same site as url_base, deduplicated in order.
+
+    :param links: Absolute URLs, highest priority first (navigation links).
+    :param url_base: Page whose host is kept ("www." and http/https are ignored).
+    :return: Normalized URLs, without fragments or links to non-HTML files.
+    """
+    host = (urlsplit(url_base).hostname or "").removeprefix("www.")
+    vistos = set()
+    saida = []
+    for link in links:
+        if not isinstance(link, str):
+            continue  # href de <a> dentro de SVG não é string
+        partes = urlsplit(link)
+        if partes.scheme not in ("http", "https"):
+            continue
+        if (partes.hostname or "").removeprefix("www.") != host:
+            continue
+        if _RE_NAO_HTML.search(partes.path):
+            continue
+        chave = normalizar_url(link)
+        if chave not in vistos:
+            vistos.add(chave)
+            saida.append(chave)
+    return saida
+
+
+# Colunas somadas entre as páginas (custos do rastreamento); html_truncado marca se alguma foi truncada
+_COLUNAS_SOMADAS = (
+    "axe_duracao_s",
+    "carga_reqs_bloqueadas",
+    "carga_bytes_estimados",
+    "carga_duracao_s",
+    "html_bytes",
+)
+_COLUNAS_MAXIMO = ("html_truncado",)
+
+
+def agregar_paginas(
+    paginas: list,
+    falhas: int = 0,
+    motivo_parada: str = "fronteira_vazia",
+    duracao_s: float = 0.0,
+) -> dict:
+    """
+    Aggregates per-page features into one site-level record.
+
+    :param paginas: List of (url, features) in crawl order; the first one is the home page.
+    :param falhas: Pages that could not be audited.
+    :param motivo_parada: Why the crawl stopped ("fronteira_vazia", "max_paginas" or "orcamento").
+    :param duracao_s: Crawl wall-clock time.
+    :return: Features dict (same keys as analisar_url_completa) plus site_* columns.
+
+    EN: Why? The model and the guide expect one record per URL. How? Numeric features and axe_* counts become per-page means, so the record stays on the single-page scale the model was trained on; costs are summed; the layout and text columns come from the home page; site_* columns keep the worst page.
+    PT: Por quê? O modelo e o guia esperam um registro por URL. Como? Features numéricas e contagens axe_* viram médias por página, para o registro ficar na escala de página única com que o modelo foi treinado; custos são somados; o layout e as colunas de texto vêm da página inicial; as colunas site_* guardam a pior página.
+    """
+    registro = dict(paginas[0][1])
+    for chave, valor in paginas[0][1].items():
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+            continue
+        valores = [features.get(chave, 0) for _, features in paginas]
+        if chave in _COLUNAS_SOMADAS:
+            registro[chave] = round(sum(valores), 3)
+        elif chave in _COLUNAS_MAXIMO:
+            registro[chave] = max(valores)
+        else:
+            registro[chave] = round(sum(valores) / len(valores), 3)
+    scores = [features["label_score_acessibilidade"] for _, features in paginas]
+    registro["label_score_acessibilidade"] = round(sum(scores) / len(scores))
+    url_pior, _ = min(paginas, key=lambda p: p[1]["label_score_acessibilidade"])
+    registro.update(
+        {
+            "site_paginas": len(paginas),
+            "site_paginas_falhas": falhas,
+            "site_score_min": min(scores),
+            "site_score_max": max(scores),
+            "site_pior_url": url_pior,
+            "site_motivo_parada": motivo_parada,
+            "site_duracao_s": round(duracao_s, 3),
+        }
+    )
+    return registro
+
+
+def _features_do_corpo(corpo: bytes, content_type: str) -> dict:
+    # Mesmas features do caminho estático, a partir do HTML cru que o navegador recebeu
+    truncado = int(bool(MAX_HTML_BYTES) and len(corpo) > MAX_HTML_BYTES)
+    if truncado:
+        corpo = corpo[:MAX_HTML_BYTES]
+    achado = re.search(r"charset=([\w-]+)", content_type, re.I)
+    features = extrair_features(
+        parsear_html(corpo, achado.group(1) if achado else None)
+    )
+    features.update(
+        {
+            "html_bytes": len(corpo),
+            "html_truncado": truncado,
+            "html_sha256": hashlib.sha256(corpo).hexdigest(),
+        }
+    )
+    return features
+
+
+async def _auditar_pagina(
+    contexto,
+    url: str,
+    perfil: str,
+    prazo: Prazo,
+    rede: RedeGravada = None,
+    bloquear: bool = BLOQUEAR_NA_COLETA,
+) -> dict:
+    # Uma aba do contexto compartilhado: conexões, cookies e cache HTTP são reaproveitados
+    page = await contexto.new_page()
+    try:
+        page.set_default_timeout(prazo.limitar_ms(TIMEOUT_PAGINA_MS, "navegacao"))
+        politica = _politica_padrao(rede, bloquear)
+        await politica.instalar_async(page)
+        colunas_carga = await politica.navegar_async(page, url, prazo)
+        await page.wait_for_selector(
+            "body", timeout=prazo.limitar_ms(TIMEOUT_BODY_MS, "navegacao")
+        )
+        inicio_axe = time.perf_counter()
+        results = await AxeAsync().run(page, options=opcoes_axe(perfil))
+        duracao_axe = time.perf_counter() - inicio_axe
+        links = await page.evaluate(_JS_LINKS)
+        url_final = page.url
+        resposta = politica.resposta_documento
+        try:
+            corpo = await resposta.body()
+            content_type = resposta.headers.get("content-type", "")
+        except Exception:
+            # Sem corpo do documento (ex.: resposta descartada após redirect via JS)
+            corpo = (await page.content()).encode("utf-8")
+            content_type = "text/html; charset=utf-8"
+    finally:
+        await page.close()
+
+    # O parsing é CPU puro; fora do event loop para não atrasar as outras abas
+    features = await asyncio.to_thread(_features_do_corpo, corpo, content_type)
+    violations = results.response.get("violations", [])
+    (
+        features["label_score_acessibilidade"],
+        features["falhas_contraste"],
+    ) = pontuar_violacoes(violations)
+    features.update(resumir_violacoes(violations))
+    features["axe_perfil"] = perfil
+    features["axe_duracao_s"] = round(duracao_axe, 3)
+    features.update(colunas_carga)
+    logger.info(
+        "Site page audited",
+        extra={
+            "dados": {
+                "url": url_final,
+                "score": features["label_score_acessibilidade"],
+                "violacoes": len(violations),
+            }
+        },
+    )
+    return {
+        "url": url_final,
+        "features": features,
+        "links": links_mesma_origem(links, url_final),
+    }
+
+
+async def _rastrear_site(
+    url: str,
+    perfil: str,
+    max_paginas: int,
+    prazo: Prazo,
+    concorrencia: int,
+    rede: RedeGravada = None,
+    bloquear: bool = BLOQUEAR_NA_COLETA,
+) -> dict | None:
+    inicio = time.monotonic()
+    esgotado = None
+    fronteira = collections.deque([url])
+    vistas = {normalizar_url(url)}
+    paginas = {}  # ordem de descoberta -> (url, features)
+    falhas = 0
+    motivo = "fronteira_vazia"
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=ARGS_CHROMIUM)
+        contexto = None
+        try:
+            # Um HAR por rastreamento, pela URL inicial: todas as abas dividem o contexto
+            contexto = await browser.new_context(
+                **(rede.opcoes_contexto(url) if rede else {})
+            )
+            if rede is not None:
+                await rede.instalar_async(contexto, url)
+            contexto.set_default_timeout(
+                prazo.limitar_ms(TIMEOUT_PAGINA_MS, "navegacao")
+            )
+            tarefas = {}  # tarefa -> ordem de descoberta
+            iniciadas = 0
+            while True:
+                try:
+                    while (
+                        fronteira
+                        and len(tarefas) < concorrencia
+                        and iniciadas < max_paginas
+                    ):
+                        # Entre páginas: sem tempo para mais uma, o rastreamento para aqui
+                        prazo.verificar("navegacao")
+                        tarefa = asyncio.create_task(
+                            _auditar_pagina(
+                                contexto,
+                                fronteira.popleft(),
+                                perfil,
+                                prazo,
+                                rede,
+                                bloquear,
+                            )
+                        )
+                        tarefas[tarefa] = iniciadas
+                        iniciadas += 1
+                except PrazoEsgotado as e:
+                    esgotado = e
+                if not tarefas:
+                    if esgotado is not None:
+                        motivo = "orcamento"
+                    elif fronteira:
+                        motivo = "max_paginas"
+                    break
+                restante = prazo.restante()
+                prontas, _ = await asyncio.wait(
+                    tarefas,
+                    timeout=None if math.isinf(restante) else restante,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not prontas:
+                    # Orçamento esgotado: as páginas em andamento são descartadas
+                    motivo = "orcamento"
+                    esgotado = PrazoEsgotado("navegacao")
+                    for tarefa in tarefas:
+                        tarefa.cancel()
+                    await asyncio.gather(*tarefas, return_exceptions=True)
+                    break
+                for tarefa in prontas:
+                    ordem = tarefas.pop(tarefa)
+                    try:
+                        pagina = tarefa.result()
+                    except Exception as e:
+                        falhas += 1
+                        logger.warning(
+                            "Site page failed",
+                            extra={"dados": {"url": url, "details": str(e)}},
+                        )
+                        continue
+                    paginas[ordem] = (pagina["url"], pagina["features"])
+                    vistas.add(normalizar_url(pagina["url"]))
+                    for link in pagina["links"]:
+                        if link not in vistas:
+                            vistas.add(link)
+                            fronteira.append(link)
+        finally:
+            if contexto is not None:
+                await contexto.close()  # Grava o HAR, no modo de gravação
+            await browser.close()
+
+    duracao = time.monotonic() - inicio
+    logger.info(
+        "Site crawl finished",
+        extra={
+            "dados": {
+                "url": url,
+                "paginas": len(paginas),
+                "falhas": falhas,
+                "motivo": motivo,
+                "duracao_s": round(duracao, 3),
+            }
+        },
+    )
+    if 0 not in paginas:
+        if esgotado is not None:
+            raise esgotado
+        return None  # Sem a página inicial não há layout nem registro comparável
+    return agregar_paginas(
+        [paginas[ordem] for ordem in sorted(paginas)], falhas, motivo, duracao
+    )
+
+
+def analisar_site(
+    url: str,
+    perfil: str = PERFIL_AXE_PADRAO,
+    max_paginas: int = SITE_MAX_PAGINAS,
+    orcamento_s: float = SITE_ORCAMENTO_S,
+    concorrencia: int = SITE_CONCORRENCIA,
+    prazo: Prazo = None,
+    rede: RedeGravada = None,
+    bloquear: bool = BLOQUEAR_NA_COLETA,
+) -> dict | None:
+    """
+    Crawls and audits up to max_paginas pages of a site and aggregates them into one record.
+
+    :param url: Home page URL (the crawl starts here).
+    :param perfil: Axe profile name from PERFIS_AXE.
+    :param max_paginas: Page budget, home page included.
+    :param orcamento_s: Wall-clock budget; pages still running when it ends are dropped.
+    :param concorrencia: Pages audited at the same time.
+    :param prazo: Deadline of the request; the crawl budget is cut to what is left of it, which also caps every page, navigation and body timeout. No page starts once it runs out.
+    :param rede: Network fixtures to record to or replay from (default: PREVISIA_REDE_MODO); one archive per crawl, named by the home page URL.
+    :param bloquear: Block heavy resources and trackers on every page (default: BLOQUEAR_NA_COLETA, the dataset's policy; recorded in carga_bloqueio).
+    :return: Site-level record (see agregar_paginas) or None if the home page failed.
+    :raises ValueError: If the Axe profile is unknown.
+
+    EN: Why? analisar_url_completa only sees the home page, while users browse deeper pages that are often worse. How? A frontier seeded by the home page's navigation links (same site only, breadth-first), audited by several tabs of one browser context, so connections and cached assets are reused; one Chromium per site instead of one per page.
+    PT: Por quê? analisar_url_completa só vê a página inicial, enquanto usuários navegam por páginas internas que costumam ser piores. Como? Uma fronteira semeada pelos links de navegação da página inicial (só do mesmo site, em largura), auditada por várias abas de um mesmo contexto de navegador, reaproveitando conexões e recursos em cache; um Chromium por site em vez de um por página.
+    """
+    opcoes_axe(perfil)  # Valida o perfil antes de abrir o navegador
+    if prazo is not None:
+        orcamento_s = min(orcamento_s, prazo.restante())
+    try:
+        return asyncio.run(
+            _rastrear_site(
+                url,
+                perfil,
+                max_paginas,
+                Prazo(orcamento_s),
+                concorrencia,
+                rede or rede_padrao(),
+                bloquear,
+            )
+        )
+    except PrazoEsgotado as e:
+        logger.warning(
+            "Deadline exhausted before the home page was audited",
+            extra={"dados": {"url": url, "etapa": e.etapa}},
+        )
+        return None
+    except Exception as e:
+        logger.error(
+            "Error in site crawl", extra={"dados": {"url": url, "details": str(e)}}
         )
-        print(f"Erro na análise rápida {url}: {str(e)}")
         return None
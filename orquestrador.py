@@ -4,127 +4,867 @@
 # PT: Este arquivo orquestra a análise paralela de URLs para gerar o dataset. Por quê? Para automatizar a coleta de dados em larga escala eficientemente. Como? Usa threads e salva resultados em CSV.
 import pandas as pd
 import glob
-from collector import analisar_url_completa
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collector import (
+    analisar_url_completa,
+    analisar_url_rapida,
+    BLOQUEAR_NA_COLETA,
+    features_de_snapshot,
+    impressao_digital,
+    opcoes_axe,
+    PERFIL_AXE_PADRAO,
+    REGRAS_AXE_COLUNAS,
+)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import argparse
+import hashlib
+import itertools
+import multiprocessing
 import time
 import os
 import json
 import logging
+import re
+import socket
+import tempfile
+from utils.log import configurar_logging
+from utils.armazem_features import ArmazemFeatures
+from utils.arquivo_snapshots import ARQUIVO_SNAPSHOTS, ArquivoSnapshots
+from utils.acumulador_linhas import AcumuladorColunar
+from utils.fila_trabalho import (
+    ARQUIVO_FILA,
+    CONCLUIDO,
+    EM_ANDAMENTO,
+    FilaTrabalho,
+    RenovadorLeases,
+)
+from utils.validate_url import normalizar_url
+from utils.perfilamento import PERFILAR_A_CADA, Perfilador
+from utils.modelo import ModeloAcessibilidade
+from utils.prazo import PRAZO_AUDITORIA_S, Prazo
+from utils.triagem import (
+    ARQUIVO_REGISTRO_TRIAGEM,
+    LIMIAR_TRIAGEM,
+    Triagem,
+    resumir_registro,
+)
 
 # EN: Setup logging to track orchestration errors. Why? Facilitates debugging with NVDA, saving errors to file.
 # PT: Configura o logging para rastrear erros de orquestração. Por quê? Facilita depuração com NVDA, salvando erros em arquivo.
-logging.basicConfig(
-    filename="erros_orquestrador.log",
-    level=logging.ERROR,
-    format="%(asctime)s - %(message)s",
-)
+configurar_logging("erros_orquestrador.log", nivel=logging.ERROR)
+logger = logging.getLogger(__name__)
 # EN: Constants for file paths and workers. Why? Centralizes configuration for easy maintenance.
 # PT: Constantes para caminhos de arquivos e workers. Por quê? Centraliza a configuração para fácil manutenção.
 ARQUIVO_URLS = "data/tranco_top_10000.csv"  # CSV full com 5874 URLs
 ARQUIVO_DATASET = "data/dataset_acessibilidade.csv"
 MAX_WORKERS = 3  # Mantido em 3
+MAX_WORKERS_DEDUP = 16  # Só HTTP, sem Chromium: pode ser bem maior que MAX_WORKERS
+DIRETORIO_BLOCOS = "data/blocos_coleta"  # Checkpoints: um CSV por bloco de linhas
+LINHAS_POR_BLOCO = 100  # Mantida a cadência de checkpoint de 100 sucessos
+LOTE_FILA = MAX_WORKERS * 4  # URLs reivindicadas por vez no modo fila
+ESPERA_FILA_S = 30  # Reconsulta a fila enquanto outros workers terminam
+DIRETORIO_SHARDS = "data/shards"  # Fatias: shard_III_de_NNN/{blocos,dataset.csv}
+_contador_auditorias = itertools.count()  # Escolhe 1 em cada N auditorias para perfilar
+LINHAS_REEXTRACAO = 500  # Linhas lidas por vez na reextração (memória constante)
+
+# EN: Fixed dataset schema (column -> type), in CSV column order. Why? Lets the columnar accumulator keep typed arrays instead of one dict per row. How? Static features, the Axe summary of collector.resumir_violacoes, and the carga_/html_/dedup_ metadata columns.
+# PT: Schema fixo do dataset (coluna -> tipo), na ordem das colunas do CSV. Por quê? Permite ao acumulador colunar manter arrays tipados em vez de um dict por linha. Como? Features estáticas, o resumo Axe de collector.resumir_violacoes e as colunas de metadados carga_/html_/dedup_.
+ESQUEMA_DATASET = {
+    "url": "str",
+    "label_score_acessibilidade": "int",
+    "imagens_sem_alt": "int",
+    "pct_links_genericos": "float",
+    "lang_presente": "int",
+    "erros_hierarquia": "int",
+    "inputs_sem_label": "int",
+    "aria_presente": "int",
+    "videos_sem_captions": "int",
+    "falhas_contraste": "int",
+    "layout_json": "str",
+    "axe_total_violacoes": "int",
+    **{
+        f"axe_{medida}_{regra.replace('-', '_')}": "int"
+        for regra in REGRAS_AXE_COLUNAS + ["outras"]
+        for medida in ("viol", "nos")
+    },
+    "axe_perfil": "str",
+    "axe_duracao_s": "float",
+    "carga_bloqueio": "str",
+    "carga_motivo_parada": "str",
+    "carga_reqs_bloqueadas": "int",
+    "carga_bytes_estimados": "int",
+    "carga_duracao_s": "float",
+    "html_bytes": "int",
+    "html_truncado": "int",
+    "html_tempo_s": "float",
+    "html_sha256": "str",
+    "dedup_url_final": "str",
+    "dedup_sha256": "str",
+    "dedup_alias_de": "str",
+}
 
 
-def gera_dataset(batch_size=5874):  # Processa todas, mas filtra processadas
+def deduplicar_alvos(
+    urls: list, dados_existentes: list
+) -> tuple[list, dict, list, dict]:
     """
-    Generates accessibility dataset, resuming from last partial if exists.
+    Groups URLs that redirect to the same final URL or serve identical HTML.
 
-    :param batch_size: Number of URLs to process (default: 5874).
+    :param urls: URLs still to be processed, in priority order.
+    :param dados_existentes: Rows already collected (may carry dedup_* columns).
+    :return: Tuple of (representatives to audit, {representative: [(alias, fingerprint), ...]}, [(alias, fingerprint, existing row), ...], {url: fingerprint}).
+
+    EN: Why? Many Tranco entries are regional or alias domains of the same site; auditing each one in Chromium is wasted work. How? Fingerprints every URL in parallel with plain HTTP; the first URL of each group (by final URL or HTML hash) is audited, the rest reuse its result. Matches against already collected rows are reused directly.
+    PT: Por quê? Muitas entradas do Tranco são domínios regionais ou aliases do mesmo site; auditar cada um no Chromium é trabalho desperdiçado. Como? Calcula a impressão digital de cada URL em paralelo com HTTP simples; a primeira URL de cada grupo (por URL final ou hash do HTML) é auditada, as demais reaproveitam o resultado. Coincidências com linhas já coletadas são reaproveitadas diretamente.
+    """
+    impressoes = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_DEDUP) as executor:
+        futures = {executor.submit(impressao_digital, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                impressoes[url] = future.result()
+            except Exception as e:
+                # Sem impressão digital, a URL é tratada como única (a auditoria decide)
+                logger.info(
+                    "Fingerprint failed",
+                    extra={"dados": {"url": url, "details": str(e)}},
+                )
+
+    conhecidos = {}  # url_final ou sha256 -> linha existente ou URL representante
+    for linha in dados_existentes:
+        for chave in ("dedup_url_final", "dedup_sha256"):
+            valor = linha.get(chave)
+            if isinstance(valor, str) and valor:
+                conhecidos.setdefault(valor, linha)
+
+    representantes, aliases, reaproveitados = [], {}, []
+    for url in urls:
+        impressao = impressoes.get(url)
+        if impressao is None:
+            representantes.append(url)
+            continue
+        chaves = (impressao["dedup_url_final"], impressao["dedup_sha256"])
+        equivalente = next((conhecidos[c] for c in chaves if c in conhecidos), None)
+        if equivalente is None:
+            representantes.append(url)
+            aliases[url] = []
+            for c in chaves:
+                conhecidos[c] = url
+        elif isinstance(equivalente, dict):
+            reaproveitados.append((url, impressao, equivalente))
+        else:
+            aliases[equivalente].append((url, impressao))
+    print(
+        f"Dedup: {len(urls)} URLs -> {len(representantes)} auditorias únicas, "
+        f"{sum(len(a) for a in aliases.values())} aliases e {len(reaproveitados)} reaproveitadas de coletas anteriores."
+    )
+    return representantes, aliases, reaproveitados, impressoes
+
+
+def shard_da_url(url: str, total_shards: int) -> int:
+    """
+    Deterministic shard index of a URL.
+
+    :param url: URL as listed in ARQUIVO_URLS.
+    :param total_shards: Number of shards.
+    :return: Index in [0, total_shards).
 
-    EN: Why? To process URLs in parallel and save features for ML. How? Reads URLs, schedules threads, and serializes layout as JSON.
-    PT: Por quê? Para processar URLs em paralelo e salvar features para ML. Como? Lê URLs, agenda threads e serializa layout as JSON.
+    EN: Why? N processes or machines must split the URL list into disjoint slices without coordinating. How? SHA-256 of the normalized URL modulo N, stable across runs, machines and Python versions (unlike hash()).
+    PT: Por quê? N processos ou máquinas precisam dividir a lista de URLs em fatias disjuntas sem se coordenar. Como? SHA-256 da URL normalizada módulo N, estável entre execuções, máquinas e versões do Python (ao contrário de hash()).
+    """
+    resumo = hashlib.sha256(normalizar_url(url).encode("utf-8")).digest()
+    return int.from_bytes(resumo[:8], "big") % total_shards
+
+
+def caminhos_shard(shard: int, total_shards: int) -> tuple[str, str]:
+    """
+    Checkpoint directory and output CSV of one shard (the usual paths when unsharded).
+    """
+    if total_shards == 1:
+        return DIRETORIO_BLOCOS, ARQUIVO_DATASET
+    base = os.path.join(DIRETORIO_SHARDS, f"shard_{shard:03d}_de_{total_shards:03d}")
+    return os.path.join(base, "blocos"), os.path.join(base, "dataset.csv")
+
+
+def linha_alias(resultado: dict, url: str, impressao: dict, url_original: str) -> dict:
+    """
+    Copies an audited row for an equivalent URL, recording the alias relation.
+    """
+    linha = dict(resultado)
+    linha.update(impressao)
+    linha["url"] = url
+    linha["dedup_alias_de"] = url_original
+    return linha
+
+
+def carregar_urls() -> list | None:
+    """
+    Reads the URL list from ARQUIVO_URLS (None if it does not exist).
     """
-    print("Iniciando coleta paralela (com resumo de partial se existir)...")
     try:
         all_urls = pd.read_csv(ARQUIVO_URLS, header=None)[0].tolist()
         all_urls = [url.strip() for url in all_urls]  # Limpeza
         print(f"Carregadas {len(all_urls)} URLs do CSV full para processamento.")
+        return all_urls
     except FileNotFoundError as e:
-        logging.error(
-            f"EN: File not found: {str(e)}. PT: Arquivo não encontrado: {str(e)}."
-        )
+        logger.error("EN: File not found: %s. PT: Arquivo não encontrado: %s.", e, e)
         print(f"Erro: {e}. Rode prepare_urls.py.")
-        return
+        return None
 
-    # Carrega o último partial (maior número)
-    partial_files = glob.glob("data/dataset_acessibilidade_partial_*.csv")
-    if partial_files:
-        partial_files.sort(key=lambda x: int(x.split("_")[-1].split(".")[0]))
-        last_partial = partial_files[-1]
-        dados_existentes = pd.read_csv(last_partial)
-        processed_urls = set(dados_existentes["url"].tolist())
-        urls_to_process = [url for url in all_urls if url not in processed_urls][
-            :batch_size
-        ]
-        print(
-            f"Resumindo de {last_partial}: {len(dados_existentes)} já processadas. Faltam {len(urls_to_process)} novas."
-        )
-        dados = dados_existentes.to_dict("records")  # Carrega existentes como base
-        processed_count = len(dados)
-    else:
-        urls_to_process = all_urls[:batch_size]
-        dados = []
-        processed_count = 0
-        print("Sem partials encontrados - iniciando do zero.")
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(analisar_url_completa, url): url for url in urls_to_process
-        }
+
+def auditar_no_prazo(
+    url: str, perfil_axe: str, arquivo: ArquivoSnapshots, prazo_s: float
+) -> dict | None:
+    """
+    analisar_url_completa with a deadline that starts when the pool thread picks the task up (not at submission).
+    """
+    return analisar_url_completa(
+        url, perfil_axe, arquivo, Prazo(prazo_s), bloquear=BLOQUEAR_NA_COLETA
+    )
+
+
+def auditar_urls(
+    urls_to_audit: list,
+    aliases: dict,
+    impressoes: dict,
+    perfil_axe: str,
+    registrar,
+    falhar=None,
+    progresso=lambda: "",
+    perfilar_a_cada=0,
+    arquivo=None,
+    prazo_s=PRAZO_AUDITORIA_S,
+) -> None:
+    """
+    Audits URLs in parallel and hands each row (and its aliases' rows) to registrar.
+
+    :param urls_to_audit: Representative URLs to audit in Chromium.
+    :param aliases: {representative: [(alias, fingerprint), ...]} from deduplicar_alvos.
+    :param impressoes: {url: fingerprint} from deduplicar_alvos.
+    :param perfil_axe: Axe profile name.
+    :param registrar: Called with each finished row (main thread only).
+    :param falhar: Optional, called with (url, error) for a failed URL and each of its aliases.
+    :param progresso: Returns the progress label printed before each URL.
+    :param perfilar_a_cada: Profile one in every N audits into utils.perfilamento's artifacts directory (0 = off).
+    :param arquivo: Optional ArquivoSnapshots receiving each audit's raw HTML, rendered HTML and Axe JSON.
+    :param prazo_s: Deadline of each audit in seconds (0 = only the per-step timeouts); an audit cut by it counts as a failure, since its row would have no label.
+    """
+    perfilador = Perfilador() if perfilar_a_cada else None
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        futures = {}
+        for url in urls_to_audit:
+            if (
+                perfilador is not None
+                and next(_contador_auditorias) % perfilar_a_cada == 0
+            ):
+                future = executor.submit(
+                    perfilador.executar,
+                    f"auditoria_{url}",
+                    auditar_no_prazo,
+                    url,
+                    perfil_axe,
+                    arquivo,
+                    prazo_s,
+                )
+            else:
+                future = executor.submit(
+                    auditar_no_prazo, url, perfil_axe, arquivo, prazo_s
+                )
+            futures[future] = url
         for i, future in enumerate(as_completed(futures)):
             url = futures[future]
             print(
-                f"Processando {processed_count + i + 1}/{len(all_urls)} (nova: {i+1}/{len(urls_to_process)}): {url}"
+                f"Processando {progresso()} (nova: {i+1}/{len(urls_to_audit)}): {url}"
             )
+            erro = None
             try:
                 resultado = future.result()
-                if resultado:
+                if resultado and resultado.get("carga_prazo_esgotado"):
+                    print(f"Prazo esgotado para {url} - pulando.")
+                    erro = f"Prazo esgotado em {resultado['carga_prazo_esgotado']}"
+                elif resultado:
                     if "layout" in resultado:
                         resultado["layout_json"] = json.dumps(resultado["layout"])
                         del resultado["layout"]
                     resultado["url"] = url
-                    dados.append(resultado)
-                    processed_count += 1
-                    print(
-                        f"Sucesso! Total sucessos: {processed_count}"
-                    )  # <-- Adicionado para monitorar sucessos
-                    # Save parcial a cada 100 novas processadas com sucesso
-                    if processed_count % 100 == 0:
-                        partial_df = pd.DataFrame(dados)
-                        cols = ["url", "label_score_acessibilidade"] + [
-                            c
-                            for c in partial_df.columns
-                            if c not in ["url", "label_score_acessibilidade"]
-                        ]
-                        partial_df = partial_df[cols]
-                        partial_filename = (
-                            f"data/dataset_acessibilidade_partial_{processed_count}.csv"
-                        )
-                        partial_df.to_csv(partial_filename, index=False)
-                        print(
-                            f"Checkpoint salvo: {processed_count} processadas no total em {partial_filename}"
-                        )
+                    resultado.update(impressoes.get(url, {}))
+                    resultado["dedup_alias_de"] = ""
+                    registrar(resultado)
+                    for alias, impressao in aliases.get(url, []):
+                        print(f"Alias de {url}: {alias} (reaproveitando auditoria)")
+                        registrar(linha_alias(resultado, alias, impressao, url))
                 else:
                     print(f"Falha na análise para {url} - pulando.")
+                    erro = "Análise sem resultado"
             except Exception as e:
-                logging.error(
-                    f"EN: Error in thread for {url}: {str(e)}. PT: Erro em thread para {url}: {str(e)}."
+                logger.error(
+                    "EN: Error in thread for %s: %s. PT: Erro em thread para %s: %s.",
+                    url,
+                    e,
+                    url,
+                    e,
                 )
                 print(f"Erro em thread para {url}: {e}")
+                erro = str(e)
+            if erro is not None and falhar is not None:
+                falhar(url, erro)
+                for alias, _ in aliases.get(url, []):
+                    falhar(alias, erro)
             time.sleep(4)  # Mantido em 4s
+    finally:
+        # Também em Ctrl+C: não espera as auditorias enfileiradas, que podem levar minutos cada
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def triar_urls(urls: list, aliases: dict, triagem: Triagem) -> tuple[list, dict]:
+    """
+    Splits URLs into those needing a full audit and those the model is confident about.
+
+    :param urls: Representative URLs about to be audited.
+    :param aliases: {representative: [(alias, fingerprint), ...]}; aliases follow their representative's decision.
+    :param triagem: Triagem with the loaded model and threshold.
+    :return: Tuple of (URLs to audit, {url: decision} for the audited ones, logged once the audit finishes).
+
+    EN: Why? A confident URL adds little to the dataset but costs a full Chromium audit. How? Quick static analysis in parallel (plain HTTP, MAX_WORKERS_DEDUP threads), then one MC-dropout batch; skipped URLs are logged now and collected again (re-triaged) on a later run, URLs whose quick analysis fails are audited.
+    PT: Por quê? Uma URL confiante acrescenta pouco ao dataset, mas custa uma auditoria completa no Chromium. Como? Análise estática rápida em paralelo (HTTP simples, MAX_WORKERS_DEDUP threads) e depois um lote MC-dropout; URLs puladas são registradas agora e coletadas de novo (retriadas) numa próxima execução, URLs cuja análise rápida falha são auditadas.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_DEDUP) as executor:
+        rapidas = list(executor.map(analisar_url_rapida, urls))
+    itens = [(url, features) for url, features in zip(urls, rapidas) if features]
+    decisoes = {d["url"]: d for d in triagem.avaliar_lote(itens)} if itens else {}
+    auditar, puladas, aliases_pulados = [], 0, 0
+    for url in urls:
+        decisao = decisoes.get(url)
+        if decisao is None or decisao["auditar"]:
+            auditar.append(url)
+        else:
+            triagem.registrar(decisao)
+            puladas += 1
+            aliases_pulados += len(aliases.get(url, []))
+    print(
+        f"Triagem (limiar {triagem.limiar}): {len(auditar)} auditorias, {puladas} URLs "
+        f"confiantes puladas (e {aliases_pulados} aliases delas)."
+    )
+    return auditar, {url: decisoes[url] for url in auditar if url in decisoes}
+
 
-    if dados:
-        os.makedirs("data", exist_ok=True)
-        df = pd.DataFrame(dados)
-        cols = ["url", "label_score_acessibilidade"] + [
-            c for c in df.columns if c not in ["url", "label_score_acessibilidade"]
+def gera_dataset(
+    batch_size=5874,
+    perfil_axe=PERFIL_AXE_PADRAO,
+    deduplicar=True,
+    armazenar=True,
+    shard=0,
+    total_shards=1,
+    perfilar_a_cada=PERFILAR_A_CADA,
+    arquivar=True,
+    limiar_triagem=LIMIAR_TRIAGEM,
+    prazo_s=PRAZO_AUDITORIA_S,
+):  # Processa todas, mas filtra processadas
+    """
+    Generates accessibility dataset, resuming from the checkpoint blocks (or the last legacy partial) if they exist.
+
+    :param batch_size: Number of URLs to process (default: 5874).
+    :param perfil_axe: Axe profile name from collector.PERFIS_AXE (default: PREVISIA_AXE_PERFIL or "completo").
+    :param deduplicar: Resolve redirects and fingerprint HTML first, auditing each equivalent page once (default: True).
+    :param armazenar: Also write each row to the SQLite feature store read by the web app (default: True).
+    :param shard: Index of the slice collected by this process (default: 0).
+    :param total_shards: Number of slices the URL list is split into by shard_da_url; each slice has its own checkpoints under DIRETORIO_SHARDS (default: 1, unsharded).
+    :param perfilar_a_cada: Profile one in every N audits (default: PREVISIA_PROFILE_A_CADA or 0, off).
+    :param arquivar: Archive each audit's HTML and Axe JSON in ARQUIVO_SNAPSHOTS for offline re-extraction (default: True).
+    :param limiar_triagem: Skip the audit of URLs whose quick prediction has MC-dropout uncertainty up to this many score points (utils.triagem; needs the trained model; default: PREVISIA_TRIAGEM_LIMIAR or 0, off).
+    :param prazo_s: Deadline of each audit in seconds (default: PREVISIA_PRAZO_AUDITORIA_S or 300; 0 = none).
+
+    EN: Why? To process URLs in parallel and save features for ML. How? Reads URLs, deduplicates aliases, schedules threads, serializes layout as JSON and accumulates rows in a columnar accumulator that checkpoints one block per LINHAS_POR_BLOCO rows.
+    PT: Por quê? Para processar URLs em paralelo e salvar features para ML. Como? Lê URLs, deduplica aliases, agenda threads, serializa layout as JSON e acumula as linhas em um acumulador colunar que faz checkpoint de um bloco a cada LINHAS_POR_BLOCO linhas.
+    """
+    opcoes_axe(perfil_axe)  # Falha cedo com perfil inválido, antes de abrir threads
+    triagem = (
+        Triagem(ModeloAcessibilidade(), limiar_triagem, origem="coleta")
+        if limiar_triagem > 0
+        else None
+    )
+    print(
+        f"Iniciando coleta paralela (perfil Axe: {perfil_axe}, com resumo de partial se existir)..."
+    )
+    all_urls = carregar_urls()
+    if all_urls is None:
+        return
+    if total_shards > 1:
+        all_urls = [u for u in all_urls if shard_da_url(u, total_shards) == shard]
+        print(f"Fatia {shard}/{total_shards}: {len(all_urls)} URLs.")
+
+    # Retoma dos blocos já gravados; coletas antigas retomam do último partial completo
+    diretorio_blocos, arquivo_dataset = caminhos_shard(shard, total_shards)
+    acumulador = AcumuladorColunar(
+        ESQUEMA_DATASET, diretorio_blocos, tamanho_bloco=LINHAS_POR_BLOCO
+    )
+    partial_files = glob.glob("data/dataset_acessibilidade_partial_*.csv")
+    if not len(acumulador) and partial_files and total_shards == 1:
+        partial_files.sort(key=lambda x: int(x.split("_")[-1].split(".")[0]))
+        last_partial = partial_files[-1]
+        print(f"Importando {last_partial} para {diretorio_blocos}...")
+        acumulador.incorporar_csv(last_partial)
+    if len(acumulador):
+        processed_urls = set()
+        for bloco in acumulador.iterar_blocos(["url"]):
+            processed_urls.update(bloco["url"])
+        urls_to_process = [url for url in all_urls if url not in processed_urls][
+            :batch_size
+        ]
+        print(
+            f"Resumindo de {diretorio_blocos}: {len(acumulador)} já processadas. Faltam {len(urls_to_process)} novas."
+        )
+    else:
+        urls_to_process = all_urls[:batch_size]
+        print("Sem checkpoints encontrados - iniciando do zero.")
+    processed_count = len(acumulador)
+
+    # Só a thread principal grava; fatias em processos locais são serializadas pelo SQLite
+    armazem = ArmazemFeatures() if armazenar else None
+    arquivo = ArquivoSnapshots() if arquivar else None
+
+    def registrar(resultado: dict) -> None:
+        # Adiciona uma linha; o acumulador grava um bloco (checkpoint) a cada LINHAS_POR_BLOCO
+        nonlocal processed_count
+        bloco = acumulador.adicionar(resultado)
+        if armazem is not None:
+            armazem.gravar(resultado)
+        processed_count += 1
+        print(
+            f"Sucesso! Total sucessos: {processed_count}"
+        )  # <-- Adicionado para monitorar sucessos
+        if bloco:
+            print(
+                f"Checkpoint salvo: {processed_count} processadas no total em {bloco}"
+            )
+
+    if deduplicar:
+        colunas_dedup = ["url", "dedup_url_final", "dedup_sha256"]
+        existentes = [
+            linha
+            for bloco in acumulador.iterar_blocos(colunas_dedup)
+            for linha in bloco.to_dict("records")
         ]
-        df = df[cols]
-        df.to_csv(ARQUIVO_DATASET, index=False)
-        print(f"Dataset final salvo: {len(df)} linhas em {ARQUIVO_DATASET}.")
+        urls_to_audit, aliases, reaproveitados, impressoes = deduplicar_alvos(
+            urls_to_process, existentes
+        )
+        if reaproveitados:
+            # Só as linhas reaproveitadas são carregadas por completo
+            origens = {existente["url"] for _, _, existente in reaproveitados}
+            completas = {
+                linha["url"]: linha
+                for bloco in acumulador.iterar_blocos()
+                for linha in bloco[bloco["url"].isin(origens)].to_dict("records")
+            }
+            for url, impressao, existente in reaproveitados:
+                original = existente["url"]
+                registrar(linha_alias(completas[original], url, impressao, original))
+    else:
+        urls_to_audit, aliases, impressoes = urls_to_process, {}, {}
+
+    registrar_auditoria, falhar_auditoria = registrar, None
+    if triagem is not None:
+        urls_to_audit, decisoes = triar_urls(urls_to_audit, aliases, triagem)
+
+        def registrar_auditoria(resultado: dict) -> None:
+            # Registra o erro observado da previsão rápida contra o label do Axe
+            decisao = decisoes.pop(resultado["url"], None)
+            if decisao is not None:
+                triagem.registrar(decisao, resultado["label_score_acessibilidade"])
+            registrar(resultado)
+
+        def falhar_auditoria(url: str, erro: str) -> None:
+            # Auditoria falhou: a decisão é registrada sem erro observado
+            decisao = decisoes.pop(url, None)
+            if decisao is not None:
+                triagem.registrar(decisao)
+
+    auditar_urls(
+        urls_to_audit,
+        aliases,
+        impressoes,
+        perfil_axe,
+        registrar_auditoria,
+        falhar=falhar_auditoria,
+        progresso=lambda: f"{processed_count + 1}/{len(all_urls)}",
+        perfilar_a_cada=perfilar_a_cada,
+        arquivo=arquivo,
+        prazo_s=prazo_s,
+    )
+
+    if len(acumulador):
+        os.makedirs(os.path.dirname(arquivo_dataset), exist_ok=True)
+        total = acumulador.salvar_csv(arquivo_dataset)
+        print(f"Dataset final salvo: {total} linhas em {arquivo_dataset}.")
     else:
         print("Nenhum dado coletado.")
 
 
+def gera_dataset_fila(
+    caminho_fila=ARQUIVO_FILA,
+    perfil_axe=PERFIL_AXE_PADRAO,
+    deduplicar=True,
+    armazenar=True,
+    perfilar_a_cada=PERFILAR_A_CADA,
+    arquivar=True,
+    prazo_s=PRAZO_AUDITORIA_S,
+):
+    """
+    Collects URLs from the shared lease-based work queue; run any number of these processes.
+
+    :param caminho_fila: SQLite work queue path (default: PREVISIA_FILA or data/fila_coleta.sqlite).
+    :param perfil_axe: Axe profile name from collector.PERFIS_AXE.
+    :param deduplicar: Group equivalent URLs within each claimed batch (default: True).
+    :param armazenar: Also write each row to the SQLite feature store (default: True).
+    :param perfilar_a_cada: Profile one in every N audits of this process (default: PREVISIA_PROFILE_A_CADA or 0, off).
+    :param arquivar: Archive each audit's HTML and Axe JSON in ARQUIVO_SNAPSHOTS (default: True).
+    :param prazo_s: Deadline of each audit in seconds (default: PREVISIA_PRAZO_AUDITORIA_S or 300; 0 = none).
+
+    EN: Why? A crash lost everything audited since the last checkpoint, and collectors could not share one URL list. How? Seeds the queue with ARQUIVO_URLS (idempotent), then claims batches with leases renewed by a heartbeat; each row is saved when its URL is concluded. Crashed workers' URLs are re-issued when their lease expires; Ctrl+C cancels the queued audits and releases this worker's claims right away. Whoever sees the queue drained writes ARQUIVO_DATASET.
+    PT: Por quê? Uma queda perdia tudo o que foi auditado desde o último checkpoint, e coletores não conseguiam dividir uma lista de URLs. Como? Semeia a fila com ARQUIVO_URLS (idempotente) e reivindica lotes com leases renovados por um heartbeat; cada linha é salva quando sua URL é concluída. URLs de workers que caíram são reemitidas quando o lease expira; Ctrl+C cancela as auditorias enfileiradas e libera na hora as reivindicações deste worker. Quem vê a fila esvaziada grava o ARQUIVO_DATASET.
+    """
+    opcoes_axe(perfil_axe)  # Falha cedo com perfil inválido, antes de abrir threads
+    all_urls = carregar_urls()
+    if all_urls is None:
+        return
+    fila = FilaTrabalho(caminho_fila)
+    print(f"Fila {caminho_fila}: {fila.semear(all_urls)} URLs novas; {fila.resumo()}")
+
+    dono = f"{socket.gethostname()}-{os.getpid()}"
+    armazem = ArmazemFeatures() if armazenar else None
+    arquivo = ArquivoSnapshots() if arquivar else None
+    renovador = RenovadorLeases(fila, dono)
+    concluidas = 0
+
+    def registrar(resultado: dict) -> None:
+        nonlocal concluidas
+        if fila.concluir(dono, resultado["url"], resultado):
+            concluidas += 1
+        if armazem is not None:
+            armazem.gravar(resultado)
+        renovador.remover(resultado["url"])
+        print(f"Sucesso! Total sucessos deste worker: {concluidas}")
+
+    def falhar(url: str, erro: str) -> None:
+        fila.falhar(dono, url, erro)
+        renovador.remover(url)
+
+    renovador.iniciar()
+    try:
+        while True:
+            lote = fila.reivindicar(dono, LOTE_FILA)
+            if not lote:
+                # Outros workers ainda auditam: espera, pois um lease pode expirar e voltar
+                if fila.resumo()[EM_ANDAMENTO] == 0:
+                    break
+                time.sleep(ESPERA_FILA_S)
+                continue
+            renovador.adicionar(lote)
+            if deduplicar:
+                urls_to_audit, aliases, _, impressoes = deduplicar_alvos(lote, [])
+            else:
+                urls_to_audit, aliases, impressoes = lote, {}, {}
+            auditar_urls(
+                urls_to_audit,
+                aliases,
+                impressoes,
+                perfil_axe,
+                registrar,
+                falhar=falhar,
+                progresso=lambda: f"[{dono}] {fila.resumo()[CONCLUIDO] + 1}/{len(all_urls)}",
+                perfilar_a_cada=perfilar_a_cada,
+                arquivo=arquivo,
+                prazo_s=prazo_s,
+            )
+    except KeyboardInterrupt:
+        print(f"Interrompido: {fila.liberar(dono)} URLs devolvidas à fila.")
+        raise
+    finally:
+        renovador.parar()
+
+    resumo = fila.resumo()
+    print(f"Fila esvaziada: {resumo}")
+    with tempfile.TemporaryDirectory() as temporario:
+        acumulador = AcumuladorColunar(ESQUEMA_DATASET, temporario)
+        for linha in fila.linhas_concluidas():
+            acumulador.adicionar(linha)
+        if len(acumulador):
+            os.makedirs(os.path.dirname(ARQUIVO_DATASET), exist_ok=True)
+            total = acumulador.salvar_csv(ARQUIVO_DATASET)
+            print(f"Dataset final salvo: {total} linhas em {ARQUIVO_DATASET}.")
+        else:
+            print("Nenhum dado coletado.")
+
+
+def mesclar_shards(total_shards: int = None, destino: str = ARQUIVO_DATASET) -> int:
+    """
+    Merges the shard checkpoints into one dataset CSV.
+
+    :param total_shards: Number of shards to merge (default: the only shard count found in DIRETORIO_SHARDS).
+    :param destino: Output CSV path (replaced atomically).
+    :return: Number of rows written.
+    :raises ValueError: If shards are missing, the shard count is ambiguous, or a shard holds URLs of another slice.
+
+    EN: Why? Shards are collected by separate processes or machines (copy their shard_* folders into DIRETORIO_SHARDS). How? Streams each shard's blocks in shard order, checks every URL belongs to its slice, drops rows without a label and keeps the first row per normalized URL; memory holds only the set of URLs seen.
+    PT: Por quê? As fatias são coletadas por processos ou máquinas separados (copie as pastas shard_* para DIRETORIO_SHARDS). Como? Lê os blocos de cada fatia em ordem, verifica se cada URL pertence à sua fatia, descarta linhas sem label e mantém a primeira linha por URL normalizada; a memória guarda só o conjunto de URLs vistas.
+    """
+    encontrados = {}  # total de fatias -> {índice: pasta}
+    for pasta in glob.glob(os.path.join(DIRETORIO_SHARDS, "shard_*_de_*")):
+        m = re.fullmatch(r"shard_(\d+)_de_(\d+)", os.path.basename(pasta))
+        if m:
+            encontrados.setdefault(int(m[2]), {})[int(m[1])] = pasta
+    if total_shards is None:
+        if len(encontrados) != 1:
+            raise ValueError(
+                f"Informe o total de fatias: encontradas divisões em {sorted(encontrados) or 'nenhuma'} fatias."
+            )
+        total_shards = next(iter(encontrados))
+    fatias = encontrados.get(total_shards, {})
+    faltando = [i for i in range(total_shards) if i not in fatias]
+    if faltando:
+        raise ValueError(f"Fatias ausentes (de {total_shards}): {faltando}")
+
+    vistas = set()
+    escritas = duplicadas = sem_label = 0
+    temporario = destino + ".tmp"
+    try:
+        with open(temporario, "w", encoding="utf-8", newline="") as saida:
+            saida.write(",".join(ESQUEMA_DATASET) + "\n")
+            for indice in range(total_shards):
+                acumulador = AcumuladorColunar(
+                    ESQUEMA_DATASET, os.path.join(fatias[indice], "blocos")
+                )
+                linhas_fatia = 0
+                for bloco in acumulador.iterar_blocos():
+                    fora = bloco["url"][
+                        bloco["url"].map(lambda u: shard_da_url(u, total_shards))
+                        != indice
+                    ]
+                    if len(fora):
+                        raise ValueError(
+                            f"Fatia {indice} contém {len(fora)} URLs de outras fatias "
+                            f"(ex.: {fora.iloc[0]}); foi coletada com outro total de fatias?"
+                        )
+                    com_label = bloco["label_score_acessibilidade"].notna()
+                    sem_label += int((~com_label).sum())
+                    chaves = bloco["url"].map(normalizar_url)
+                    novas = com_label & ~chaves.isin(vistas) & ~chaves.duplicated()
+                    duplicadas += int((com_label & ~novas).sum())
+                    vistas.update(chaves[novas])
+                    bloco[novas].to_csv(saida, header=False, index=False)
+                    escritas += int(novas.sum())
+                    linhas_fatia += len(bloco)
+                print(f"Fatia {indice}: {linhas_fatia} linhas.")
+        os.replace(temporario, destino)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    print(
+        f"Mescladas {total_shards} fatias: {escritas} linhas em {destino} "
+        f"({duplicadas} duplicadas e {sem_label} sem label descartadas)."
+    )
+    return escritas
+
+
+_arquivo_reextracao = None
+
+
+def _iniciar_reextracao(caminho_arquivo: str) -> None:
+    # Cada processo do pool abre sua própria conexão somente leitura
+    global _arquivo_reextracao
+    _arquivo_reextracao = ArquivoSnapshots(caminho_arquivo, somente_leitura=True)
+
+
+def _reextrair_url(url: str) -> dict | None:
+    # Roda nos processos do pool: lê, descomprime e reextrai um snapshot
+    try:
+        snapshot = _arquivo_reextracao.ler(url)
+        if snapshot is None or snapshot["axe"] is None:
+            return None
+        features = features_de_snapshot(
+            snapshot["html_cru"], snapshot["axe"], snapshot["encoding"]
+        )
+    except Exception as e:
+        logger.error(
+            "Re-extraction failed", extra={"dados": {"url": url, "details": str(e)}}
+        )
+        return None
+    features["layout_json"] = json.dumps(features.pop("layout"))
+    return features
+
+
+def reextrair_dataset(
+    origem: str = ARQUIVO_DATASET,
+    destino: str = None,
+    processos: int = None,
+    caminho_arquivo: str = ARQUIVO_SNAPSHOTS,
+) -> int:
+    """
+    Rebuilds the feature columns of a dataset from the snapshot archive, offline.
+
+    :param origem: Dataset CSV to rebuild.
+    :param destino: Output CSV (default: origem, replaced atomically).
+    :param processos: Worker processes (default: one per core).
+    :param caminho_arquivo: Snapshot archive written by the collection (ArquivoSnapshots).
+    :return: Number of rows written.
+    :raises ValueError: If the archive does not exist.
+
+    EN: Why? After a change to extrair_features or LAYOUT_TAGS the dataset used to need a full re-collection. How? Streams the dataset in LINHAS_REEXTRACAO-row chunks; a process pool (spawned, so the logging thread is not forked) re-parses each URL's archived raw HTML and Axe JSON; aliases reuse their audited URL's snapshot; carga_*/html_*/dedup_* columns and rows without a snapshot are kept as they were. New feature columns must also be added to ESQUEMA_DATASET.
+    PT: Por quê? Depois de uma mudança em extrair_features ou LAYOUT_TAGS o dataset precisava de uma nova coleta completa. Como? Lê o dataset em pedaços de LINHAS_REEXTRACAO linhas; um pool de processos (spawn, para não copiar a thread de logging via fork) refaz o parsing do HTML cru e do JSON do Axe arquivados de cada URL; aliases usam o snapshot da URL auditada; colunas carga_*/html_*/dedup_* e linhas sem snapshot ficam como estavam. Colunas de features novas também precisam entrar no ESQUEMA_DATASET.
+    """
+    if not os.path.exists(caminho_arquivo):
+        raise ValueError(f"Arquivo de snapshots não encontrado: {caminho_arquivo}")
+    destino = destino or origem
+    reextraidas = sem_snapshot = 0
+    with tempfile.TemporaryDirectory() as temporario, ProcessPoolExecutor(
+        max_workers=processos,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_iniciar_reextracao,
+        initargs=(caminho_arquivo,),
+    ) as pool:
+        acumulador = AcumuladorColunar(
+            ESQUEMA_DATASET, temporario, tamanho_bloco=LINHAS_REEXTRACAO
+        )
+        for parte in pd.read_csv(origem, chunksize=LINHAS_REEXTRACAO):
+            linhas = parte.to_dict("records")
+            # Aliases não têm snapshot próprio: usam o da URL auditada
+            chaves = [
+                (
+                    linha["dedup_alias_de"]
+                    if isinstance(linha.get("dedup_alias_de"), str)
+                    and linha["dedup_alias_de"]
+                    else linha["url"]
+                )
+                for linha in linhas
+            ]
+            for linha, novas in zip(
+                linhas, pool.map(_reextrair_url, chaves, chunksize=16)
+            ):
+                if novas is None:
+                    sem_snapshot += 1
+                else:
+                    linha.update(novas)
+                    reextraidas += 1
+                acumulador.adicionar(linha)
+            print(f"Reextraídas {reextraidas} linhas ({sem_snapshot} sem snapshot)...")
+        total = acumulador.salvar_csv(destino)
+    print(
+        f"Reextração concluída: {total} linhas em {destino} "
+        f"({reextraidas} reextraídas, {sem_snapshot} mantidas sem snapshot)."
+    )
+    return total
+
+
 if __name__ == "__main__":
-    gera_dataset()
+    # Uso: python orquestrador.py [--shard I --shards N | --fila [CAMINHO]] | python orquestrador.py --mesclar [--shards N]
+    #      python orquestrador.py --reextrair [--processos P]
+    #      python orquestrador.py --triagem LIMIAR | python orquestrador.py --resumo-triagem
+    parser = argparse.ArgumentParser(description="Gera o dataset de acessibilidade.")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=int(os.environ.get("PREVISIA_SHARDS", 0)) or None,
+        help="Total de fatias da lista de URLs (padrão: 1; com --mesclar, detecta).",
+    )
+    parser.add_argument(
+        "--shard",
+        type=int,
+        default=int(os.environ.get("PREVISIA_SHARD", 0)),
+        help="Índice da fatia coletada por este processo, de 0 a --shards - 1.",
+    )
+    parser.add_argument("--batch-size", type=int, default=5874)
+    parser.add_argument(
+        "--fila",
+        nargs="?",
+        const=ARQUIVO_FILA,
+        help=f"Coleta pela fila de trabalho compartilhada (padrão: {ARQUIVO_FILA}); rode quantos processos quiser.",
+    )
+    parser.add_argument(
+        "--perfilar",
+        type=int,
+        default=PERFILAR_A_CADA,
+        metavar="N",
+        help="Perfila 1 em cada N auditorias (cProfile/tracemalloc, ver utils/perfilamento.py).",
+    )
+    parser.add_argument(
+        "--mesclar",
+        action="store_true",
+        help=f"Mescla as fatias de {DIRETORIO_SHARDS} em {ARQUIVO_DATASET}.",
+    )
+    parser.add_argument(
+        "--reextrair",
+        action="store_true",
+        help=f"Recalcula as features de {ARQUIVO_DATASET} a partir de {ARQUIVO_SNAPSHOTS}, sem rede.",
+    )
+    parser.add_argument(
+        "--processos",
+        type=int,
+        default=None,
+        help="Processos da reextração (padrão: um por núcleo).",
+    )
+    parser.add_argument(
+        "--prazo",
+        type=float,
+        default=PRAZO_AUDITORIA_S,
+        metavar="S",
+        help="Prazo de cada auditoria em segundos, incluindo retries (0 = sem prazo).",
+    )
+    parser.add_argument(
+        "--triagem",
+        type=float,
+        default=LIMIAR_TRIAGEM,
+        metavar="LIMIAR",
+        help="Pula a auditoria de URLs cuja previsão rápida tem incerteza (MC-dropout) de até LIMIAR pontos; requer o modelo treinado.",
+    )
+    parser.add_argument(
+        "--resumo-triagem",
+        action="store_true",
+        help=f"Resume {ARQUIVO_REGISTRO_TRIAGEM}: fração auditada e erro de pular por limiar.",
+    )
+    args = parser.parse_args()
+    if args.fila and (args.mesclar or (args.shards or 1) > 1):
+        parser.error("--fila não se combina com --shards nem --mesclar.")
+    if args.reextrair and (args.fila or args.mesclar):
+        parser.error("--reextrair não se combina com --fila nem --mesclar.")
+    if args.triagem > 0 and (args.fila or args.mesclar or args.reextrair):
+        parser.error("--triagem só se aplica à coleta sem --fila.")
+    if args.resumo_triagem:
+        try:
+            resumo = resumir_registro()
+        except FileNotFoundError as e:
+            parser.exit(1, f"Erro: registro de triagem não encontrado: {e}\n")
+        for linha in resumo:
+            erro = linha["erro_medio_pulando"]
+            print(
+                f"Limiar {linha['limiar']:.2f}: {linha['fracao_auditada']:.0%} auditadas; "
+                f"erro médio ao pular {'-' if erro is None else f'{erro:.1f}'} "
+                f"({linha['amostras_erro']} auditorias observadas)"
+            )
+    elif args.reextrair:
+        try:
+            reextrair_dataset(processos=args.processos)
+        except ValueError as e:
+            parser.exit(1, f"Erro: {e}\n")
+    elif args.fila:
+        gera_dataset_fila(args.fila, perfilar_a_cada=args.perfilar, prazo_s=args.prazo)
+    elif args.mesclar:
+        try:
+            mesclar_shards(args.shards)
+        except ValueError as e:
+            parser.exit(1, f"Erro: {e}\n")
+    else:
+        total_shards = args.shards or 1
+        if not 0 <= args.shard < total_shards:
+            parser.error(f"--shard deve estar entre 0 e {total_shards - 1}.")
+        try:
+            gera_dataset(
+                args.batch_size,
+                shard=args.shard,
+                total_shards=total_shards,
+                perfilar_a_cada=args.perfilar,
+                limiar_triagem=args.triagem,
+                prazo_s=args.prazo,
+            )
+        except FileNotFoundError as e:
+            parser.exit(1, f"Erro: artefato do modelo não encontrado: {e}\n")
@@ -0,0 +1,257 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file scores URL lists offline from the command line. Why? Scoring a list meant submitting the web form once per URL. How? Quick static analysis with bounded concurrency, micro-batched inference with the models/ artifacts, and results appended to JSONL or CSV as they finish, resumable after an interruption.
+# PT: Este arquivo pontua listas de URLs offline pela linha de comando. Por quê? Pontuar uma lista exigia enviar o formulário web uma vez por URL. Como? Análise estática rápida com concorrência limitada, inferência em micro-lotes com os artefatos de models/ e resultados acrescentados em JSONL ou CSV conforme terminam, retomável após uma interrupção.
+import argparse
+import collections
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from collector import analisar_url_rapida
+from utils.log import configurar_logging
+from utils.modelo import DIRETORIO_MODELO, ModeloAcessibilidade
+from utils.prazo import PRAZO_RAPIDA_S, Prazo
+
+logger = logging.getLogger(__name__)
+
+# EN: Defaults for concurrency and batching. Why? Fetching is network-bound (many threads help); inference is cheapest in batches. How? Overridable by CLI flags.
+# PT: Padrões de concorrência e lotes. Por quê? O download é limitado pela rede (muitas threads ajudam); a inferência é mais barata em lotes. Como? Sobrescrevíveis por flags da CLI.
+CONCORRENCIA = 8
+TAMANHO_LOTE = 32
+JANELA_POR_WORKER = 4  # URLs em voo por thread; limita a memória e o reordenamento
+CAMPOS_SAIDA = ["linha", "url", "score", "tempo_s", "erro"]
+
+
+def ler_urls(arquivo, pular_ate: int = 0):
+    """
+    Yields (line number, URL) from a text file, one URL per line, lazily.
+
+    :param arquivo: Open text file (or sys.stdin).
+    :param pular_ate: Skip lines up to this 1-based line number (resume).
+    :return: Generator of (linha, url); blank lines and #comments are skipped but still counted.
+    """
+    for numero, texto in enumerate(arquivo, start=1):
+        url = texto.strip()
+        if numero <= pular_ate or not url or url.startswith("#"):
+            continue
+        if not url.startswith("http"):
+            url = f"https://{url}"
+        yield numero, url
+
+
+def retomar_saida(caminho: str, formato: str) -> int:
+    """
+    Prepares an existing output file for appending and finds where the last run stopped.
+
+    :param caminho: Output path.
+    :param formato: "jsonl" or "csv".
+    :return: Input line number of the last record written (0 for a new file).
+
+    EN: Why? An interrupted run must continue instead of starting over. How? Drops a partially written last line, then reads the records sequentially keeping only the last one, so memory does not grow with the file.
+    PT: Por quê? Uma execução interrompida deve continuar em vez de recomeçar. Como? Descarta uma última linha escrita pela metade e lê os registros em sequência guardando só o último, para a memória não crescer com o arquivo.
+    """
+    if not os.path.exists(caminho):
+        return 0
+    with open(caminho, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        tamanho = f.tell()
+        if tamanho:
+            f.seek(max(0, tamanho - 65536))
+            final = f.read()
+            if not final.endswith(b"\n"):
+                # Queda no meio de uma escrita: corta até a última linha completa
+                corte = final.rfind(b"\n")
+                f.truncate(tamanho - len(final) + corte + 1 if corte >= 0 else 0)
+    ultima = 0
+    with open(caminho, encoding="utf-8", newline="") as f:
+        registros = csv.DictReader(f) if formato == "csv" else map(json.loads, f)
+        for registro in registros:
+            ultima = int(registro["linha"])
+    return ultima
+
+
+class EscritorResultados:
+    """
+    Appends scored records to JSONL or CSV and flushes after each micro-batch.
+    """
+
+    def __init__(self, caminho: str, formato: str):
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        self._arquivo = open(caminho, "a", encoding="utf-8", newline="")
+        self._formato = formato
+        if formato == "csv":
+            self._csv = csv.DictWriter(self._arquivo, fieldnames=CAMPOS_SAIDA)
+            if novo:
+                self._csv.writeheader()
+
+    def escrever(self, registros: list) -> None:
+        for registro in registros:
+            if self._formato == "csv":
+                self._csv.writerow(registro)
+            else:
+                self._arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        # Registros completos em disco a cada lote: é o ponto de retomada
+        self._arquivo.flush()
+
+    def fechar(self) -> None:
+        self._arquivo.close()
+
+
+def _analisar(url: str, prazo_s: float) -> tuple[dict | None, float]:
+    # O prazo começa quando a thread pega a URL, não quando ela entra na janela
+    inicio = time.perf_counter()
+    return analisar_url_rapida(url, Prazo(prazo_s)), time.perf_counter() - inicio
+
+
+def pontuar_lote(
+    entrada,
+    caminho_saida: str,
+    formato: str,
+    modelo: ModeloAcessibilidade,
+    concorrencia: int = CONCORRENCIA,
+    tamanho_lote: int = TAMANHO_LOTE,
+    prazo_s: float = PRAZO_RAPIDA_S,
+) -> dict:
+    """
+    Scores every URL of `entrada` and appends the results to caminho_saida.
+
+    :param entrada: Open text file with one URL per line (or sys.stdin).
+    :param caminho_saida: JSONL or CSV output; if it exists, the run resumes after its last record.
+    :param formato: "jsonl" or "csv".
+    :param modelo: Loaded ModeloAcessibilidade.
+    :param concorrencia: Threads fetching and extracting at once.
+    :param tamanho_lote: Results per inference call and per write.
+    :param prazo_s: Deadline of each URL's analysis in seconds (0 = none); a page still downloading when it runs out is scored on what arrived.
+    :return: Counters {"pontuadas", "falhas", "retomada_apos"}.
+
+    EN: Why? Long lists must not hold everything in memory nor redo finished URLs. How? A window of concorrencia * JANELA_POR_WORKER futures over a lazy input reader; results leave the window in input order (so "last line written" is a valid resume point), are scored one micro-batch per forward pass and appended; failures are written too, with score null.
+    PT: Por quê? Listas longas não podem ficar inteiras na memória nem refazer URLs já concluídas. Como? Uma janela de concorrencia * JANELA_POR_WORKER futures sobre um leitor preguiçoso da entrada; os resultados saem da janela na ordem da entrada (então "última linha escrita" é um ponto de retomada válido), são pontuados um micro-lote por forward pass e acrescentados; falhas também são escritas, com score nulo.
+    """
+    retomada = retomar_saida(caminho_saida, formato)
+    if retomada:
+        print(f"Retomando após a linha {retomada} de {caminho_saida}.", file=sys.stderr)
+    escritor = EscritorResultados(caminho_saida, formato)
+    contagem = {"pontuadas": 0, "falhas": 0, "retomada_apos": retomada}
+    lote = []
+
+    def descarregar() -> None:
+        validos = [r for r in lote if r["features"] is not None]
+        for registro, score in zip(
+            validos, modelo.prever([r["features"] for r in validos])
+        ):
+            registro["score"] = score
+        escritor.escrever(
+            [{campo: r.get(campo) for campo in CAMPOS_SAIDA} for r in lote]
+        )
+        contagem["pontuadas"] += len(validos)
+        contagem["falhas"] += len(lote) - len(validos)
+        print(
+            f"{contagem['pontuadas']} pontuadas, {contagem['falhas']} falhas "
+            f"(linha {lote[-1]['linha']}).",
+            file=sys.stderr,
+        )
+        lote.clear()
+
+    def receber(linha: int, url: str, futuro) -> None:
+        features, duracao = futuro.result()
+        lote.append(
+            {
+                "linha": linha,
+                "url": url,
+                "features": features,
+                "score": None,
+                "tempo_s": round(duracao, 3),
+                "erro": None if features else "Falha ao extrair características",
+            }
+        )
+        if len(lote) >= tamanho_lote:
+            descarregar()
+
+    janela = collections.deque()
+    executor = ThreadPoolExecutor(max_workers=concorrencia)
+    try:
+        for linha, url in ler_urls(entrada, retomada):
+            janela.append((linha, url, executor.submit(_analisar, url, prazo_s)))
+            # Sai da janela em ordem: a cabeça já terminou, ou a janela está cheia
+            while janela and (
+                janela[0][2].done() or len(janela) >= concorrencia * JANELA_POR_WORKER
+            ):
+                receber(*janela.popleft())
+        while janela:
+            receber(*janela.popleft())
+    finally:
+        # Também em Ctrl+C: grava o que já foi pontuado; o resto da janela é refeito na retomada
+        executor.shutdown(wait=False, cancel_futures=True)
+        if lote:
+            descarregar()
+        escritor.fechar()
+    return contagem
+
+
+if __name__ == "__main__":
+    # Uso: python pontuar_lote.py urls.txt -o resultados.jsonl | cat urls.txt | python pontuar_lote.py -o resultados.csv
+    parser = argparse.ArgumentParser(
+        description="Pontua uma lista de URLs com a análise rápida e o modelo treinado."
+    )
+    parser.add_argument(
+        "entrada",
+        nargs="?",
+        default="-",
+        help="Arquivo com uma URL por linha (padrão: stdin).",
+    )
+    parser.add_argument(
+        "-o",
+        "--saida",
+        required=True,
+        help="Arquivo de resultados (.jsonl ou .csv); se existir, a execução é retomada.",
+    )
+    parser.add_argument(
+        "--formato",
+        choices=["jsonl", "csv"],
+        help="Formato da saída (padrão: pela extensão de --saida).",
+    )
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA)
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE)
+    parser.add_argument("--modelo", default=DIRETORIO_MODELO)
+    parser.add_argument(
+        "--prazo",
+        type=float,
+        default=PRAZO_RAPIDA_S,
+        help="Prazo de cada URL em segundos (0 = sem prazo).",
+    )
+    args = parser.parse_args()
+    if args.concorrencia < 1 or args.lote < 1:
+        parser.error("--concorrencia e --lote devem ser positivos.")
+    formato = args.formato or ("csv" if args.saida.endswith(".csv") else "jsonl")
+
+    configurar_logging("erros_pontuacao.log", nivel=logging.ERROR)
+    try:
+        modelo = ModeloAcessibilidade(args.modelo)
+    except FileNotFoundError as e:
+        parser.exit(1, f"Erro: artefato do modelo não encontrado: {e}\n")
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    try:
+        contagem = pontuar_lote(
+            entrada,
+            args.saida,
+            formato,
+            modelo,
+            args.concorrencia,
+            args.lote,
+            args.prazo,
+        )
+    except KeyboardInterrupt:
+        parser.exit(
+            130, "Interrompido; rode de novo com a mesma --saida para retomar.\n"
+        )
+    finally:
+        entrada.close()
+    print(
+        f"Concluído: {contagem['pontuadas']} pontuadas, {contagem['falhas']} falhas em {args.saida}.",
+        file=sys.stderr,
+    )
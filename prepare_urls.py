@@ -7,14 +7,12 @@ import pandas as pd
 import os
 from utils.validate_url import is_navigable_url
 import logging
+from utils.log import configurar_logging
 
 # EN: Setup logging to track URL preparation. Why? To debug and ensure accessibility for screen readers like NVDA.
 # PT: Configura o logging para rastrear a preparação de URLs. Por quê? Para depurar e garantir acessibilidade para leitores de tela como NVDA.
-logging.basicConfig(
-    filename="erros_prepare_urls.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+configurar_logging("erros_prepare_urls.log", nivel=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 def load_urls(max_urls: int = 10000) -> None:
@@ -65,15 +63,15 @@ def load_urls(max_urls: int = 10000) -> None:
         # PT: Salva em CSV. Por quê? Formato esperado pelo orquestrador. Como? Usa pandas sem índice ou cabeçalho.
         df = pd.DataFrame(valid_urls)
         df.to_csv("data/tranco_top_10000.csv", index=False, header=False)
-        logging.info(
-            f"EN: CSV generated with {len(valid_urls)} URLs: data/tranco_top_10000.csv. PT: CSV gerado com {len(valid_urls)} URLs: data/tranco_top_10000.csv"
+        logger.info(
+            "EN: CSV generated with %d URLs: data/tranco_top_10000.csv. PT: CSV gerado com %d URLs: data/tranco_top_10000.csv",
+            len(valid_urls),
+            len(valid_urls),
         )
         print(f"CSV gerado com sucesso: data/tranco_top_10000.csv")
 
     except Exception as e:
-        logging.error(
-            f"EN: Error generating CSV: {str(e)}. PT: Erro ao gerar CSV: {str(e)}."
-        )
+        logger.error("EN: Error generating CSV: %s. PT: Erro ao gerar CSV: %s.", e, e)
         print(f"Erro ao gerar CSV: {e}")
 
 
@@ -0,0 +1,103 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Shared test doubles. Why? The audit path needs Chromium, which CI boxes may not have. How? A fake sync Playwright (browser, context, page) that answers navigation, the readiness check and Axe with fixed values and logs every call.
+# PT: Dublês de teste compartilhados. Por quê? O caminho da auditoria precisa do Chromium, que máquinas de CI podem não ter. Como? Um Playwright síncrono falso (navegador, contexto, página) que responde navegação, verificação de prontidão e Axe com valores fixos e registra cada chamada.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import collector  # noqa: E402
+
+RESPOSTA_AXE = {
+    "violations": [{"id": "image-alt", "impact": "critical", "nodes": [{}, {}]}]
+}
+
+
+class PaginaFalsa:
+    def __init__(self, chamadas):
+        self.chamadas = chamadas
+
+    def set_default_timeout(self, ms):
+        self.chamadas.append(("default_timeout", ms))
+
+    def route(self, padrao, handler):
+        self.chamadas.append(("route", padrao))
+
+    def goto(self, url, wait_until=None, timeout=None):
+        self.chamadas.append(("goto", timeout))
+
+    def evaluate(self, script, arg=None):
+        if isinstance(arg, list) and isinstance(arg[0], int):
+            return "dom_estavel"  # Verificação de estabilidade do DOM
+        if isinstance(arg, list):
+            self.chamadas.append(("axe_com_prazo", arg[1]))
+            return RESPOSTA_AXE
+        if script.startswith("axe.run("):
+            self.chamadas.append(("axe", None))
+            return RESPOSTA_AXE
+        return None  # Injeção do script do Axe
+
+    def wait_for_selector(self, seletor, timeout=None):
+        self.chamadas.append(("body", timeout))
+
+    def content(self):
+        return "<html></html>"
+
+
+class _Contexto:
+    def __init__(self, chamadas, opcoes):
+        self.chamadas = chamadas
+        self.opcoes = opcoes
+
+    def route_from_har(self, har, not_found=None):
+        self.chamadas.append(("har", har, not_found))
+
+    def new_page(self):
+        return PaginaFalsa(self.chamadas)
+
+    def close(self):
+        # Como o Playwright: o HAR da gravação é escrito ao fechar o contexto
+        if self.opcoes.get("record_har_path"):
+            with open(self.opcoes["record_har_path"], "wb") as f:
+                f.write(b"PK")
+
+
+class _Navegador:
+    def __init__(self, chamadas):
+        self.chamadas = chamadas
+
+    def new_context(self, **opcoes):
+        return _Contexto(self.chamadas, opcoes)
+
+    def close(self):
+        pass
+
+
+class _PlaywrightFalso:
+    def __init__(self, chamadas):
+        self.chromium = self
+        self.chamadas = chamadas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def launch(self, **opcoes):
+        return _Navegador(self.chamadas)
+
+
+@pytest.fixture
+def playwright_falso(monkeypatch):
+    """
+    Replaces collector.sync_playwright; yields the list of recorded page calls.
+    """
+    chamadas = []
+    monkeypatch.setattr(
+        collector, "sync_playwright", lambda: _PlaywrightFalso(chamadas)
+    )
+    return chamadas
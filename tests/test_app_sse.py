@@ -0,0 +1,40 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for the progressive-result streams of app.py. Why? Each open stream holds a server thread, so their number must stay capped. How? A fake job that never finishes holds the only slot; a second stream must be sent to polling, and the slot must come back when the first one closes.
+# PT: Testes dos streams de resultado progressivo do app.py. Por quê? Cada stream aberto segura uma thread do servidor, então o número deles precisa ficar limitado. Como? Um job falso que nunca termina ocupa a única vaga; um segundo stream precisa ser mandado à consulta periódica, e a vaga precisa voltar quando o primeiro fecha.
+import json
+import threading
+
+import pytest
+
+
+class _JobParado:
+    id = "job1"
+    status = "executando"
+
+    def aguardar(self, timeout):
+        return False
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # O import configura erros_app.log no diretório atual
+    import app
+
+    monkeypatch.setattr(app, "_vagas_sse", threading.BoundedSemaphore(1))
+    return app
+
+
+def test_stream_sem_vaga_manda_consultar(app):
+    with app.app.test_request_context():
+        primeiro = app.gerar_eventos_job(_JobParado())
+        assert next(primeiro).startswith("event: status")  # Ocupa a vaga
+
+        evento = next(app.gerar_eventos_job(_JobParado()))
+        assert evento.startswith("event: ocupado")
+        dados = json.loads(evento.split("data: ", 1)[1])
+        assert dados["status_url"] == "/jobs/job1"
+        assert dados["resultado_url"] == "/jobs/job1/resultado"
+
+        primeiro.close()  # Cliente desconectou: a vaga volta
+        assert next(app.gerar_eventos_job(_JobParado())).startswith("event: status")
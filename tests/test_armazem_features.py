@@ -0,0 +1,42 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for utils.armazem_features. Why? Imported historical datasets must not pass as fresh audits. How? Imports CSVs with and without a coletado_em column and looks them up under the freshness policy.
+# PT: Testes de utils.armazem_features. Por quê? Datasets históricos importados não podem passar por auditorias recentes. Como? Importa CSVs com e sem a coluna coletado_em e os consulta sob a política de frescor.
+import time
+
+import pandas as pd
+
+from utils.armazem_features import ArmazemFeatures, importar_csv
+
+
+def _csv(tmp_path, **extras):
+    caminho = tmp_path / "dataset.csv"
+    pd.DataFrame(
+        {
+            "url": ["https://antigo.test", "https://recente.test"],
+            "label_score_acessibilidade": [80, 90],
+            "layout_json": ["{}", "{}"],
+            **extras,
+        }
+    ).to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def test_importacao_sem_data_fica_expirada(tmp_path):
+    banco = str(tmp_path / "features.sqlite")
+    assert importar_csv(_csv(tmp_path), banco) == 2
+    armazem = ArmazemFeatures(banco, somente_leitura=True)
+    assert armazem.buscar(url="https://recente.test") is None
+    antiga = armazem.buscar(url="https://recente.test", max_idade_dias=float("inf"))
+    assert antiga["label_score_acessibilidade"] == 90
+
+
+def test_importacao_usa_a_data_do_csv(tmp_path):
+    agora = time.time()
+    banco = str(tmp_path / "features.sqlite")
+    importar_csv(_csv(tmp_path, coletado_em=[agora - 90 * 86400, agora]), banco)
+    armazem = ArmazemFeatures(banco, somente_leitura=True)
+    assert armazem.buscar(url="https://antigo.test", max_idade_dias=30) is None
+    recente = armazem.buscar(url="https://recente.test", max_idade_dias=30)
+    assert recente["armazenado_em"] == agora
+    assert "coletado_em" not in recente
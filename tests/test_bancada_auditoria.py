@@ -0,0 +1,33 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for bancada_auditoria.py. Why? A benchmark that silently counts every run as a failure reports nothing. How? Record then replay through the fake Playwright and check that timings and scores come back.
+# PT: Testes do bancada_auditoria.py. Por quê? Uma medição que conta silenciosamente toda execução como falha não relata nada. Como? Grava e depois reproduz pelo Playwright falso e confere que tempos e scores voltam.
+import os
+
+import bancada_auditoria
+from utils.rede_gravada import GRAVAR, REPRODUZIR, RedeGravada
+
+URLS = [(1, "https://exemplo.test"), (2, "https://exemplo.test/outra")]
+
+
+def test_gravar_e_reproduzir_produz_tempos(playwright_falso, tmp_path):
+    gravacao = RedeGravada(GRAVAR, str(tmp_path))
+    resumo = bancada_auditoria.medir(URLS, gravacao, 1, "rapido")
+    assert all(item["falhas"] == 0 for item in resumo)
+    assert all(os.path.exists(gravacao.caminho(url)) for _, url in URLS)
+
+    reproducao = RedeGravada(REPRODUZIR, str(tmp_path))
+    resumo = bancada_auditoria.medir(URLS, reproducao, 3, "rapido")
+    for item in resumo:
+        assert item["execucoes"] == 3 and item["falhas"] == 0
+        assert item["mediana_s"] is not None and item["min_s"] <= item["max_s"]
+        assert item["axe_mediana_s"] is not None
+        assert len(item["scores"]) == 1  # Mesmo tráfego, mesmo score
+    arquivos = [c[1] for c in playwright_falso if c[0] == "har"]
+    assert len(arquivos) == 6 and all(c.endswith(".har.zip") for c in arquivos)
+
+
+def test_reproduzir_sem_gravacao_conta_falha(playwright_falso, tmp_path):
+    reproducao = RedeGravada(REPRODUZIR, str(tmp_path))
+    resumo = bancada_auditoria.medir(URLS[:1], reproducao, 2, "rapido")
+    assert resumo[0]["falhas"] == 2 and resumo[0]["mediana_s"] is None
@@ -0,0 +1,39 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for utils.fila_jobs. Why? A shared in-flight job must not hand one request a result computed under another request's deadline, triage decision or profiling flag. How? Jobs held by a blocking function while the same URL is submitted with identical and different arguments.
+# PT: Testes de utils.fila_jobs. Por quê? Um job compartilhado em andamento não pode entregar a uma requisição um resultado calculado sob o prazo, a decisão de triagem ou o perfilamento de outra. Como? Jobs presos por uma função bloqueante enquanto a mesma URL é submetida com argumentos idênticos e diferentes.
+import threading
+
+from utils.fila_jobs import CONCLUIDO, FilaJobs
+from utils.prazo import Prazo
+
+URL = "https://exemplo.test"
+
+
+def test_job_compartilhado_so_com_argumentos_identicos():
+    liberado = threading.Event()
+    executados = []
+
+    def analisar(url, perfilar, site, decisao, prazo):
+        liberado.wait(5)
+        executados.append((perfilar, decisao, prazo))
+        return url
+
+    fila = FilaJobs(analisar, workers=1, max_pendentes=10)
+    prazo = Prazo(60)
+    primeiro = fila.submeter(URL, URL, False, False, None, prazo)
+    try:
+        # Mesmos argumentos (ex.: o mesmo envio repetido): o job é compartilhado
+        assert fila.submeter(URL, URL, False, False, None, prazo) is primeiro
+        # Outro prazo, outro perfilamento ou uma decisão de triagem própria: job próprio
+        outro_prazo = fila.submeter(URL, URL, False, False, None, Prazo(60))
+        perfilado = fila.submeter(URL, URL, True, False, None, prazo)
+        decisao = {"url": URL, "score": 80, "incerteza": 3.0}
+        triado = fila.submeter(URL, URL, False, False, decisao, prazo)
+        mesma_decisao = fila.submeter(URL, URL, False, False, dict(decisao), prazo)
+        jobs = [primeiro, outro_prazo, perfilado, triado, mesma_decisao]
+        assert len({job.id for job in jobs}) == 5
+    finally:
+        liberado.set()
+    assert all(job.aguardar(5) and job.status == CONCLUIDO for job in jobs)
+    assert len(executados) == 5
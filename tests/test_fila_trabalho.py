@@ -0,0 +1,52 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for the lease-based work queue. Why? A worker that lost its lease must not overwrite the new owner's result, and Ctrl+C must release claims without waiting for the whole batch. How? Two owners on one SQLite queue; an interrupted auditar_urls with slow fake audits.
+# PT: Testes da fila de trabalho com leases. Por quê? Um worker que perdeu o lease não pode sobrescrever o resultado do novo dono, e o Ctrl+C precisa liberar as reivindicações sem esperar o lote inteiro. Como? Dois donos numa mesma fila SQLite; um auditar_urls interrompido com auditorias falsas lentas.
+import threading
+import time
+
+import pytest
+
+from utils.fila_trabalho import CONCLUIDO, FilaTrabalho
+
+
+def test_concluir_exige_o_lease(tmp_path):
+    fila = FilaTrabalho(str(tmp_path / "fila.sqlite"))
+    fila.semear(["https://a.test"])
+    assert fila.reivindicar("antigo", 1, lease_s=-1) == ["https://a.test"]
+    # Lease expirado e reemitido: o dono antigo não conclui mais
+    assert fila.reivindicar("novo", 1) == ["https://a.test"]
+    assert not fila.concluir("antigo", "https://a.test", {"url": "https://a.test"})
+    assert fila.concluir("novo", "https://a.test", {"url": "https://a.test"})
+    assert fila.resumo()[CONCLUIDO] == 1
+
+
+def test_interrupcao_nao_espera_o_lote(monkeypatch, tmp_path):
+    monkeypatch.chdir(
+        tmp_path
+    )  # O import configura erros_orquestrador.log no diretório atual
+    import orquestrador
+
+    liberado = threading.Event()
+    auditadas = []
+
+    def auditoria_falsa(url, perfil, arquivo, prazo_s):
+        auditadas.append(url)
+        if url != "https://0.test":
+            liberado.wait(10)  # Auditorias lentas ainda na fila
+        return {"label_score_acessibilidade": 90}
+
+    def registrar(resultado):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(orquestrador, "MAX_WORKERS", 1)
+    monkeypatch.setattr(orquestrador, "auditar_no_prazo", auditoria_falsa)
+    urls = [f"https://{i}.test" for i in range(5)]
+    inicio = time.monotonic()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            orquestrador.auditar_urls(urls, {}, {}, "rapido", registrar)
+        assert time.monotonic() - inicio < 5
+        assert len(auditadas) <= 2  # As demais foram canceladas
+    finally:
+        liberado.set()
@@ -0,0 +1,81 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for utils.log. Why? Records are written by a background thread, so they must capture the payload at logging time and shut down cleanly with a full queue.
+# PT: Testes de utils.log. Por quê? Os registros são escritos por uma thread de fundo, então precisam capturar o payload no momento do log e encerrar sem erro com a fila cheia.
+import json
+import logging
+import queue
+import time
+
+from utils import log
+
+
+def test_registro_guarda_o_payload_do_momento_do_log(tmp_path):
+    arquivo = tmp_path / "app.log"
+    log.encerrar_logging()  # Módulos importados por outros testes já o configuraram
+    log.configurar_logging(str(arquivo), nivel=logging.INFO)
+    try:
+        features = {"imagens_sem_alt": 1}
+        logging.getLogger("teste").info(
+            "Features de %s",
+            "https://exemplo.test",
+            extra={
+                "dados": {
+                    "features": features,
+                    "resumo": log.PayloadLimitado(features),
+                }
+            },
+        )
+        # Quem chamou continua alterando o dict depois de registrá-lo
+        features["imagens_sem_alt"] = 99
+        features["label_score_acessibilidade"] = 50
+    finally:
+        log.encerrar_logging()
+    registro = json.loads(arquivo.read_text(encoding="utf-8").splitlines()[-1])
+    assert registro["message"] == "Features de https://exemplo.test"
+    assert registro["features"] == {"imagens_sem_alt": 1}
+    assert registro["resumo"] == '{"imagens_sem_alt": 1}'
+
+
+class _HandlerLento(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.recebidos = []
+
+    def emit(self, record):
+        time.sleep(0.05)
+        self.recebidos.append(record.getMessage())
+
+
+def test_encerrar_com_fila_cheia_nao_falha():
+    fila = queue.Queue(maxsize=3)
+    destino = _HandlerLento()
+    ouvinte = log._OuvinteFila(fila, destino)
+    ouvinte.start()
+    handler = log._HandlerFilaNaoBloqueante(fila)
+    for i in range(10):
+        handler.handle(logging.makeLogRecord({"msg": f"r{i}"}))
+    assert fila.full()
+    ouvinte.stop()  # O stop() padrão levantaria queue.Full aqui
+    assert len(destino.recebidos) + handler.descartados == 10
+
+
+def test_payload_limitado_nao_serializa_na_thread_chamadora(monkeypatch):
+    serializados = []
+    monkeypatch.setattr(
+        log.PayloadLimitado, "__str__", lambda self: serializados.append(1) or ""
+    )
+    handler = log._HandlerFilaNaoBloqueante(queue.Queue())
+    axe = {
+        "violations": [
+            {"id": f"regra{i}", "nodes": list(range(50))} for i in range(500)
+        ]
+    }
+    registro = logging.makeLogRecord(
+        {"msg": "Axe", "dados": {"results": log.PayloadLimitado(axe)}}
+    )
+    handler.handle(registro)
+    copia = handler.queue.get_nowait().dados["results"]
+    assert serializados == []
+    assert isinstance(copia, log.PayloadLimitado) and copia.obj is not axe
+    assert str(copia.obj).count("regra") < log.MAX_PAYLOAD_ITENS
@@ -0,0 +1,66 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for the resource-blocking policy in dataset rows. Why? Blocked images, media and fonts change Axe results, so collection must not block by default and every row must say what was blocked. How? Audits through the fake Playwright with and without blocking.
+# PT: Testes da política de bloqueio de recursos nas linhas do dataset. Por quê? Imagens, mídia e fontes bloqueadas mudam os resultados do Axe, então a coleta não pode bloquear por padrão e toda linha precisa dizer o que foi bloqueado. Como? Auditorias pelo Playwright falso com e sem bloqueio.
+import collector
+from tests.test_prazo import _rastrear
+from utils.navegacao import PoliticaNavegacao
+
+
+def test_descricao_bloqueio():
+    assert (
+        PoliticaNavegacao(tipos_bloqueados=[], hosts_bloqueados=[]).descricao_bloqueio()
+        == "nenhum"
+    )
+    assert (
+        PoliticaNavegacao(
+            tipos_bloqueados=["media", "font"], hosts_bloqueados=[]
+        ).descricao_bloqueio()
+        == "font,media"
+    )
+    assert PoliticaNavegacao(tipos_bloqueados=[]).descricao_bloqueio() == "rastreadores"
+
+
+def test_auditoria_sem_bloqueio_nao_roteia(playwright_falso):
+    _, _, colunas = collector.gerar_label_e_features_dinamicas(
+        "https://exemplo.test", "rapido", bloquear=False
+    )
+    assert colunas["carga_bloqueio"] == "nenhum"
+    assert not any(c[0] == "route" for c in playwright_falso)
+
+
+def test_auditoria_com_bloqueio_registra_a_politica(playwright_falso):
+    _, _, colunas = collector.gerar_label_e_features_dinamicas(
+        "https://exemplo.test", "rapido"
+    )
+    assert colunas["carga_bloqueio"] == PoliticaNavegacao().descricao_bloqueio()
+    assert colunas["carga_bloqueio"] != "nenhum"
+    assert ("route", "**/*") in playwright_falso
+
+
+def test_coleta_nao_bloqueia_por_padrao(monkeypatch, tmp_path):
+    monkeypatch.chdir(
+        tmp_path
+    )  # O import configura erros_orquestrador.log no diretório atual
+    import orquestrador
+
+    recebidos = {}
+    monkeypatch.setattr(
+        orquestrador,
+        "analisar_url_completa",
+        lambda *args, **kwargs: recebidos.update(kwargs),
+    )
+    orquestrador.auditar_no_prazo("https://exemplo.test", "rapido", None, 10)
+    assert recebidos["bloquear"] is False
+    assert "carga_bloqueio" in orquestrador.ESQUEMA_DATASET
+
+
+def test_rastreamento_de_site_segue_a_politica_da_coleta(monkeypatch):
+    registro, chamadas = _rastrear(monkeypatch, None)
+    assert collector.BLOQUEAR_NA_COLETA is False
+    assert registro["carga_bloqueio"] == "nenhum"
+    assert not any(c[0] == "route" for c in chamadas)
+
+    registro, chamadas = _rastrear(monkeypatch, None, bloquear=True)
+    assert registro["carga_bloqueio"] == PoliticaNavegacao().descricao_bloqueio()
+    assert ("route", "**/*") in chamadas
@@ -0,0 +1,83 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Parity tests for the static download path. Why? The streamed download must extract the same features as BeautifulSoup(bytes, "html.parser"), also on pages that are not UTF-8. How? A fake streaming response serves cp1252 fixtures with and without a charset in the header.
+# PT: Testes de paridade do caminho estático. Por quê? O download em streaming precisa extrair as mesmas features que BeautifulSoup(bytes, "html.parser"), também em páginas que não são UTF-8. Como? Uma resposta falsa em streaming serve fixtures cp1252 com e sem charset no cabeçalho.
+import pytest
+from bs4 import BeautifulSoup
+
+import collector
+
+# Sem meta charset: o encoding só aparece no cabeçalho HTTP, ou em lugar nenhum
+PAGINA_CP1252 = (
+    "<html><head><title>Página de ação</title></head><body>"
+    "<header><nav><a href='/'>Início</a> <a href='/x'>clique aqui</a></nav></header>"
+    "<main><h1>Informações</h1><h3>Seção “três”</h3>"
+    "<img src='a.png'><img src='b.png' alt='Ícone'>"
+    "<p style='color:#777'>Atenção: preços em €</p></main>"
+    "</body></html>"
+).encode("cp1252")
+
+
+class _RespostaFalsa:
+    def __init__(self, corpo, content_type):
+        self.corpo = corpo
+        self.headers = {"Content-Type": content_type}
+        self.url = "https://exemplo.test"
+
+    @property
+    def encoding(self):
+        # Como o requests: o charset do cabeçalho, ou ISO-8859-1 para text/*
+        if "charset=" in self.headers["Content-Type"]:
+            return self.headers["Content-Type"].split("charset=")[1]
+        return "ISO-8859-1"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.corpo), 7):  # Blocos pequenos
+            yield self.corpo[i : i + 7]
+
+
+@pytest.mark.parametrize(
+    "content_type", ["text/html; charset=windows-1252", "text/html"]
+)
+def test_features_iguais_ao_beautifulsoup(monkeypatch, content_type):
+    monkeypatch.setattr(
+        collector.requests,
+        "get",
+        lambda *a, **k: _RespostaFalsa(PAGINA_CP1252, content_type),
+    )
+    soup, colunas = collector.baixar_e_parsear("https://exemplo.test")
+    # O charset do cabeçalho vale como o from_encoding do BeautifulSoup
+    cabecalho = (
+        content_type.split("charset=")[1] if "charset=" in content_type else None
+    )
+    referencia = BeautifulSoup(PAGINA_CP1252, "html.parser", from_encoding=cabecalho)
+    assert collector.extrair_features(soup) == collector.extrair_features(referencia)
+    assert soup.get_text() == referencia.get_text()
+    assert "�" not in soup.get_text()
+    if "charset" in content_type:
+        assert "Atenção: preços em €" in soup.get_text()
+    assert colunas["html_bytes"] == len(PAGINA_CP1252)
+
+
+def test_snapshot_reextraido_igual_ao_download(monkeypatch):
+    monkeypatch.setattr(
+        collector.requests,
+        "get",
+        lambda *a, **k: _RespostaFalsa(PAGINA_CP1252, "text/html"),
+    )
+    snapshot = {}
+    soup, _ = collector.baixar_e_parsear("https://exemplo.test", snapshot=snapshot)
+    reextraidas = collector.features_de_snapshot(
+        snapshot["html_cru"], {"violations": []}, snapshot["encoding"]
+    )
+    for chave, valor in collector.extrair_features(soup).items():
+        assert reextraidas[chave] == valor
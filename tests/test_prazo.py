@@ -0,0 +1,163 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for utils.prazo and the deadline handling of the audit. Why? A missing deadline must behave like the old fixed timeouts, never fail the audit.
+# PT: Testes de utils.prazo e do tratamento de prazo da auditoria. Por quê? A ausência de prazo deve se comportar como os antigos timeouts fixos, nunca falhar a auditoria.
+import asyncio
+import math
+
+import pytest
+
+import collector
+from tests.conftest import RESPOSTA_AXE
+from utils.prazo import Prazo, PrazoEsgotado
+
+
+@pytest.mark.parametrize("segundos", [None, 0, -1])
+def test_sem_prazo_devolve_o_timeout_padrao(segundos):
+    prazo = Prazo(segundos)
+    assert prazo.segundos is None
+    assert prazo.limitar(30, "download") == 30
+    assert prazo.limitar_ms(60000, "body") == 60000
+    assert prazo.limitar_ms(math.inf, "axe") == math.inf
+
+
+def test_prazo_limita_o_timeout():
+    prazo = Prazo(10)
+    assert 9000 < prazo.limitar_ms(60000, "body") <= 10000
+    assert isinstance(prazo.limitar_ms(math.inf, "axe"), int)
+
+
+def test_prazo_esgotado():
+    with pytest.raises(PrazoEsgotado) as erro:
+        Prazo(0.1).verificar("download")
+    assert erro.value.etapa == "download"
+
+
+@pytest.mark.parametrize("prazo", [None, Prazo(), Prazo(0)])
+def test_auditoria_sem_prazo_retorna_score(playwright_falso, prazo):
+    score, falhas_contraste, colunas = collector.gerar_label_e_features_dinamicas(
+        "https://exemplo.test", "rapido", prazo=prazo
+    )
+    assert 0 <= score <= 100 and falhas_contraste == 0
+    assert colunas["axe_nos_image_alt"] == 2
+    assert ("axe", None) in playwright_falso  # axe.run comum, sem a corrida com o timer
+    assert ("default_timeout", collector.TIMEOUT_PAGINA_MS) in playwright_falso
+
+
+def test_auditoria_com_prazo_limita_axe(playwright_falso):
+    score, _, _ = collector.gerar_label_e_features_dinamicas(
+        "https://exemplo.test", "rapido", prazo=Prazo(20)
+    )
+    assert score != -1
+    limites = [ms for nome, ms in playwright_falso if nome == "axe_com_prazo"]
+    assert len(limites) == 1 and 0 < limites[0] <= 20000
+
+
+class _RespostaFalsa:
+    headers = {"content-type": "text/html; charset=utf-8"}
+
+    async def body(self):
+        return b'<html lang="pt"><body><a href="/x">x</a></body></html>'
+
+
+class _PaginaAsyncFalsa:
+    def __init__(self, chamadas, duracao_goto_s):
+        self.chamadas = chamadas
+        self.duracao_goto_s = duracao_goto_s
+        self.url = None
+
+    def set_default_timeout(self, ms):
+        self.chamadas.append(("default_timeout", ms))
+
+    async def route(self, padrao, handler):
+        self.chamadas.append(("route", padrao))
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.chamadas.append(("goto", timeout))
+        await asyncio.sleep(self.duracao_goto_s)
+        self.url = url
+        return _RespostaFalsa()
+
+    async def evaluate(self, script, arg=None):
+        if isinstance(arg, list):
+            return "dom_estavel"
+        if script == collector._JS_LINKS:
+            return [f"https://exemplo.test/p{i}" for i in range(10)]
+        if script.startswith("axe.run("):
+            return RESPOSTA_AXE
+        return None
+
+    async def wait_for_selector(self, seletor, timeout=None):
+        self.chamadas.append(("body", timeout))
+
+    async def close(self):
+        pass
+
+
+class _PlaywrightAsyncFalso:
+    def __init__(self, chamadas, duracao_goto_s):
+        self.chamadas = chamadas
+        self.duracao_goto_s = duracao_goto_s
+        self.chromium = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def launch(self, **opcoes):
+        return self
+
+    async def new_context(self, **opcoes):
+        return self
+
+    async def new_page(self):
+        return _PaginaAsyncFalsa(self.chamadas, self.duracao_goto_s)
+
+    def set_default_timeout(self, ms):
+        self.chamadas.append(("contexto_timeout", ms))
+
+    async def close(self):
+        pass
+
+
+def _rastrear(monkeypatch, prazo, duracao_goto_s=0.0, **opcoes):
+    chamadas = []
+    monkeypatch.setattr(
+        collector,
+        "async_playwright",
+        lambda: _PlaywrightAsyncFalso(chamadas, duracao_goto_s),
+    )
+    registro = collector.analisar_site(
+        "https://exemplo.test",
+        "rapido",
+        max_paginas=5,
+        concorrencia=1,
+        prazo=prazo,
+        **opcoes,
+    )
+    return registro, chamadas
+
+
+def test_rastreamento_sem_prazo_usa_o_orcamento_do_site(monkeypatch):
+    registro, chamadas = _rastrear(monkeypatch, None)
+    assert registro["site_paginas"] == 5
+    # Sem prazo da requisição, o limite é o orçamento do rastreamento (SITE_ORCAMENTO_S)
+    contexto = [ms for nome, ms in chamadas if nome == "contexto_timeout"]
+    assert collector.SITE_ORCAMENTO_S * 1000 - 1000 < contexto[0] <= 180000
+    assert ("body", collector.TIMEOUT_BODY_MS) in chamadas
+
+
+def test_rastreamento_limita_timeouts_e_para_entre_paginas(monkeypatch):
+    registro, chamadas = _rastrear(monkeypatch, Prazo(1.5), duracao_goto_s=0.4)
+    assert 1 <= registro["site_paginas"] < 5
+    assert registro["site_motivo_parada"] == "orcamento"
+    timeouts = [ms for nome, ms in chamadas if nome != "goto" or ms is not None]
+    assert timeouts and all(ms <= 1500 for ms in timeouts)
+
+
+def test_rastreamento_sem_tempo_para_a_pagina_inicial(monkeypatch):
+    registro, chamadas = _rastrear(monkeypatch, Prazo(0.2))
+    assert registro is None
+    assert not [nome for nome, _ in chamadas if nome == "goto"]
@@ -0,0 +1,34 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for utils.registro_modelos. Why? A hot reload must not stall the predictions served meanwhile. How? A fake model whose validation counts a prediction from another thread; it must not wait for the reload.
+# PT: Testes de utils.registro_modelos. Por quê? Uma recarga a quente não pode travar as previsões servidas enquanto isso. Como? Um modelo falso cuja validação conta uma previsão em outra thread; ela não pode esperar a recarga.
+import threading
+
+from utils import registro_modelos
+
+
+def test_previsoes_nao_esperam_a_recarga(monkeypatch, tmp_path):
+    versao = tmp_path / "20250101-000000"
+    versao.mkdir()
+    for artefato in registro_modelos.ARTEFATOS:
+        (versao / artefato).write_bytes(b"")
+    registro = registro_modelos.RegistroModelos(str(tmp_path), intervalo_s=0)
+    contou_durante_validacao = []
+
+    class ModeloFalso:
+        def __init__(self, caminho, versao):
+            self.versao = versao
+
+        def validar(self):
+            contagem = threading.Thread(
+                target=registro.contar_previsao, args=("anterior",)
+            )
+            contagem.start()
+            contagem.join(timeout=2)
+            contou_durante_validacao.append(not contagem.is_alive())
+
+    monkeypatch.setattr(registro_modelos, "ModeloAcessibilidade", ModeloFalso)
+    assert registro.verificar()
+    assert contou_durante_validacao == [True]
+    assert registro.versao == "20250101-000000"
+    assert registro.metricas()["previsoes_por_versao"] == {"anterior": 1}
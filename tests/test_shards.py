@@ -0,0 +1,91 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for the sharded collection. Why? Overlapping or incomplete slices silently duplicate or lose URLs, and only a full collect-then-merge run shows it. How? Collects every shard with a fake audit, then merges, as `--shard I --shards N` followed by `--mesclar` would.
+# PT: Testes da coleta em fatias. Por quê? Fatias sobrepostas ou incompletas duplicam ou perdem URLs em silêncio, e só uma coleta seguida da mescla mostra isso. Como? Coleta cada fatia com uma auditoria falsa e depois mescla, como `--shard I --shards N` seguido de `--mesclar` faria.
+import os
+
+import pandas as pd
+import pytest
+
+from utils.acumulador_linhas import AcumuladorColunar
+from utils.validate_url import normalizar_url
+
+TOTAL_SHARDS = 3
+# Variantes da mesma URL normalizada: coletadas as duas, mescladas numa linha só
+URLS = [f"https://site{i}.test" for i in range(30)] + [
+    "https://SITE7.test/",
+    "https://site12.test/",
+]
+
+
+@pytest.fixture
+def orquestrador(monkeypatch, tmp_path):
+    monkeypatch.chdir(
+        tmp_path
+    )  # O import configura erros_orquestrador.log no diretório atual
+    import orquestrador
+
+    (tmp_path / "urls.csv").write_text("\n".join(URLS) + "\n", encoding="utf-8")
+    monkeypatch.setattr(orquestrador, "ARQUIVO_URLS", str(tmp_path / "urls.csv"))
+    monkeypatch.setattr(orquestrador, "DIRETORIO_SHARDS", str(tmp_path / "shards"))
+    monkeypatch.setattr(orquestrador, "LINHAS_POR_BLOCO", 4)
+    monkeypatch.setattr(orquestrador.time, "sleep", lambda s: None)
+    auditadas = []
+
+    def auditoria_falsa(url, perfil, arquivo, prazo, bloquear=False):
+        auditadas.append(url)
+        return {"label_score_acessibilidade": len(url), "imagens_sem_alt": 0}
+
+    monkeypatch.setattr(orquestrador, "analisar_url_completa", auditoria_falsa)
+    monkeypatch.setattr(orquestrador, "auditadas", auditadas, raising=False)
+    return orquestrador
+
+
+def _urls_da_fatia(orquestrador, shard):
+    diretorio, _ = orquestrador.caminhos_shard(shard, TOTAL_SHARDS)
+    acumulador = AcumuladorColunar(orquestrador.ESQUEMA_DATASET, diretorio)
+    return [u for bloco in acumulador.iterar_blocos(["url"]) for u in bloco["url"]]
+
+
+def test_fatias_disjuntas_cobrem_tudo_e_mescla_sem_duplicatas(orquestrador, tmp_path):
+    for shard in range(TOTAL_SHARDS):
+        orquestrador.gera_dataset(
+            shard=shard,
+            total_shards=TOTAL_SHARDS,
+            deduplicar=False,
+            armazenar=False,
+            arquivar=False,
+            limiar_triagem=0,
+            prazo_s=0,
+        )
+
+    fatias = [set(_urls_da_fatia(orquestrador, s)) for s in range(TOTAL_SHARDS)]
+    assert all(fatias)
+    for i in range(TOTAL_SHARDS):
+        for j in range(i + 1, TOTAL_SHARDS):
+            assert not fatias[i] & fatias[j]
+    assert set().union(*fatias) == set(URLS)
+    assert sorted(orquestrador.auditadas) == sorted(URLS)  # Cada URL auditada uma vez
+
+    destino = str(tmp_path / "dataset.csv")
+    escritas = orquestrador.mesclar_shards(TOTAL_SHARDS, destino)
+    mesclado = pd.read_csv(destino)
+    chaves = mesclado["url"].map(normalizar_url)
+    assert escritas == len(mesclado) == len(URLS) - 2
+    assert not chaves.duplicated().any()
+    assert set(chaves) == {normalizar_url(u) for u in URLS}
+    assert not os.path.exists(destino + ".tmp")
+
+
+def test_mesclar_recusa_fatia_ausente(orquestrador, tmp_path):
+    orquestrador.gera_dataset(
+        shard=0,
+        total_shards=TOTAL_SHARDS,
+        deduplicar=False,
+        armazenar=False,
+        arquivar=False,
+        limiar_triagem=0,
+        prazo_s=0,
+    )
+    with pytest.raises(ValueError, match="Fatias ausentes"):
+        orquestrador.mesclar_shards(TOTAL_SHARDS, str(tmp_path / "dataset.csv"))
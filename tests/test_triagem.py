@@ -0,0 +1,47 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: Tests for utils.triagem. Why? After a hot model swap, the triage decision and the displayed prediction of one request must come from the same version.
+# PT: Testes de utils.triagem. Por quê? Após uma troca a quente do modelo, a decisão de triagem e a previsão exibida de uma requisição precisam vir da mesma versão.
+import json
+
+from utils.triagem import CONFIANTE, INCERTA, Triagem
+
+
+class ModeloFalso:
+    def __init__(self, versao, score, incerteza):
+        self.versao = versao
+        self.score = score
+        self.incerteza = incerteza
+
+    def prever_com_incerteza(self, lista_features, amostras):
+        return [(self.score, self.incerteza)] * len(lista_features)
+
+
+def test_decisao_usa_o_modelo_fixado(tmp_path):
+    registro = tmp_path / "triagem.jsonl"
+    # O padrão (versão ativa na criação) seria incerto; o fixado na requisição é confiante
+    triagem = Triagem(
+        ModeloFalso("antigo", 40, 9.0),
+        limiar=3,
+        fracao_controle=0,
+        caminho_registro=str(registro),
+    )
+    fixado = ModeloFalso("novo", 80, 1.0)
+
+    decisao = triagem.avaliar("https://exemplo.test", {}, fixado)
+    assert (decisao["score"], decisao["motivo"]) == (80, CONFIANTE)
+    assert decisao["versao_modelo"] == "novo"
+
+    triagem.registrar(decisao)
+    linha = json.loads(registro.read_text(encoding="utf-8"))
+    assert linha["versao_modelo"] == "novo" and linha["score_rapido"] == 80
+
+
+def test_sem_modelo_fixado_usa_o_padrao(tmp_path):
+    triagem = Triagem(
+        ModeloFalso("antigo", 40, 9.0),
+        limiar=3,
+        caminho_registro=str(tmp_path / "t.jsonl"),
+    )
+    decisao = triagem.avaliar("https://exemplo.test", {})
+    assert decisao["motivo"] == INCERTA and decisao["versao_modelo"] == "antigo"
@@ -14,14 +14,13 @@ import joblib
 import os
 import logging
 import numpy as np
+from utils.log import configurar_logging
+from utils.registro_modelos import publicar_versao
 
 # EN: Setup logging to track training. Why? To monitor performance and errors.
 # PT: Configura o logging para rastrear o treinamento. Por quê? Para monitorar desempenho e erros.
-logging.basicConfig(
-    filename="erros_trainer.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+configurar_logging("erros_trainer.log", nivel=logging.INFO)
+logger = logging.getLogger(__name__)
 # EN: Constants for file paths and model. Why? Centralizes configuration.
 # PT: Constantes para arquivos e modelo. Por quê? Centraliza a configuração.
 ARQUIVO_DATASET = "data/dataset_acessibilidade.csv"
@@ -29,6 +28,10 @@ DIRETORIO_MODELO = "models"
 ARQUIVO_MODELO = os.path.join(DIRETORIO_MODELO, "modelo_acessibilidade.pt")
 ARQUIVO_SCALER = os.path.join(DIRETORIO_MODELO, "scaler.pkl")
 ARQUIVO_FEATURES = os.path.join(DIRETORIO_MODELO, "feature_names.pkl")
+# Colunas do dataset que não são features
+PREFIXOS_METADADOS = ("axe_", "carga_", "html_", "dedup_", "site_")
+# Publica o resultado como models/<AAAAMMDD-HHMMSS>/, para o app trocar de versão sem reinício
+PUBLICAR_VERSAO = os.environ.get("PREVISIA_PUBLICAR_MODELO", "0") == "1"
 
 
 class AccessibilityNet(nn.Module):
@@ -73,7 +76,7 @@ def treina_modelo():
     print("Carregando dataset...")
     try:
         df = pd.read_csv(ARQUIVO_DATASET)
-        logging.info(f"Loaded {len(df)} samples.")
+        logger.info("Loaded %d samples.", len(df))
         print(f"{len(df)} amostras carregadas.")
 
         if "layout_json" in df.columns:
@@ -89,7 +92,11 @@ def treina_modelo():
         # Usa todas as amostras (sem amostra for more data)
         print(f"Usando todas as {len(df)} amostras.")
 
-        cols_to_drop = ["url"]
+        # Colunas axe_* vêm da própria auditoria que gera o label (vazamento); carga_*, html_*, dedup_* e site_* são metadados de coleta;
+        # nenhuma delas entra no modelo
+        cols_to_drop = ["url"] + [
+            c for c in df.columns if c.startswith(PREFIXOS_METADADOS)
+        ]
         X = df.drop(cols_to_drop, axis=1)
         y = df["label_score_acessibilidade"]
 
@@ -114,7 +121,7 @@ def treina_modelo():
         corr = X[numeric_cols].corrwith(y).abs().sort_values(ascending=False)
         print("\nCorrelações com label (abs):")
         print(corr.head(10))
-        logging.info(f"Top correlações: {corr.head(10).to_dict()}.")
+        logger.info("Top correlações: %s.", corr.head(10).to_dict())
 
         # Salva scaler e features
         os.makedirs(DIRETORIO_MODELO, exist_ok=True)
@@ -190,7 +197,7 @@ def treina_modelo():
                 print(f"Early stopping at epoch {epoch+1}")
                 break
         print("Modelo treinado e salvo.")
-        logging.info("Modelo treinado e salvo.")
+        logger.info("Modelo treinado e salvo.")
 
         # Avaliação
         model.load_state_dict(torch.load(ARQUIVO_MODELO))
@@ -201,15 +208,19 @@ def treina_modelo():
         r2 = r2_score(y_test, y_pred)
         print(f"MSE (0-1): {mse:.4f} (x100 = {mse*100:.2f})")
         print(f"R2: {r2:.4f}")
-        logging.info(f"MSE: {mse:.4f}, R2: {r2:.4f}.")
+        logger.info("MSE: %.4f, R2: %.4f.", mse, r2)
 
         # Salva scaler
         joblib.dump(scaler, ARQUIVO_SCALER)
         print("Modelo e scaler salvados.")
-        logging.info(f"Modelo salvo em {ARQUIVO_MODELO}.")
+        logger.info("Modelo salvo em %s.", ARQUIVO_MODELO)
+        if PUBLICAR_VERSAO:
+            destino = publicar_versao(DIRETORIO_MODELO, DIRETORIO_MODELO)
+            print(f"Versão publicada em {destino}.")
+            logger.info("Versão publicada em %s.", destino)
 
     except Exception as e:
-        logging.error(f"Erro de treinamento: {str(e)}.")
+        logger.error("Erro de treinamento: %s.", e)
         print(f"Erro no treinamento: {e}")
 
 
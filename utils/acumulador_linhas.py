@@ -0,0 +1,227 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements a compact columnar accumulator for collected rows. Why? The orchestrator kept every row as a Python dict and rebuilt a whole DataFrame at each checkpoint, so memory and checkpoint time grew with the collection. How? Typed arrays per column with a fixed schema, spilled to disk in CSV blocks; the final CSV is the concatenation of the blocks.
+# PT: Este arquivo implementa um acumulador colunar compacto para as linhas coletadas. Por quê? O orquestrador mantinha cada linha como dict Python e reconstruía um DataFrame inteiro a cada checkpoint, então memória e tempo de checkpoint cresciam com a coleta. Como? Arrays tipados por coluna com schema fixo, despejados em disco em blocos CSV; o CSV final é a concatenação dos blocos.
+import array
+import glob
+import logging
+import math
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# EN: Supported column types and their in-memory/pandas representations.
+# PT: Tipos de coluna suportados e suas representações em memória/pandas.
+TIPOS_COLUNA = ("int", "float", "str")
+_DTYPES_PANDAS = {"int": "Int64", "float": "float64", "str": "object"}
+
+
+def _ausente(valor) -> bool:
+    return (
+        valor is None
+        or valor is pd.NA
+        or (isinstance(valor, float) and math.isnan(valor))
+    )
+
+
+class AcumuladorColunar:
+    """
+    Typed, array-backed row accumulator with a fixed schema that spills blocks to disk.
+
+    :param esquema: Ordered {column: "int" | "float" | "str"}; also the CSV column order.
+    :param diretorio: Directory of spilled blocks (bloco_00001.csv, ...); blocks already there are resumed.
+    :param tamanho_bloco: Rows kept in memory before a block is spilled (the checkpoint cadence).
+
+    EN: Why? A dict per row costs hundreds of bytes of keys and boxed values, and rebuilding a DataFrame per checkpoint is quadratic over a collection. How? One array.array per numeric column (int64 plus a null mask, float64 with NaN) and a list per text column; a full block is written atomically to disk and the arrays restart empty, so memory is bounded by tamanho_bloco and adding a row is amortized O(1).
+    PT: Por quê? Um dict por linha custa centenas de bytes de chaves e valores encaixotados, e reconstruir um DataFrame por checkpoint é quadrático ao longo da coleta. Como? Um array.array por coluna numérica (int64 com máscara de nulos, float64 com NaN) e uma lista por coluna de texto; um bloco cheio é gravado atomicamente em disco e os arrays recomeçam vazios, então a memória fica limitada por tamanho_bloco e adicionar uma linha é O(1) amortizado.
+    """
+
+    def __init__(self, esquema: dict, diretorio: str, tamanho_bloco: int = 1000):
+        invalidos = {c: t for c, t in esquema.items() if t not in TIPOS_COLUNA}
+        if invalidos:
+            raise ValueError(f"Tipos de coluna inválidos: {invalidos}")
+        self.esquema = dict(esquema)
+        self.diretorio = diretorio
+        self.tamanho_bloco = tamanho_bloco
+        self._ignoradas = set()
+        os.makedirs(diretorio, exist_ok=True)
+        self._blocos = sorted(glob.glob(os.path.join(diretorio, "bloco_*.csv")))
+        self._linhas_em_disco = sum(
+            len(self._ler_bloco(b, ["url"] if "url" in self.esquema else None))
+            for b in self._blocos
+        )
+        self._reiniciar_colunas()
+
+    def _reiniciar_colunas(self) -> None:
+        # Arrays novos (e não clear()): views numpy de um bloco anterior podem ainda existir
+        self._n = 0
+        self._dados = {}
+        self._mascaras = {}
+        for coluna, tipo in self.esquema.items():
+            if tipo == "int":
+                self._dados[coluna] = array.array("q")
+                self._mascaras[coluna] = bytearray()
+            elif tipo == "float":
+                self._dados[coluna] = array.array("d")
+            else:
+                self._dados[coluna] = []
+
+    def __len__(self) -> int:
+        return self._linhas_em_disco + self._n
+
+    def adicionar(self, linha: dict) -> str | None:
+        """
+        Appends one row; keys outside the schema are ignored (logged once per key).
+
+        :param linha: Row dict; missing keys, None and NaN become nulls.
+        :return: Path of the block spilled by this row, or None.
+        :raises ValueError: If a value cannot be converted to its column type (the row is not added).
+        """
+        for coluna in linha.keys() - self.esquema.keys():
+            if coluna not in self._ignoradas:
+                self._ignoradas.add(coluna)
+                logger.warning(
+                    "Column %s is not in the dataset schema; ignored", coluna
+                )
+
+        # Converte tudo antes de gravar, para uma linha inválida não desalinhar as colunas
+        convertidos = []
+        for coluna, tipo in self.esquema.items():
+            valor = linha.get(coluna)
+            if _ausente(valor):
+                convertidos.append(None)
+                continue
+            try:
+                if tipo == "int":
+                    convertidos.append(int(valor))
+                elif tipo == "float":
+                    convertidos.append(float(valor))
+                else:
+                    convertidos.append(str(valor))
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    f"Valor inválido para a coluna {coluna} ({tipo}): {valor!r}"
+                ) from e
+
+        for (coluna, tipo), valor in zip(self.esquema.items(), convertidos):
+            if tipo == "int":
+                self._dados[coluna].append(0 if valor is None else valor)
+                self._mascaras[coluna].append(valor is None)
+            elif tipo == "float":
+                self._dados[coluna].append(math.nan if valor is None else valor)
+            else:
+                self._dados[coluna].append(valor)
+        self._n += 1
+        if self._n >= self.tamanho_bloco:
+            return self.descarregar()
+        return None
+
+    def _bloco_em_memoria(self) -> pd.DataFrame:
+        # Views sem cópia sobre os arrays; só use enquanto nenhuma linha for adicionada
+        colunas = {}
+        for coluna, tipo in self.esquema.items():
+            if tipo == "int":
+                colunas[coluna] = pd.arrays.IntegerArray(
+                    np.frombuffer(self._dados[coluna], dtype=np.int64),
+                    np.frombuffer(self._mascaras[coluna], dtype=np.bool_),
+                )
+            elif tipo == "float":
+                colunas[coluna] = np.frombuffer(self._dados[coluna], dtype=np.float64)
+            else:
+                colunas[coluna] = pd.array(self._dados[coluna], dtype="object")
+        return pd.DataFrame(colunas, copy=False)
+
+    def descarregar(self) -> str | None:
+        """
+        Writes the rows held in memory as a new block and empties the arrays.
+
+        :return: Path of the block written, or None if there was nothing to write.
+        """
+        if not self._n:
+            return None
+        caminho = os.path.join(self.diretorio, f"bloco_{len(self._blocos) + 1:05d}.csv")
+        temporario = caminho + ".tmp"
+        self._bloco_em_memoria().to_csv(temporario, index=False)
+        # Uma queda no meio da escrita não deixa bloco truncado
+        os.replace(temporario, caminho)
+        self._blocos.append(caminho)
+        self._linhas_em_disco += self._n
+        self._reiniciar_colunas()
+        return caminho
+
+    def _ler_bloco(self, caminho: str, colunas: list = None) -> pd.DataFrame:
+        colunas = list(self.esquema) if colunas is None else colunas
+        df = pd.read_csv(
+            caminho,
+            usecols=lambda c: c in colunas,
+            dtype={c: _DTYPES_PANDAS[t] for c, t in self.esquema.items()},
+        )
+        # Blocos de uma versão anterior do schema ganham as colunas novas vazias
+        return df.reindex(columns=colunas)
+
+    def iterar_blocos(self, colunas: list = None):
+        """
+        Yields the accumulated rows block by block, spilled blocks first.
+
+        :param colunas: Columns to load (default: the whole schema); reading fewer columns is much cheaper.
+        :return: Generator of DataFrames.
+        """
+        for caminho in self._blocos:
+            yield self._ler_bloco(caminho, colunas)
+        if self._n:
+            bloco = self._bloco_em_memoria()
+            yield (bloco if colunas is None else bloco[colunas]).copy()
+
+    def para_dataframe(self, colunas: list = None) -> pd.DataFrame:
+        """
+        Builds one DataFrame with all accumulated rows (a single concatenation, no per-row objects).
+        """
+        blocos = list(self.iterar_blocos(colunas))
+        if not blocos:
+            return pd.DataFrame(
+                columns=list(self.esquema) if colunas is None else colunas
+            )
+        return pd.concat(blocos, ignore_index=True)
+
+    def incorporar_csv(self, caminho: str) -> int:
+        """
+        Adds the rows of an existing CSV (e.g. a legacy partial), streamed in blocks.
+
+        :return: Number of rows added.
+        """
+        total = 0
+        for parte in pd.read_csv(caminho, chunksize=self.tamanho_bloco):
+            for linha in parte.to_dict("records"):
+                self.adicionar(linha)
+                total += 1
+        return total
+
+    def salvar_csv(self, caminho: str) -> int:
+        """
+        Writes every accumulated row to one CSV without loading them all in memory.
+
+        :param caminho: Output CSV path (replaced atomically).
+        :return: Number of rows written.
+
+        EN: Why? The final dataset used to be a full DataFrame built from every dict. How? Spills the tail, then copies the block files byte for byte after a single header; only blocks with an older header go through pandas.
+        PT: Por quê? O dataset final era um DataFrame completo montado a partir de cada dict. Como? Despeja o final e copia os arquivos de bloco byte a byte após um único cabeçalho; só blocos com cabeçalho antigo passam pelo pandas.
+        """
+        self.descarregar()
+        cabecalho = ",".join(self.esquema) + "\n"
+        temporario = (
+            f"{caminho}.{os.getpid()}.tmp"  # Processos concorrentes não colidem
+        )
+        with open(temporario, "w", encoding="utf-8", newline="") as saida:
+            saida.write(cabecalho)
+            for bloco in self._blocos:
+                with open(bloco, encoding="utf-8", newline="") as entrada:
+                    if entrada.readline() == cabecalho:
+                        shutil.copyfileobj(entrada, saida)
+                    else:
+                        self._ler_bloco(bloco).to_csv(saida, header=False, index=False)
+        os.replace(temporario, caminho)
+        return len(self)
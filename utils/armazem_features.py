@@ -0,0 +1,209 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements the local feature store shared by the orchestrator and the web app. Why? /predict re-analysed sites the orchestrator had already audited in depth. How? An indexed SQLite table keyed by URL and content fingerprint, in WAL mode for concurrent readers and one writer.
+# PT: Este arquivo implementa o armazém local de features compartilhado entre o orquestrador e a aplicação web. Por quê? O /predict reanalisava sites que o orquestrador já tinha auditado a fundo. Como? Uma tabela SQLite indexada por URL e impressão digital do conteúdo, em modo WAL para leitores concorrentes e um escritor.
+import json
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from utils.validate_url import normalizar_url
+
+logger = logging.getLogger(__name__)
+
+# EN: Constants for the store. Why? Centralizes configuration, overridable by env vars.
+# PT: Constantes do armazém. Por quê? Centraliza a configuração, sobrescrevível por variáveis de ambiente.
+ARQUIVO_ARMAZEM = os.environ.get("PREVISIA_ARMAZEM", "data/features.sqlite")
+MAX_IDADE_DIAS = float(os.environ.get("PREVISIA_ARMAZEM_MAX_DIAS", 30))
+COLETADO_EXPIRADO = (
+    0.0  # Linhas importadas sem data: sempre além da política de frescor
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analises (
+    url TEXT PRIMARY KEY,
+    url_final TEXT,
+    sha256 TEXT,
+    score INTEGER,
+    features_json TEXT NOT NULL,
+    coletado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analises_url_final ON analises (url_final);
+CREATE INDEX IF NOT EXISTS idx_analises_sha256 ON analises (sha256);
+"""
+
+
+def _limpar_linha(linha: dict) -> dict:
+    # NaN vem de colunas ausentes no pandas; não é JSON válido nem feature útil
+    return {
+        k: v for k, v in linha.items() if not (isinstance(v, float) and math.isnan(v))
+    }
+
+
+class ArmazemFeatures:
+    """
+    SQLite store of full-audit rows, looked up by URL, final URL or HTML fingerprint.
+
+    :param caminho: SQLite file path.
+    :param somente_leitura: Open read-only (the web app); a missing file then just yields no hits.
+
+    EN: Why? Lets /predict answer known sites from stored full audits. How? One connection per thread (sqlite3 objects are not shareable), WAL journal so readers never block the writer, busy_timeout for lock contention.
+    PT: Por quê? Permite ao /predict responder sites conhecidos com auditorias completas armazenadas. Como? Uma conexão por thread (objetos sqlite3 não são compartilháveis), journal WAL para que leitores nunca bloqueiem o escritor, busy_timeout para disputa de locks.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_ARMAZEM, somente_leitura: bool = False):
+        self.caminho = caminho
+        self.somente_leitura = somente_leitura
+        self._local = threading.local()
+        if not somente_leitura:
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+            conexao = self._conexao()
+            conexao.executescript(_SCHEMA)
+            conexao.commit()
+
+    def _conexao(self) -> sqlite3.Connection | None:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None:
+            return conexao
+        if self.somente_leitura:
+            if not os.path.exists(self.caminho):
+                return None
+            conexao = sqlite3.connect(
+                f"file:{self.caminho}?mode=ro", uri=True, timeout=5
+            )
+        else:
+            conexao = sqlite3.connect(self.caminho, timeout=5)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.execute("PRAGMA busy_timeout=5000")
+        conexao.row_factory = sqlite3.Row
+        self._local.conexao = conexao
+        return conexao
+
+    def gravar(
+        self, linha: dict, commit: bool = True, coletado_em: float = None
+    ) -> None:
+        """
+        Inserts or replaces one dataset row.
+
+        :param linha: Row as written to the dataset CSV (url, label_score_acessibilidade, layout_json, dedup_*/html_* columns...).
+        :param commit: Commit immediately (pass False to batch and call confirmar()).
+        :param coletado_em: Collection time as a Unix timestamp, checked by the freshness policy (default: now).
+        """
+        linha = _limpar_linha(linha)
+        if coletado_em is None:
+            coletado_em = time.time()
+        self._conexao().execute(
+            "INSERT INTO analises (url, url_final, sha256, score, features_json, coletado_em) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET url_final = excluded.url_final, "
+            "sha256 = excluded.sha256, score = excluded.score, "
+            "features_json = excluded.features_json, coletado_em = excluded.coletado_em",
+            (
+                normalizar_url(linha["url"]),
+                linha.get("dedup_url_final"),
+                linha.get("html_sha256") or linha.get("dedup_sha256"),
+                linha.get("label_score_acessibilidade"),
+                json.dumps(linha, ensure_ascii=False, default=str),
+                coletado_em,
+            ),
+        )
+        if commit:
+            self.confirmar()
+
+    def confirmar(self) -> None:
+        """
+        Commits pending writes.
+        """
+        self._conexao().commit()
+
+    def buscar(
+        self,
+        url: str = None,
+        sha256: str = None,
+        max_idade_dias: float = MAX_IDADE_DIAS,
+    ) -> dict | None:
+        """
+        Finds a fresh stored full audit by URL (or final URL) or by HTML fingerprint.
+
+        :param url: Requested URL.
+        :param sha256: SHA-256 of the page's HTML (html_sha256).
+        :param max_idade_dias: Freshness policy: older rows are ignored, so the caller recomputes.
+        :return: Features dict (layout restored, plus "armazenado_em" timestamp) or None.
+        """
+        conexao = self._conexao()
+        if conexao is None:
+            return None
+        limite = time.time() - max_idade_dias * 86400
+        consultas = []
+        if url:
+            chave = normalizar_url(url)
+            consultas.append(("url = ? OR url_final = ?", (chave, chave)))
+        if sha256:
+            consultas.append(("sha256 = ?", (sha256,)))
+        try:
+            for condicao, parametros in consultas:
+                registro = conexao.execute(
+                    f"SELECT features_json, coletado_em FROM analises "
+                    f"WHERE ({condicao}) AND coletado_em >= ? "
+                    f"ORDER BY coletado_em DESC LIMIT 1",
+                    (*parametros, limite),
+                ).fetchone()
+                if registro is not None:
+                    return features_de_linha(
+                        json.loads(registro["features_json"]), registro["coletado_em"]
+                    )
+        except sqlite3.Error as e:
+            logger.warning("Feature store lookup failed: %s", e)
+        return None
+
+
+def features_de_linha(linha: dict, coletado_em: float = None) -> dict:
+    """
+    Converts a stored dataset row back into the features dict used by the app.
+
+    EN: Why? The dataset serializes layout as layout_json; the predictive guide needs the dict. How? Parses layout_json and drops the url column.
+    PT: Por quê? O dataset serializa o layout como layout_json; o guia preditivo precisa do dict. Como? Faz o parse do layout_json e remove a coluna url.
+    """
+    features = dict(linha)
+    features.pop("url", None)
+    layout_json = features.pop("layout_json", None)
+    features["layout"] = json.loads(layout_json) if layout_json else {}
+    if coletado_em is not None:
+        features["armazenado_em"] = coletado_em
+    return features
+
+
+def importar_csv(caminho_csv: str, caminho: str = ARQUIVO_ARMAZEM) -> int:
+    """
+    Loads an existing dataset CSV into the store.
+
+    :param caminho_csv: Dataset CSV path.
+    :param caminho: SQLite file path.
+    :return: Number of rows imported.
+
+    EN: Why? Datasets collected before the store existed can serve /predict too, but only within the freshness policy. How? Reads the CSV with pandas and writes rows in one transaction, dated by its coletado_em column (Unix timestamp) when there is one; undated rows get COLETADO_EXPIRADO, so buscar() only returns them when asked for a larger max_idade_dias.
+    PT: Por quê? Datasets coletados antes do armazém existir também podem servir o /predict, mas só dentro da política de frescor. Como? Lê o CSV com pandas e grava as linhas em uma transação, datadas pela coluna coletado_em (timestamp Unix) quando existe; linhas sem data recebem COLETADO_EXPIRADO, então o buscar() só as devolve quando pedido com um max_idade_dias maior.
+    """
+    import pandas as pd
+
+    armazem = ArmazemFeatures(caminho)
+    df = pd.read_csv(caminho_csv)
+    df = df[df["label_score_acessibilidade"] != -1]
+    for linha in df.to_dict("records"):
+        coletado_em = linha.pop("coletado_em", None)
+        if coletado_em is None or pd.isna(coletado_em):
+            coletado_em = COLETADO_EXPIRADO
+        armazem.gravar(linha, commit=False, coletado_em=float(coletado_em))
+    armazem.confirmar()
+    return len(df)
+
+
+if __name__ == "__main__":
+    # Uso: python -m utils.armazem_features data/dataset_acessibilidade.csv
+    csv = sys.argv[1] if len(sys.argv) > 1 else "data/dataset_acessibilidade.csv"
+    print(f"{importar_csv(csv)} linhas importadas de {csv} para {ARQUIVO_ARMAZEM}.")
@@ -0,0 +1,163 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements the compressed snapshot archive of audited pages. Why? Changing extrair_features or LAYOUT_TAGS meant re-fetching and re-auditing ~6k sites to rebuild the dataset. How? An indexed SQLite table keyed by URL holding the raw HTML, the rendered HTML and the Axe JSON of each audit, zlib-compressed, so features can be re-extracted offline.
+# PT: Este arquivo implementa o arquivo comprimido de snapshots das páginas auditadas. Por quê? Mudar extrair_features ou LAYOUT_TAGS exigia baixar e auditar de novo ~6 mil sites para reconstruir o dataset. Como? Uma tabela SQLite indexada por URL com o HTML cru, o HTML renderizado e o JSON do Axe de cada auditoria, comprimidos com zlib, para que as features sejam reextraídas offline.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from utils.validate_url import normalizar_url
+
+logger = logging.getLogger(__name__)
+
+# EN: Archive location and compression level. Why? Overridable like the other SQLite stores; level 6 is zlib's speed/size sweet spot for HTML (~5-8x).
+# PT: Local do arquivo e nível de compressão. Por quê? Sobrescrevível como os outros bancos SQLite; o nível 6 é o equilíbrio velocidade/tamanho do zlib para HTML (~5-8x).
+ARQUIVO_SNAPSHOTS = os.environ.get("PREVISIA_SNAPSHOTS", "data/snapshots.sqlite")
+NIVEL_COMPRESSAO = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    url TEXT PRIMARY KEY,
+    html_sha256 TEXT,
+    encoding TEXT,
+    perfil TEXT,
+    html_cru BLOB,
+    html_renderizado BLOB,
+    axe_json BLOB,
+    coletado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_sha256 ON snapshots (html_sha256);
+"""
+
+
+def _comprimir(dados: bytes | None) -> bytes | None:
+    return None if dados is None else zlib.compress(dados, NIVEL_COMPRESSAO)
+
+
+def _descomprimir(dados: bytes | None) -> bytes | None:
+    return None if dados is None else zlib.decompress(dados)
+
+
+class ArquivoSnapshots:
+    """
+    SQLite archive of raw HTML, rendered HTML and Axe results per audited URL.
+
+    :param caminho: SQLite file path.
+    :param somente_leitura: Open read-only (re-extraction workers); a missing file then just yields no snapshots.
+
+    EN: Why? Lets the dataset be rebuilt from what was collected, without network or Chromium. How? Each blob is zlib-compressed on its own, so reading one URL decompresses only that page; one connection per thread (and per worker process), WAL so collectors write while others read.
+    PT: Por quê? Permite reconstruir o dataset a partir do que foi coletado, sem rede nem Chromium. Como? Cada blob é comprimido com zlib separadamente, então ler uma URL descomprime só aquela página; uma conexão por thread (e por processo worker), WAL para que coletores gravem enquanto outros leem.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_SNAPSHOTS, somente_leitura: bool = False):
+        self.caminho = caminho
+        self.somente_leitura = somente_leitura
+        self._local = threading.local()
+        if not somente_leitura:
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+            conexao = self._conexao()
+            conexao.executescript(_SCHEMA)
+            conexao.commit()
+
+    def _conexao(self) -> sqlite3.Connection | None:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None:
+            return conexao
+        if self.somente_leitura:
+            if not os.path.exists(self.caminho):
+                return None
+            conexao = sqlite3.connect(
+                f"file:{self.caminho}?mode=ro", uri=True, timeout=30
+            )
+        else:
+            conexao = sqlite3.connect(self.caminho, timeout=30)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+        self._local.conexao = conexao
+        return conexao
+
+    def gravar(
+        self,
+        url: str,
+        html_cru: bytes,
+        html_renderizado: str = None,
+        axe: dict = None,
+        perfil: str = None,
+        encoding: str = None,
+        html_sha256: str = None,
+    ) -> None:
+        """
+        Inserts or replaces the snapshot of one audit.
+
+        :param url: Audited URL (stored normalized).
+        :param html_cru: Body bytes as downloaded (up to the collector's byte cap).
+        :param html_renderizado: DOM serialized by Chromium after the page settled.
+        :param axe: Full Axe response (violations with their nodes).
+        :param perfil: Axe profile of the audit.
+        :param encoding: Charset from the Content-Type header, if any (re-parsing uses the same decoding).
+        :param html_sha256: Fingerprint of html_cru (indexed, as in the feature store).
+        """
+        axe_json = (
+            None if axe is None else json.dumps(axe, ensure_ascii=False).encode("utf-8")
+        )
+        renderizado = (
+            None if html_renderizado is None else html_renderizado.encode("utf-8")
+        )
+        conexao = self._conexao()
+        conexao.execute(
+            "INSERT OR REPLACE INTO snapshots (url, html_sha256, encoding, perfil, html_cru, "
+            "html_renderizado, axe_json, coletado_em) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                normalizar_url(url),
+                html_sha256,
+                encoding,
+                perfil,
+                _comprimir(html_cru),
+                _comprimir(renderizado),
+                _comprimir(axe_json),
+                time.time(),
+            ),
+        )
+        conexao.commit()
+
+    def ler(self, url: str) -> dict | None:
+        """
+        Reads and decompresses one snapshot.
+
+        :param url: URL as collected (normalized for the lookup).
+        :return: Dict with url, html_sha256, encoding, perfil, html_cru (bytes), html_renderizado (str or None), axe (dict or None) and coletado_em; None if absent.
+        """
+        conexao = self._conexao()
+        if conexao is None:
+            return None
+        registro = conexao.execute(
+            "SELECT url, html_sha256, encoding, perfil, html_cru, html_renderizado, axe_json, "
+            "coletado_em FROM snapshots WHERE url = ?",
+            (normalizar_url(url),),
+        ).fetchone()
+        if registro is None:
+            return None
+        renderizado = _descomprimir(registro[5])
+        axe_json = _descomprimir(registro[6])
+        return {
+            "url": registro[0],
+            "html_sha256": registro[1],
+            "encoding": registro[2],
+            "perfil": registro[3],
+            "html_cru": _descomprimir(registro[4]),
+            "html_renderizado": (
+                None if renderizado is None else renderizado.decode("utf-8")
+            ),
+            "axe": None if axe_json is None else json.loads(axe_json),
+            "coletado_em": registro[7],
+        }
+
+    def __len__(self) -> int:
+        conexao = self._conexao()
+        if conexao is None:
+            return 0
+        return conexao.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
@@ -0,0 +1,209 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements a bounded background job queue. Why? A full analysis runs Chromium for minutes and must not hold a web worker. How? A fixed pool of daemon threads consumes a bounded queue; submissions beyond capacity are refused (admission control).
+# PT: Este arquivo implementa uma fila de jobs em segundo plano limitada. Por quê? Uma análise completa roda o Chromium por minutos e não pode prender um worker web. Como? Um pool fixo de threads daemon consome uma fila limitada; submissões além da capacidade são recusadas (controle de admissão).
+import logging
+import queue
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# EN: Job states exposed by the status endpoint.
+# PT: Estados de job expostos pelo endpoint de status.
+NA_FILA = "na_fila"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+
+
+def _mesmos_args(a: tuple, b: tuple) -> bool:
+    # Escalares iguais ou o mesmo objeto: prazos e decisões de triagem são de cada requisição
+    escalares = (str, int, float, bool, type(None))
+    return len(a) == len(b) and all(
+        x is y or (isinstance(x, escalares) and type(x) is type(y) and x == y)
+        for x, y in zip(a, b)
+    )
+
+
+class FilaCheia(Exception):
+    """
+    Raised when the queue has no room for a new job.
+
+    EN: Why? Lets the caller answer 503 with Retry-After instead of piling up work. How? Carries the estimated wait in seconds.
+    PT: Por quê? Permite ao chamador responder 503 com Retry-After em vez de acumular trabalho. Como? Carrega a espera estimada em segundos.
+    """
+
+    def __init__(self, espera_s: int):
+        super().__init__(f"Fila cheia; tente novamente em {espera_s}s")
+        self.espera_s = espera_s
+
+
+class Job:
+    """
+    One submitted unit of work and its outcome.
+    """
+
+    __slots__ = (
+        "id",
+        "chave",
+        "args",
+        "status",
+        "resultado",
+        "erro",
+        "criado_em",
+        "iniciado_em",
+        "concluido_em",
+        "_terminado",
+    )
+
+    def __init__(self, chave: str, args: tuple):
+        self.id = uuid.uuid4().hex
+        self.chave = chave
+        self.args = args
+        self.status = NA_FILA
+        self.resultado = None
+        self.erro = None
+        self.criado_em = time.time()
+        self.iniciado_em = None
+        self.concluido_em = None
+        self._terminado = threading.Event()
+
+    def aguardar(self, timeout: float = None) -> bool:
+        """
+        Blocks until the job finishes (succeeded or failed).
+
+        :param timeout: Maximum seconds to wait (None waits forever).
+        :return: True if the job finished, False on timeout.
+        """
+        return self._terminado.wait(timeout)
+
+    def para_dict(self) -> dict:
+        """
+        Serializable view of the job (without its result payload).
+        """
+        return {
+            "id": self.id,
+            "status": self.status,
+            "criado_em": self.criado_em,
+            "iniciado_em": self.iniciado_em,
+            "concluido_em": self.concluido_em,
+            "erro": self.erro,
+        }
+
+
+class FilaJobs:
+    """
+    Bounded job queue served by a fixed pool of worker threads.
+
+    :param funcao: Callable run by the workers with the job's args; its return value becomes job.resultado.
+    :param workers: Number of worker threads (concurrent jobs).
+    :param max_pendentes: Maximum jobs waiting in the queue before refusing new ones.
+    :param ttl_s: Seconds a finished job stays available for polling.
+
+    EN: Why? Caps how many Chromium audits run at once and how many can wait, so a handful of users cannot exhaust the server. How? queue.Queue(maxsize) + daemon threads started on first use; an in-flight job is reused only for the same key and identical arguments.
+    PT: Por quê? Limita quantas auditorias Chromium rodam ao mesmo tempo e quantas podem esperar, para que poucos usuários não esgotem o servidor. Como? queue.Queue(maxsize) + threads daemon iniciadas no primeiro uso; um job em andamento só é reaproveitado com a mesma chave e argumentos idênticos.
+    """
+
+    def __init__(self, funcao, workers: int, max_pendentes: int, ttl_s: int = 900):
+        self.funcao = funcao
+        self.workers = workers
+        self.ttl_s = ttl_s
+        self._fila = queue.Queue(maxsize=max_pendentes)
+        self._jobs = {}
+        self._em_andamento = {}  # chave -> [Jobs na fila ou executando]
+        self._lock = threading.Lock()
+        self._threads = []
+        self._duracao_media_s = 60.0  # Estimativa inicial, ajustada por média móvel
+
+    def _iniciar_workers(self) -> None:
+        if self._threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(
+                target=self._loop_worker, name=f"fila-jobs-{i}", daemon=True
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _limpar_expirados(self) -> None:
+        limite = time.time() - self.ttl_s
+        expirados = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.concluido_em is not None and job.concluido_em < limite
+        ]
+        for job_id in expirados:
+            del self._jobs[job_id]
+
+    def estimar_espera_s(self) -> int:
+        """
+        Estimates how long a new job would wait, for Retry-After.
+
+        :return: Seconds (at least 1).
+        """
+        pendentes = self._fila.qsize() + 1
+        return max(1, int(pendentes / self.workers * self._duracao_media_s))
+
+    def submeter(self, chave: str, *args) -> Job:
+        """
+        Enqueues a job, or returns an in-flight job with the same key and identical arguments.
+
+        :param chave: Deduplication key (e.g. the URL).
+        :param args: Arguments passed to funcao. Identical means equal scalars or the very same objects, so a job carrying another caller's deadline, triage decision or profiling flag is never shared.
+        :return: The Job.
+        :raises FilaCheia: If the queue is at capacity.
+        """
+        with self._lock:
+            self._iniciar_workers()
+            self._limpar_expirados()
+            for existente in self._em_andamento.get(chave, []):
+                if _mesmos_args(existente.args, args):
+                    return existente
+            job = Job(chave, args)
+            try:
+                self._fila.put_nowait(job)
+            except queue.Full:
+                raise FilaCheia(self.estimar_espera_s())
+            self._jobs[job.id] = job
+            self._em_andamento.setdefault(chave, []).append(job)
+        logger.info("Job submitted", extra={"dados": {"job": job.id, "chave": chave}})
+        return job
+
+    def obter(self, job_id: str) -> Job | None:
+        """
+        Looks up a job by id.
+
+        :param job_id: Job id returned by submeter.
+        :return: The Job, or None if unknown or expired.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _loop_worker(self) -> None:
+        while True:
+            job = self._fila.get()
+            job.status = EXECUTANDO
+            job.iniciado_em = time.time()
+            try:
+                job.resultado = self.funcao(*job.args)
+                job.status = CONCLUIDO
+            except Exception as e:
+                logger.exception(
+                    "Job failed", extra={"dados": {"job": job.id, "chave": job.chave}}
+                )
+                job.erro = str(e)
+                job.status = FALHOU
+            finally:
+                job.concluido_em = time.time()
+                job._terminado.set()
+                with self._lock:
+                    mesma_chave = self._em_andamento.get(job.chave, [])
+                    if job in mesma_chave:
+                        mesma_chave.remove(job)
+                    if not mesma_chave:
+                        self._em_andamento.pop(job.chave, None)
+                    duracao = job.concluido_em - job.iniciado_em
+                    self._duracao_media_s = 0.8 * self._duracao_media_s + 0.2 * duracao
+                self._fila.task_done()
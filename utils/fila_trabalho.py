@@ -0,0 +1,284 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements a durable, lease-based work queue for collectors. Why? Resuming from the last checkpoint redid everything audited after it, and two collectors could not share the URL list. How? A SQLite table of URLs that workers claim with expiring leases, renew while auditing and close with their result row; expired leases are re-issued.
+# PT: Este arquivo implementa uma fila de trabalho durável, baseada em leases, para os coletores. Por quê? Retomar do último checkpoint refazia tudo o que foi auditado depois dele, e dois coletores não conseguiam dividir a lista de URLs. Como? Uma tabela SQLite de URLs que os workers reivindicam com leases que expiram, renovam durante a auditoria e fecham com a linha de resultado; leases expirados são reemitidos.
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# EN: Item states and queue defaults.
+# PT: Estados dos itens e padrões da fila.
+PENDENTE = "pendente"
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+ARQUIVO_FILA = os.environ.get("PREVISIA_FILA", "data/fila_coleta.sqlite")
+# Uma auditoria completa com retry leva até ~6 min
+LEASE_S = float(os.environ.get("PREVISIA_LEASE_S", 600))
+MAX_TENTATIVAS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS itens (
+    url TEXT PRIMARY KEY,
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    dono TEXT,
+    lease_ate REAL,
+    erro TEXT,
+    linha_json TEXT,
+    atualizado_em REAL
+);
+CREATE INDEX IF NOT EXISTS idx_itens_estado ON itens (estado, lease_ate);
+"""
+
+
+def _limpar_linha(linha: dict) -> dict:
+    # NaN não é JSON válido; vira ausente, como no armazém de features
+    return {
+        k: v for k, v in linha.items() if not (isinstance(v, float) and math.isnan(v))
+    }
+
+
+class FilaTrabalho:
+    """
+    SQLite work queue of URLs shared by any number of collector processes.
+
+    :param caminho: SQLite file path.
+    :param max_tentativas: Claims per URL before it is marked failed.
+
+    EN: Why? A crash must lose at most the URLs being audited, and collectors must be able to join or leave mid-run. How? Claims run in BEGIN IMMEDIATE transactions (one claimer at a time, across processes); a claim sets owner and lease expiry and counts an attempt; concluir stores the result row in the same table, so "done" and "saved" are one commit.
+    PT: Por quê? Uma queda deve perder no máximo as URLs em auditoria, e coletores devem poder entrar ou sair no meio da execução. Como? As reivindicações rodam em transações BEGIN IMMEDIATE (um reivindicador por vez, entre processos); uma reivindicação define dono e validade do lease e conta uma tentativa; concluir grava a linha de resultado na mesma tabela, então "feito" e "salvo" são um único commit.
+    """
+
+    def __init__(
+        self, caminho: str = ARQUIVO_FILA, max_tentativas: int = MAX_TENTATIVAS
+    ):
+        self.caminho = caminho
+        self.max_tentativas = max_tentativas
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        self._conexao().executescript(_SCHEMA)
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            # Autocommit: as transações são abertas explicitamente com BEGIN IMMEDIATE
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    def _transacao(self, sql: str, parametros=()) -> int:
+        conexao = self._conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            alterados = conexao.execute(sql, parametros).rowcount
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        return alterados
+
+    def semear(self, urls: list) -> int:
+        """
+        Adds URLs not yet in the queue (idempotent; every collector may call it).
+
+        :return: Number of new URLs.
+        """
+        conexao = self._conexao()
+        agora = time.time()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            antes = conexao.execute("SELECT COUNT(*) FROM itens").fetchone()[0]
+            conexao.executemany(
+                "INSERT OR IGNORE INTO itens (url, atualizado_em) VALUES (?, ?)",
+                ((url, agora) for url in urls),
+            )
+            depois = conexao.execute("SELECT COUNT(*) FROM itens").fetchone()[0]
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        return depois - antes
+
+    def reivindicar(self, dono: str, quantidade: int, lease_s: float = LEASE_S) -> list:
+        """
+        Claims up to `quantidade` pending URLs, or URLs whose lease expired.
+
+        :param dono: Worker id (e.g. host-pid).
+        :param quantidade: Maximum URLs to claim.
+        :param lease_s: Seconds until the claim expires unless renewed.
+        :return: Claimed URLs, in seeding order.
+        """
+        conexao = self._conexao()
+        agora = time.time()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            # Leases expirados sem tentativas restantes não voltam à fila
+            conexao.execute(
+                "UPDATE itens SET estado = ?, erro = 'lease expirado', dono = NULL, atualizado_em = ? "
+                "WHERE estado = ? AND lease_ate < ? AND tentativas >= ?",
+                (FALHOU, agora, EM_ANDAMENTO, agora, self.max_tentativas),
+            )
+            urls = [
+                r[0]
+                for r in conexao.execute(
+                    "SELECT url FROM itens WHERE estado = ? OR (estado = ? AND lease_ate < ?) "
+                    "ORDER BY rowid LIMIT ?",
+                    (PENDENTE, EM_ANDAMENTO, agora, quantidade),
+                )
+            ]
+            conexao.executemany(
+                "UPDATE itens SET estado = ?, dono = ?, lease_ate = ?, tentativas = tentativas + 1, "
+                "atualizado_em = ? WHERE url = ?",
+                ((EM_ANDAMENTO, dono, agora + lease_s, agora, url) for url in urls),
+            )
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        return urls
+
+    def renovar(self, dono: str, urls: list, lease_s: float = LEASE_S) -> int:
+        """
+        Heartbeat: extends the leases this worker still holds.
+
+        :return: Number of leases renewed (fewer than len(urls) means some were lost).
+        """
+        if not urls:
+            return 0
+        marcadores = ",".join("?" * len(urls))
+        return self._transacao(
+            f"UPDATE itens SET lease_ate = ? WHERE dono = ? AND estado = ? AND url IN ({marcadores})",
+            (time.time() + lease_s, dono, EM_ANDAMENTO, *urls),
+        )
+
+    def concluir(self, dono: str, url: str, linha: dict) -> bool:
+        """
+        Marks a URL done and stores its dataset row in the same commit.
+
+        :return: False if this worker no longer holds the URL (lease expired and re-issued, or concluded by another worker).
+        """
+        return bool(
+            self._transacao(
+                "UPDATE itens SET estado = ?, erro = NULL, linha_json = ?, atualizado_em = ? "
+                "WHERE url = ? AND dono = ? AND estado = ?",
+                (
+                    CONCLUIDO,
+                    json.dumps(_limpar_linha(linha), ensure_ascii=False, default=str),
+                    time.time(),
+                    url,
+                    dono,
+                    EM_ANDAMENTO,
+                ),
+            )
+        )
+
+    def falhar(self, dono: str, url: str, erro: str) -> None:
+        """
+        Records a failed attempt: the URL goes back to pending, or to failed after max_tentativas.
+        """
+        self._transacao(
+            "UPDATE itens SET estado = CASE WHEN tentativas >= ? THEN ? ELSE ? END, "
+            "dono = NULL, lease_ate = NULL, erro = ?, atualizado_em = ? "
+            "WHERE url = ? AND dono = ? AND estado = ?",
+            (
+                self.max_tentativas,
+                FALHOU,
+                PENDENTE,
+                erro[:500],
+                time.time(),
+                url,
+                dono,
+                EM_ANDAMENTO,
+            ),
+        )
+
+    def liberar(self, dono: str) -> int:
+        """
+        Returns this worker's in-flight URLs to the queue without counting the attempt (graceful exit).
+        """
+        return self._transacao(
+            "UPDATE itens SET estado = ?, dono = NULL, lease_ate = NULL, "
+            "tentativas = MAX(tentativas - 1, 0), atualizado_em = ? WHERE dono = ? AND estado = ?",
+            (PENDENTE, time.time(), dono, EM_ANDAMENTO),
+        )
+
+    def resumo(self) -> dict:
+        """
+        Number of URLs per state.
+        """
+        contagens = dict.fromkeys((PENDENTE, EM_ANDAMENTO, CONCLUIDO, FALHOU), 0)
+        for estado, total in self._conexao().execute(
+            "SELECT estado, COUNT(*) FROM itens GROUP BY estado"
+        ):
+            contagens[estado] = total
+        return contagens
+
+    def linhas_concluidas(self):
+        """
+        Yields the stored result rows of concluded URLs, in seeding order.
+        """
+        for (linha_json,) in self._conexao().execute(
+            "SELECT linha_json FROM itens WHERE estado = ? ORDER BY rowid", (CONCLUIDO,)
+        ):
+            yield json.loads(linha_json)
+
+
+class RenovadorLeases:
+    """
+    Background heartbeat that renews the leases of the URLs a worker is auditing.
+
+    :param fila: FilaTrabalho.
+    :param dono: Worker id used for the claims.
+    :param lease_s: Lease length; renewals happen every lease_s / 4.
+
+    EN: Why? An audit may outlive a fixed lease; only a dead worker should lose its URLs. How? A daemon thread with its own SQLite connection renews the tracked URLs until parar() is called.
+    PT: Por quê? Uma auditoria pode durar mais que um lease fixo; só um worker morto deve perder suas URLs. Como? Uma thread daemon com conexão SQLite própria renova as URLs acompanhadas até parar() ser chamado.
+    """
+
+    def __init__(self, fila: FilaTrabalho, dono: str, lease_s: float = LEASE_S):
+        self.fila = fila
+        self.dono = dono
+        self.lease_s = lease_s
+        self._urls = set()
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name="renovador-leases", daemon=True
+        )
+
+    def iniciar(self) -> None:
+        self._thread.start()
+
+    def adicionar(self, urls: list) -> None:
+        with self._lock:
+            self._urls.update(urls)
+
+    def remover(self, url: str) -> None:
+        with self._lock:
+            self._urls.discard(url)
+
+    def parar(self) -> None:
+        self._parar.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._parar.wait(self.lease_s / 4):
+            with self._lock:
+                urls = list(self._urls)
+            try:
+                renovados = self.fila.renovar(self.dono, urls, self.lease_s)
+                if renovados < len(urls):
+                    logger.warning(
+                        "Lost %d of %d leases", len(urls) - renovados, len(urls)
+                    )
+            except sqlite3.Error as e:
+                logger.error("Lease renewal failed: %s", e)
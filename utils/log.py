@@ -0,0 +1,227 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file centralizes logging for every module. Why? Logging must not cost latency on the request path. How? A queue-backed handler hands records to a background thread that formats them as JSON lines.
+# PT: Este arquivo centraliza o logging de todos os módulos. Por quê? O logging não pode custar latência no caminho da requisição. Como? Um handler com fila entrega os registros a uma thread de fundo que os formata como linhas JSON.
+import atexit
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# EN: Constants for the logging subsystem. Why? Centralizes configuration, overridable by env vars.
+# PT: Constantes do subsistema de logging. Por quê? Centraliza a configuração, sobrescrevível por variáveis de ambiente.
+NIVEL_PADRAO = os.environ.get("PREVISIA_LOG_LEVEL", "")
+TAMANHO_FILA = 10000  # Registros pendentes antes de descartar
+ESPERA_ESVAZIAR_S = 5  # Na saída, quanto esperar a thread abrir espaço na fila cheia
+MAX_PAYLOAD_CHARS = int(os.environ.get("PREVISIA_LOG_MAX_PAYLOAD", 2000))
+MAX_PAYLOAD_ITENS = 200  # Valores copiados de um PayloadLimitado na thread chamadora
+TAXA_AMOSTRAGEM = int(os.environ.get("PREVISIA_LOG_SAMPLE_EVERY", 20))  # 1 em N
+
+_listener = None
+_handler_fila = None
+
+
+_ESCALARES = (str, int, float, bool, type(None))
+
+
+def _retrato(valor, orcamento: list = None):
+    """
+    Copy of a logged value made of plain containers and scalars.
+
+    :param valor: Value from a record's `dados`.
+    :param orcamento: Optional one-item list with the number of values still to copy; once it reaches zero, the rest is replaced by "...".
+    :return: The copy; other objects become str(), PayloadLimitado is rewrapped around a copy capped at MAX_PAYLOAD_ITENS values.
+    """
+    if orcamento is not None:
+        if orcamento[0] <= 0:
+            return "..."
+        orcamento[0] -= 1
+    if isinstance(valor, _ESCALARES):
+        return valor
+    if isinstance(valor, PayloadLimitado):
+        copia = _retrato(valor.obj, [MAX_PAYLOAD_ITENS])
+        return PayloadLimitado(copia, valor.max_chars)
+    if isinstance(valor, dict):
+        return {str(k): _retrato(v, orcamento) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return [_retrato(v, orcamento) for v in valor]
+    return str(valor)
+
+
+class PayloadLimitado:
+    """
+    Wraps a verbose payload so it is only serialized, and size-capped, on the listener thread.
+
+    EN: Why? Serializing a full Axe response on the request path is wasted latency, and the record may be filtered out. How? The caller thread only copies the first MAX_PAYLOAD_ITENS values (in _HandlerFilaNaoBloqueante.prepare, after the level and sampling filters); json.dumps runs in __str__, called by FormatadorJSON on the listener, and the text is cut at max_chars.
+    PT: Por quê? Serializar a resposta Axe inteira no caminho da requisição é latência desperdiçada, e o registro pode ser filtrado. Como? A thread chamadora só copia os primeiros MAX_PAYLOAD_ITENS valores (em _HandlerFilaNaoBloqueante.prepare, depois dos filtros de nível e amostragem); o json.dumps roda em __str__, chamado pelo FormatadorJSON na ouvinte, e o texto é cortado em max_chars.
+    """
+
+    __slots__ = ("obj", "max_chars")
+
+    def __init__(self, obj, max_chars: int = MAX_PAYLOAD_CHARS):
+        self.obj = obj
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        texto = json.dumps(self.obj, default=str, ensure_ascii=False)
+        if len(texto) > self.max_chars:
+            return f"{texto[:self.max_chars]}...(truncado, {len(texto)} chars)"
+        return texto
+
+
+class FormatadorJSON(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    EN: Why? Replaces hand-built f-string JSON, which broke on quotes in messages. How? Merges time, level, logger, message and the record's `dados` dict.
+    PT: Por quê? Substitui o JSON montado com f-strings, que quebrava com aspas nas mensagens. Como? Junta horário, nível, logger, mensagem e o dict `dados` do registro.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        registro = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        dados = getattr(record, "dados", None)
+        if dados:
+            registro.update(
+                {
+                    k: str(v) if isinstance(v, PayloadLimitado) else v
+                    for k, v in dados.items()
+                }
+            )
+        if record.exc_info:
+            registro["exception"] = self.formatException(record.exc_info)
+        return json.dumps(registro, default=str, ensure_ascii=False)
+
+
+class FiltroAmostragem(logging.Filter):
+    """
+    Lets through only 1 in N records marked with `amostrar=True`.
+
+    EN: Why? Verbose per-URL payloads are useful as samples, not on every audit. How? A shared counter; unmarked records always pass.
+    PT: Por quê? Payloads verbosos por URL são úteis como amostra, não em toda auditoria. Como? Um contador compartilhado; registros não marcados sempre passam.
+    """
+
+    def __init__(self, taxa: int = TAXA_AMOSTRAGEM):
+        super().__init__()
+        self.taxa = max(1, taxa)
+        self._contador = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "amostrar", False):
+            return True
+        return next(self._contador) % self.taxa == 0
+
+
+class _HandlerFilaNaoBloqueante(logging.handlers.QueueHandler):
+    """
+    QueueHandler that snapshots records and never blocks the caller thread.
+
+    EN: Why? Callers keep mutating the dicts they log (e.g. features), so formatting later on the listener thread would show a later state, or fail on a dict changed mid-serialization; and a full queue raises. How? prepare() renders the message and copies `dados` into plain containers and scalars in the caller (PayloadLimitado only up to MAX_PAYLOAD_ITENS values, still unserialized); all JSON serialization stays on the listener. When the queue is full, records are dropped and counted.
+    PT: Por quê? Quem chama continua alterando os dicts que registrou (ex.: features), então formatar depois na thread ouvinte mostraria um estado posterior, ou falharia com um dict alterado durante a serialização; e uma fila cheia gera exceção. Como? prepare() monta a mensagem e copia `dados` em containers e escalares simples na thread chamadora (PayloadLimitado só até MAX_PAYLOAD_ITENS valores, ainda sem serializar); toda serialização JSON fica na ouvinte. Com a fila cheia, registros são descartados e contados.
+    """
+
+    descartados = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Cópia rasa: o mesmo registro pode ir a outros handlers do logger raiz
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        dados = getattr(record, "dados", None)
+        if dados:
+            # Retrato do payload neste instante, sem serializar nada aqui
+            record.dados = _retrato(dados)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+class _OuvinteFila(logging.handlers.QueueListener):
+    """
+    QueueListener whose stop() waits for room in a full bounded queue.
+
+    EN: Why? The stock enqueue_sentinel() uses put_nowait, which raises queue.Full at exit when the queue is full. How? Blocking put with a timeout; the listener thread keeps draining meanwhile.
+    PT: Por quê? O enqueue_sentinel() padrão usa put_nowait, que gera queue.Full na saída com a fila cheia. Como? put bloqueante com timeout; enquanto isso a thread ouvinte continua esvaziando a fila.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel, timeout=ESPERA_ESVAZIAR_S)
+
+
+def configurar_logging(
+    arquivo: str, nivel: int = logging.ERROR, console: bool = False
+) -> None:
+    """
+    Installs the queue-backed logging subsystem on the root logger.
+
+    :param arquivo: Log file path (JSON lines).
+    :param nivel: Minimum level, overridden by PREVISIA_LOG_LEVEL.
+    :param console: Also mirror records to stderr.
+
+    EN: Why? Replaces the per-module basicConfig calls, where only the first import took effect. How? Root logger gets a QueueHandler; a QueueListener thread writes to file (and stderr). Idempotent.
+    PT: Por quê? Substitui os basicConfig por módulo, onde só o primeiro import valia. Como? O logger raiz recebe um QueueHandler; uma thread QueueListener escreve no arquivo (e no stderr). Idempotente.
+    """
+    global _listener, _handler_fila
+    if _listener is not None:
+        return
+
+    if NIVEL_PADRAO:
+        nivel = logging.getLevelName(NIVEL_PADRAO.upper())
+        if not isinstance(nivel, int):
+            nivel = logging.ERROR
+
+    formatador = FormatadorJSON()
+    destinos = [logging.FileHandler(arquivo, encoding="utf-8")]
+    if console:
+        destinos.append(logging.StreamHandler(sys.stderr))
+    for destino in destinos:
+        destino.setFormatter(formatador)
+
+    fila = queue.Queue(maxsize=TAMANHO_FILA)
+    _handler_fila = _HandlerFilaNaoBloqueante(fila)
+    _handler_fila.addFilter(FiltroAmostragem())
+
+    raiz = logging.getLogger()
+    raiz.setLevel(nivel)
+    raiz.addHandler(_handler_fila)
+
+    _listener = _OuvinteFila(fila, *destinos, respect_handler_level=True)
+    _listener.start()
+    atexit.register(encerrar_logging)
+
+
+def encerrar_logging() -> None:
+    """
+    Flushes pending records and stops the background thread.
+
+    EN: Why? Records still in the queue at exit would be lost. How? QueueListener.stop() drains the queue before joining.
+    PT: Por quê? Registros ainda na fila ao sair seriam perdidos. Como? QueueListener.stop() esvazia a fila antes do join.
+    """
+    global _listener, _handler_fila
+    if _listener is None:
+        return
+    try:
+        _listener.stop()
+    except queue.Full:
+        # A thread ouvinte não andou em ESPERA_ESVAZIAR_S: desiste sem travar a saída
+        print(
+            "Logging: fila cheia ao encerrar; registros pendentes descartados.",
+            file=sys.stderr,
+        )
+    logging.getLogger().removeHandler(_handler_fila)
+    for destino in _listener.handlers:
+        destino.close()
+    _listener = None
+    _handler_fila = None
@@ -0,0 +1,156 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file loads the trained model artifacts and scores feature rows. Why? The web app and the batch scorer must apply exactly the same preprocessing and network. How? One class holding the network, scaler and feature names from models/, predicting a whole batch per forward pass.
+# PT: Este arquivo carrega os artefatos do modelo treinado e pontua linhas de features. Por quê? A aplicação web e o pontuador em lote precisam aplicar exatamente o mesmo pré-processamento e a mesma rede. Como? Uma classe com a rede, o scaler e os nomes das features de models/, prevendo um lote inteiro por forward pass.
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# EN: Artifact names written by trainer.py and the features log-transformed before scaling.
+# PT: Nomes dos artefatos gravados pelo trainer.py e as features com log transform antes do scaler.
+DIRETORIO_MODELO = "models"
+ARQUIVO_MODELO = "modelo_acessibilidade.pt"
+ARQUIVO_SCALER = "scaler.pkl"
+ARQUIVO_FEATURES = "feature_names.pkl"
+FEATURES_ASSIMETRICAS = ["falhas_contraste", "imagens_sem_alt", "videos_sem_captions"]
+# Passes com dropout ativo na estimativa de incerteza (MC-dropout)
+AMOSTRAS_MC = int(os.environ.get("PREVISIA_AMOSTRAS_MC", 100))
+
+
+# Mesma arquitetura do trainer (com BatchNorm), para o state_dict casar
+class AccessibilityNet(nn.Module):
+    def __init__(self, input_size):
+        super(AccessibilityNet, self).__init__()
+        self.fc1 = nn.Linear(input_size, 512)  # Wider layers from option 5
+        self.bn1 = nn.BatchNorm1d(512)  # BatchNorm for stable gradients
+        self.dropout1 = nn.Dropout(0.3)  # Increased to 0.3 for less overfit
+        self.fc2 = nn.Linear(512, 256)
+        self.bn2 = nn.BatchNorm1d(256)
+        self.dropout2 = nn.Dropout(0.3)
+        self.fc3 = nn.Linear(256, 128)
+        self.bn3 = nn.BatchNorm1d(128)
+        self.dropout3 = nn.Dropout(0.3)
+        self.fc4 = nn.Linear(128, 1)
+
+    def forward(self, x):
+        x = torch.relu(self.bn1(self.fc1(x)))
+        x = self.dropout1(x)
+        x = torch.relu(self.bn2(self.fc2(x)))
+        x = self.dropout2(x)
+        x = torch.relu(self.bn3(self.fc3(x)))
+        x = self.dropout3(x)
+        x = self.fc4(x)
+        return x
+
+
+class ModeloAcessibilidade:
+    """
+    Trained accessibility model: network, scaler and feature names loaded from a directory.
+
+    :param diretorio: Directory with the trainer's artifacts (default: models).
+    :param versao: Version label reported with predictions (default: the directory name).
+    :raises FileNotFoundError: If an artifact is missing.
+
+    EN: Why? Loading and preprocessing lived inside app.py, so nothing else could score without importing Flask. How? Loads the three artifacts once; prever() scores many rows in one forward pass.
+    PT: Por quê? O carregamento e o pré-processamento viviam dentro do app.py, então nada mais conseguia pontuar sem importar o Flask. Como? Carrega os três artefatos uma vez; prever() pontua várias linhas em um único forward pass.
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_MODELO, versao: str = None):
+        self.diretorio = diretorio
+        self.versao = versao or os.path.basename(os.path.normpath(diretorio))
+        # Carrega os nomes das features e o scaler, que foram salvos com joblib
+        self.feature_names = joblib.load(os.path.join(diretorio, ARQUIVO_FEATURES))
+        self.scaler = joblib.load(os.path.join(diretorio, ARQUIVO_SCALER))
+        # Instancia o modelo com o número correto de features de entrada e carrega os pesos
+        self.rede = AccessibilityNet(len(self.feature_names))
+        self.rede.load_state_dict(torch.load(os.path.join(diretorio, ARQUIVO_MODELO)))
+        # Modo de avaliação (importante para camadas como Dropout e BatchNorm)
+        self.rede.eval()
+
+    def prever(self, lista_features: list) -> list:
+        """
+        Predicts accessibility scores (0-100) for a batch of feature dicts.
+
+        :param lista_features: Feature dicts from the collector (extra keys are ignored, missing ones become 0).
+        :return: One integer score per dict, in order.
+        """
+        if not lista_features:
+            return []
+        X_tensor = self._tensor(lista_features)
+        # Prever sem gradientes; o trainer normalizou 'y' para 0-1
+        with torch.no_grad():
+            previsoes = self.rede(X_tensor).numpy().flatten() * 100
+        return [round(max(0, min(100, float(p)))) for p in previsoes]
+
+    def prever_com_incerteza(
+        self, lista_features: list, amostras: int = AMOSTRAS_MC
+    ) -> list:
+        """
+        Predicts scores together with an MC-dropout uncertainty estimate.
+
+        :param lista_features: Feature dicts, as in prever().
+        :param amostras: Stochastic forward passes per row.
+        :return: One (score, incerteza) tuple per dict: score as in prever(), incerteza the standard deviation of the sampled scores, in score points.
+
+        EN: Why? Triage needs to know when the static prediction can be trusted without a Chromium audit. How? Monte Carlo dropout over the network's own Dropout layers: the batch is repeated `amostras` times in a single forward pass with dropout sampled functionally (BatchNorm stays on its running statistics), so the shared model is never switched to train mode under other threads.
+        PT: Por quê? A triagem precisa saber quando a previsão estática é confiável sem uma auditoria no Chromium. Como? Monte Carlo dropout sobre as próprias camadas Dropout da rede: o lote é repetido `amostras` vezes em um único forward pass com dropout sorteado de forma funcional (o BatchNorm segue nas estatísticas acumuladas), então o modelo compartilhado nunca é posto em modo de treino sob outras threads.
+        """
+        if not lista_features:
+            return []
+        X_tensor = self._tensor(lista_features)
+        rede = self.rede
+        with torch.no_grad():
+            pontuais = rede(X_tensor).flatten() * 100
+            x = X_tensor.repeat(amostras, 1)
+            for linear, norma, dropout in (
+                (rede.fc1, rede.bn1, rede.dropout1),
+                (rede.fc2, rede.bn2, rede.dropout2),
+                (rede.fc3, rede.bn3, rede.dropout3),
+            ):
+                x = F.dropout(torch.relu(norma(linear(x))), dropout.p, training=True)
+            sorteadas = (rede.fc4(x) * 100).clamp(0, 100).view(amostras, -1)
+            incertezas = sorteadas.std(dim=0)
+        return [
+            (round(max(0, min(100, float(p)))), round(float(d), 2))
+            for p, d in zip(pontuais, incertezas)
+        ]
+
+    def validar(self) -> None:
+        """
+        Smoke inference: checks that the artifacts fit together and the network outputs finite values.
+
+        :raises ValueError: If the scaler and the feature list disagree, or the output is not finite.
+        """
+        esperadas = getattr(self.scaler, "n_features_in_", len(self.feature_names))
+        if esperadas != len(self.feature_names):
+            raise ValueError(
+                f"Scaler espera {esperadas} features, feature_names tem {len(self.feature_names)}"
+            )
+        # Uma linha zerada e uma com todas as features em 1, como páginas extremas
+        amostras = [
+            dict.fromkeys(self.feature_names, 0),
+            dict.fromkeys(self.feature_names, 1),
+        ]
+        with torch.no_grad():
+            saida = self.rede(self._tensor(amostras))
+        if not torch.isfinite(saida).all():
+            raise ValueError(
+                f"Saída não finita na inferência de teste: {saida.flatten()}"
+            )
+
+    def _tensor(self, lista_features: list) -> torch.Tensor:
+        # 1. Garantir que todas as features esperadas pelo modelo estejam presentes.
+        features_df = pd.DataFrame(lista_features)
+        features_df = features_df.reindex(columns=self.feature_names, fill_value=0)
+        features_df = features_df.fillna(0)
+        # 2. Aplicar as mesmas transformações do treinamento (log; o clipping não é salvo)
+        for feat in FEATURES_ASSIMETRICAS:
+            if feat in features_df.columns:
+                features_df[feat] = np.log1p(features_df[feat])
+        # 3. Escalonar e converter para um Tensor PyTorch
+        return torch.tensor(self.scaler.transform(features_df), dtype=torch.float32)
@@ -0,0 +1,263 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file defines the navigation policy for audited pages. Why? Waiting for "networkidle" on ad-heavy sites runs into the timeout and the retry. How? Playwright request routing aborts heavy resources and trackers, and a DOM-stability check replaces networkidle.
+# PT: Este arquivo define a política de navegação das páginas auditadas. Por quê? Esperar "networkidle" em sites cheios de anúncios esbarra no timeout e no retry. Como? O roteamento de requisições do Playwright aborta recursos pesados e rastreadores, e uma verificação de estabilidade do DOM substitui o networkidle.
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from utils.prazo import Prazo
+
+logger = logging.getLogger(__name__)
+
+# EN: Default blocked resource types and tracker hosts. Why? None of them changes what Axe checks (alt texts, labels, contrast come from DOM and CSS). How? Overridable by env vars.
+# PT: Tipos de recurso e hosts rastreadores bloqueados por padrão. Por quê? Nenhum deles muda o que o Axe verifica (alt, rótulos e contraste vêm do DOM e do CSS). Como? Sobrescrevíveis por variáveis de ambiente.
+TIPOS_BLOQUEADOS_PADRAO = [
+    t.strip()
+    for t in os.environ.get("PREVISIA_BLOQUEAR_TIPOS", "image,media,font").split(",")
+    if t.strip()
+]
+BLOQUEAR_RASTREADORES = os.environ.get("PREVISIA_BLOQUEAR_RASTREADORES", "1") == "1"
+HOSTS_RASTREADORES = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "facebook.net",
+    "hotjar.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "adnxs.com",
+    "rubiconproject.com",
+    "pubmatic.com",
+    "openx.net",
+    "moatads.com",
+    "chartbeat.com",
+    "newrelic.com",
+    "nr-data.net",
+    "clarity.ms",
+    "mixpanel.com",
+    "segment.io",
+]
+# EN: Typical transfer sizes per resource type (HTTP Archive medians, rounded). Why? An aborted request never gets a response, so its size cannot be measured; the carga_bytes_estimados column is this table's estimate, not a measurement.
+# PT: Tamanhos típicos de transferência por tipo de recurso (medianas do HTTP Archive, arredondadas). Por quê? Uma requisição abortada nunca recebe resposta, então seu tamanho não pode ser medido; a coluna carga_bytes_estimados é a estimativa desta tabela, não uma medição.
+BYTES_TIPICOS = {
+    "image": 15_000,
+    "media": 250_000,
+    "font": 25_000,
+    "script": 20_000,
+    "xhr": 2_000,
+    "fetch": 2_000,
+}
+BYTES_TIPICOS_OUTROS = 5_000
+ESTABILIDADE_MS = 1500  # Janela sem mutações no DOM para considerar a página pronta
+PRONTIDAO_MAX_MS = 15000  # Espera máxima pela estabilidade após o DOMContentLoaded
+TIMEOUT_NAVEGACAO_MS = 60000
+
+# EN: Resolves once the DOM has had no mutations for `quietMs`, or when `maxMs` is exceeded.
+# PT: Resolve quando o DOM passa `quietMs` sem mutações, ou quando `maxMs` é excedido.
+_JS_ESPERA_DOM_ESTAVEL = """
+([quietMs, maxMs]) => new Promise(resolve => {
+    const inicio = performance.now();
+    let ultimo = inicio;
+    const obs = new MutationObserver(() => { ultimo = performance.now(); });
+    obs.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    const checar = () => {
+        const agora = performance.now();
+        if (agora - ultimo >= quietMs) { obs.disconnect(); resolve("dom_estavel"); }
+        else if (agora - inicio >= maxMs) { obs.disconnect(); resolve("tempo_maximo"); }
+        else { setTimeout(checar, 100); }
+    };
+    setTimeout(checar, 100);
+})
+"""
+
+
+class PoliticaNavegacao:
+    """
+    Resource blocking and load-readiness policy for one audited page.
+
+    EN: Why? Separates "what to download and when the page is ready" from the audit itself. How? instalar() registers a route handler on the page; navegar() opens the URL and waits for DOM stability, returning the carga_* columns. Counters are per instance, so use one instance per page.
+    PT: Por quê? Separa "o que baixar e quando a página está pronta" da auditoria em si. Como? instalar() registra um handler de rota na página; navegar() abre a URL e espera a estabilidade do DOM, retornando as colunas carga_*. Os contadores são por instância, então use uma instância por página.
+    """
+
+    def __init__(
+        self,
+        tipos_bloqueados=None,
+        hosts_bloqueados=None,
+        estabilidade_ms: int = ESTABILIDADE_MS,
+        prontidao_max_ms: int = PRONTIDAO_MAX_MS,
+        timeout_navegacao_ms: int = TIMEOUT_NAVEGACAO_MS,
+    ):
+        self.tipos_bloqueados = set(
+            TIPOS_BLOQUEADOS_PADRAO if tipos_bloqueados is None else tipos_bloqueados
+        )
+        if hosts_bloqueados is None:
+            hosts_bloqueados = HOSTS_RASTREADORES if BLOQUEAR_RASTREADORES else []
+        self.hosts_bloqueados = list(hosts_bloqueados)
+        self.estabilidade_ms = estabilidade_ms
+        self.prontidao_max_ms = prontidao_max_ms
+        self.timeout_navegacao_ms = timeout_navegacao_ms
+        self._lock = threading.Lock()
+        self._bloqueadas = 0
+        self._bytes_estimados = 0
+        # Resposta do documento principal da última navegação (HTML cru, antes do JS)
+        self.resposta_documento = None
+
+    def _eh_rastreador(self, url: str) -> bool:
+        netloc = (urlparse(url).hostname or "").lower()
+        return any(
+            netloc == host or netloc.endswith("." + host)
+            for host in self.hosts_bloqueados
+        )
+
+    def deve_bloquear(self, tipo_recurso: str, url: str) -> bool:
+        """
+        Decides whether a request is aborted.
+
+        :param tipo_recurso: Playwright resource type (image, font, script...).
+        :param url: Request URL.
+        :return: True to abort.
+        """
+        return tipo_recurso in self.tipos_bloqueados or (
+            bool(self.hosts_bloqueados) and self._eh_rastreador(url)
+        )
+
+    def _contar_bloqueio(self, requisicao) -> bool:
+        # Decide e contabiliza; compartilhado pelos handlers síncrono e assíncrono
+        if requisicao.is_navigation_request() or not self.deve_bloquear(
+            requisicao.resource_type, requisicao.url
+        ):
+            return False
+        with self._lock:
+            self._bloqueadas += 1
+            self._bytes_estimados += BYTES_TIPICOS.get(
+                requisicao.resource_type, BYTES_TIPICOS_OUTROS
+            )
+        return True
+
+    # fallback() em vez de continue_(): sem outro handler vai à rede; com rotas de contexto
+    # (ex.: reprodução de HAR em utils.rede_gravada), deixa que elas respondam
+    def _rotear(self, route) -> None:
+        if self._contar_bloqueio(route.request):
+            route.abort()
+        else:
+            route.fallback()
+
+    async def _rotear_async(self, route) -> None:
+        if self._contar_bloqueio(route.request):
+            await route.abort()
+        else:
+            await route.fallback()
+
+    def instalar(self, page) -> None:
+        """
+        Registers the routing handler on a page (or browser context).
+
+        :param page: Playwright Page or BrowserContext.
+        """
+        if self.tipos_bloqueados or self.hosts_bloqueados:
+            page.route("**/*", self._rotear)
+
+    def navegar(self, page, url: str, prazo: Prazo = None) -> dict:
+        """
+        Opens the URL and waits until the DOM is stable.
+
+        :param page: Playwright Page with this policy installed.
+        :param url: URL to open.
+        :param prazo: Deadline of the analysis; caps the goto timeout and the readiness wait.
+        :return: Dictionary of carga_* columns (blocking policy, stop reason, blocked requests, bytes saved as estimated from BYTES_TIPICOS, readiness time). The main document response is kept in resposta_documento.
+        :raises utils.prazo.PrazoEsgotado: If the deadline has run out before navigating.
+
+        EN: Why? networkidle never comes on pages with polling ads or analytics. How? goto waits for DOMContentLoaded, then a MutationObserver waits for a quiet window, capped by prontidao_max_ms and by half of the remaining deadline (the other half is left for the audit).
+        PT: Por quê? O networkidle nunca chega em páginas com anúncios ou analytics fazendo polling. Como? O goto espera o DOMContentLoaded e depois um MutationObserver espera uma janela sem mutações, limitada por prontidao_max_ms e pela metade do prazo restante (a outra metade fica para a auditoria).
+        """
+        inicio = time.perf_counter()
+        self.resposta_documento = page.goto(
+            url, wait_until="domcontentloaded", timeout=self._timeout_goto(prazo)
+        )
+        try:
+            motivo = page.evaluate(
+                _JS_ESPERA_DOM_ESTAVEL, [self.estabilidade_ms, self._prontidao(prazo)]
+            )
+        except Exception as e:
+            motivo = self._motivo_interrompido(url, e)
+        return self._colunas_carga(url, motivo, inicio)
+
+    async def instalar_async(self, page) -> None:
+        """
+        instalar() for the asyncio Playwright API (playwright.async_api).
+        """
+        if self.tipos_bloqueados or self.hosts_bloqueados:
+            await page.route("**/*", self._rotear_async)
+
+    async def navegar_async(self, page, url: str, prazo: Prazo = None) -> dict:
+        """
+        navegar() for the asyncio Playwright API; same waits, deadline and carga_* columns.
+        """
+        inicio = time.perf_counter()
+        self.resposta_documento = await page.goto(
+            url, wait_until="domcontentloaded", timeout=self._timeout_goto(prazo)
+        )
+        try:
+            motivo = await page.evaluate(
+                _JS_ESPERA_DOM_ESTAVEL, [self.estabilidade_ms, self._prontidao(prazo)]
+            )
+        except Exception as e:
+            motivo = self._motivo_interrompido(url, e)
+        return self._colunas_carga(url, motivo, inicio)
+
+    def _timeout_goto(self, prazo: Prazo | None) -> int:
+        if prazo is None:
+            return self.timeout_navegacao_ms
+        return prazo.limitar_ms(self.timeout_navegacao_ms, "navegacao")
+
+    def _prontidao(self, prazo: Prazo | None) -> int:
+        # A espera pela estabilidade é opcional: sem tempo, audita o DOM como está
+        if prazo is None:
+            return self.prontidao_max_ms
+        return int(min(self.prontidao_max_ms, prazo.restante() * 1000 / 2))
+
+    def _motivo_interrompido(self, url: str, erro: Exception) -> str:
+        # Navegações tardias (redirect via JS) destroem o contexto de execução
+        logger.info(
+            "DOM stability check interrupted",
+            extra={"dados": {"url": url, "details": str(erro)}},
+        )
+        return "contexto_reiniciado"
+
+    def descricao_bloqueio(self) -> str:
+        """
+        The blocking policy as a dataset value: sorted blocked types, "+rastreadores" when tracker hosts are blocked, "nenhum" when nothing is.
+
+        EN: Why? Blocking images, media or fonts changes some Axe results (e.g. image-alt, contrast over images), so rows audited under different policies must be told apart. How? Stored in every row as carga_bloqueio.
+        PT: Por quê? Bloquear imagens, mídia ou fontes muda alguns resultados do Axe (ex.: image-alt, contraste sobre imagens), então linhas auditadas sob políticas diferentes precisam ser distinguíveis. Como? Gravada em toda linha como carga_bloqueio.
+        """
+        partes = (
+            [",".join(sorted(self.tipos_bloqueados))] if self.tipos_bloqueados else []
+        )
+        if self.hosts_bloqueados:
+            partes.append("rastreadores")
+        return "+".join(partes) or "nenhum"
+
+    def _colunas_carga(self, url: str, motivo: str, inicio: float) -> dict:
+        with self._lock:
+            colunas = {
+                "carga_bloqueio": self.descricao_bloqueio(),
+                "carga_motivo_parada": motivo,
+                "carga_reqs_bloqueadas": self._bloqueadas,
+                "carga_bytes_estimados": self._bytes_estimados,
+                "carga_duracao_s": round(time.perf_counter() - inicio, 3),
+            }
+        logger.info("Page ready", extra={"dados": {"url": url, **colunas}})
+        return colunas
@@ -0,0 +1,198 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements opt-in profiling for requests and collection runs. Why? When /predict or a collection slows down there was no way to see where the time or memory goes. How? cProfile or a stack-sampling profiler plus tracemalloc snapshots around selected calls, written to a size-capped artifacts directory; disabled, it costs one boolean check.
+# PT: Este arquivo implementa perfilamento opcional para requisições e coletas. Por quê? Quando o /predict ou uma coleta ficava lenta não havia como ver para onde iam o tempo ou a memória. Como? cProfile ou um perfilador por amostragem de pilhas mais snapshots do tracemalloc em torno de chamadas selecionadas, gravados em um diretório de artefatos com limite de tamanho; desativado, custa uma checagem booleana.
+import cProfile
+import collections
+import glob
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# EN: Profiling settings. Why? Everything is off unless PREVISIA_PROFILE is set. How? "1" profiles every /predict; a PREVISIA_PROFILE_TOKEN lets single requests opt in via the X-PrevisIA-Profile header; collections use --perfilar N (or PREVISIA_PROFILE_A_CADA).
+# PT: Configuração do perfilamento. Por quê? Tudo fica desligado sem PREVISIA_PROFILE. Como? "1" perfila todo /predict; um PREVISIA_PROFILE_TOKEN permite que requisições isoladas peçam perfil pelo cabeçalho X-PrevisIA-Profile; coletas usam --perfilar N (ou PREVISIA_PROFILE_A_CADA).
+PERFILAR_TUDO = os.environ.get("PREVISIA_PROFILE", "") == "1"
+TOKEN_PERFIL = os.environ.get("PREVISIA_PROFILE_TOKEN", "")
+CABECALHO_PERFIL = "X-PrevisIA-Profile"
+PERFIL_HABILITADO = PERFILAR_TUDO or bool(TOKEN_PERFIL)
+PERFILAR_A_CADA = int(os.environ.get("PREVISIA_PROFILE_A_CADA", 0))
+MODO_PERFIL = os.environ.get("PREVISIA_PROFILE_MODO", "cprofile")  # ou "amostragem"
+PERFILAR_MEMORIA = os.environ.get("PREVISIA_PROFILE_MEMORIA", "0") == "1"
+DIRETORIO_PERFIS = os.environ.get("PREVISIA_PROFILE_DIR", "perfis")
+MAX_MB_PERFIS = float(os.environ.get("PREVISIA_PROFILE_MAX_MB", 50))
+MAX_BYTES_PERFIS = int(MAX_MB_PERFIS * 1024 * 1024)
+INTERVALO_AMOSTRAGEM_S = 0.005
+TOP_MEMORIA = 30
+
+
+def requisicao_pede_perfil(cabecalhos) -> bool:
+    """
+    Decides whether a web request is profiled.
+
+    :param cabecalhos: Request headers (Mapping).
+    :return: True if PREVISIA_PROFILE=1 or the header carries PREVISIA_PROFILE_TOKEN.
+    """
+    if PERFILAR_TUDO:
+        return True
+    # O token impede que qualquer cliente ligue o perfilamento (custo alto por requisição)
+    return bool(TOKEN_PERFIL) and cabecalhos.get(CABECALHO_PERFIL) == TOKEN_PERFIL
+
+
+def _sem_perfilador(snapshot):
+    # As alocações do próprio perfilador (cProfile, tracemalloc, este módulo) não interessam
+    return snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+
+
+class _Amostrador(threading.Thread):
+    # Amostra a pilha de uma thread em intervalos fixos e conta pilhas "colapsadas"
+    def __init__(self, id_thread: int, intervalo_s: float):
+        super().__init__(name="perfil-amostrador", daemon=True)
+        self.id_thread = id_thread
+        self.intervalo_s = intervalo_s
+        self.contagens = collections.Counter()
+        self._parar = threading.Event()
+
+    def run(self) -> None:
+        while not self._parar.wait(self.intervalo_s):
+            frame = sys._current_frames().get(self.id_thread)
+            pilha = []
+            while frame is not None:
+                codigo = frame.f_code
+                pilha.append(
+                    f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if pilha:
+                self.contagens[";".join(reversed(pilha))] += 1
+
+    def parar(self) -> None:
+        self._parar.set()
+        self.join()
+
+
+class Perfilador:
+    """
+    Profiles selected calls and writes the artifacts to a size-capped directory.
+
+    :param diretorio: Artifacts directory.
+    :param max_bytes: Directory size cap; oldest artifacts are deleted first.
+    :param modo: "cprofile" (deterministic, .prof for pstats/snakeviz) or "amostragem" (stack sampling, collapsed stacks for flame graphs).
+    :param memoria: Also diff tracemalloc snapshots taken before and after the call.
+
+    EN: Why? Where time goes differs between a web request (parsing, model) and an audit (Chromium waits). How? One profiled call at a time per process (cProfile cannot nest across threads on recent Pythons); concurrent calls run unprofiled instead of waiting.
+    PT: Por quê? Para onde vai o tempo difere entre uma requisição web (parsing, modelo) e uma auditoria (esperas do Chromium). Como? Uma chamada perfilada por vez por processo (o cProfile não aninha entre threads nos Pythons recentes); chamadas concorrentes rodam sem perfil em vez de esperar.
+    """
+
+    def __init__(
+        self,
+        diretorio: str = DIRETORIO_PERFIS,
+        max_bytes: int = MAX_BYTES_PERFIS,
+        modo: str = MODO_PERFIL,
+        memoria: bool = PERFILAR_MEMORIA,
+    ):
+        if modo not in ("cprofile", "amostragem"):
+            raise ValueError(f"Modo de perfil desconhecido: {modo}")
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self.modo = modo
+        self.memoria = memoria
+        self._lock = threading.Lock()
+
+    def _caminho_base(self, nome: str) -> str:
+        os.makedirs(self.diretorio, exist_ok=True)
+        seguro = re.sub(r"[^\w.-]+", "_", nome)[:80]
+        return os.path.join(
+            self.diretorio, f"{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{seguro}"
+        )
+
+    def _aplicar_limite(self) -> None:
+        arquivos = [
+            (os.path.getmtime(c), os.path.getsize(c), c)
+            for c in glob.glob(os.path.join(self.diretorio, "*"))
+            if os.path.isfile(c)
+        ]
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass  # Outro processo já removeu
+
+    @contextmanager
+    def perfilar(self, nome: str):
+        """
+        Profiles the enclosed block (in the calling thread).
+
+        :param nome: Label used in the artifact file names (e.g. the route or URL).
+        """
+        if not self._lock.acquire(blocking=False):
+            yield
+            return
+        try:
+            iniciou_tracemalloc = False
+            if self.memoria:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(10)
+                    iniciou_tracemalloc = True
+                antes = tracemalloc.take_snapshot()
+            if self.modo == "cprofile":
+                perfil = cProfile.Profile()
+                perfil.enable()
+            else:
+                amostrador = _Amostrador(threading.get_ident(), INTERVALO_AMOSTRAGEM_S)
+                amostrador.start()
+            inicio = time.perf_counter()
+            try:
+                yield
+            finally:
+                duracao = time.perf_counter() - inicio
+                if self.modo == "cprofile":
+                    perfil.disable()
+                else:
+                    amostrador.parar()
+                base = self._caminho_base(nome)
+                if self.modo == "cprofile":
+                    perfil.dump_stats(base + ".prof")
+                else:
+                    with open(base + ".amostras.txt", "w", encoding="utf-8") as f:
+                        for pilha, contagem in amostrador.contagens.most_common():
+                            f.write(f"{pilha} {contagem}\n")
+                if self.memoria:
+                    depois = tracemalloc.take_snapshot()
+                    if iniciou_tracemalloc:
+                        tracemalloc.stop()
+                    with open(base + ".memoria.txt", "w", encoding="utf-8") as f:
+                        for estatistica in _sem_perfilador(depois).compare_to(
+                            _sem_perfilador(antes), "lineno"
+                        )[:TOP_MEMORIA]:
+                            f.write(f"{estatistica}\n")
+                self._aplicar_limite()
+                logger.info(
+                    "Profile written",
+                    extra={"dados": {"nome": nome, "base": base, "duracao_s": duracao}},
+                )
+        finally:
+            self._lock.release()
+
+    def executar(self, nome: str, funcao, *args, **kwargs):
+        """
+        Runs funcao(*args, **kwargs) under perfilar(nome) and returns its result.
+        """
+        with self.perfilar(nome):
+            return funcao(*args, **kwargs)
@@ -0,0 +1,84 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements the end-to-end deadline of one analysis. Why? Fixed per-step timeouts (30 s download, 180 s page, 60 s body, retries) added up to far more than any client waits. How? The entry point creates a Prazo and passes it down; each step caps its own timeout at the remaining budget and stops with PrazoEsgotado when it runs out, so the caller can return what was already computed.
+# PT: Este arquivo implementa o prazo ponta a ponta de uma análise. Por quê? Timeouts fixos por etapa (30 s de download, 180 s de página, 60 s de body, retries) somavam muito mais do que qualquer cliente espera. Como? O ponto de entrada cria um Prazo e o repassa; cada etapa limita seu próprio timeout ao orçamento restante e para com PrazoEsgotado quando ele acaba, para que quem chamou devolva o que já foi calculado.
+import math
+import os
+import time
+
+# EN: Default budgets per entry point, in seconds (0 = no deadline). Why? A web client, a collection task and a batch CLI tolerate different waits. How? Overridable by env vars; the full-analysis budget starts when the job is submitted, so it includes the queue wait.
+# PT: Orçamentos padrão por ponto de entrada, em segundos (0 = sem prazo). Por quê? Um cliente web, uma tarefa de coleta e uma CLI em lote toleram esperas diferentes. Como? Sobrescrevíveis por variáveis de ambiente; o orçamento da análise completa começa quando o job é submetido, então inclui a espera na fila.
+PRAZO_RAPIDA_S = float(os.environ.get("PREVISIA_PRAZO_RAPIDA_S", 30))
+PRAZO_COMPLETA_S = float(os.environ.get("PREVISIA_PRAZO_COMPLETA_S", 240))
+PRAZO_AUDITORIA_S = float(os.environ.get("PREVISIA_PRAZO_AUDITORIA_S", 300))
+MINIMO_ETAPA_S = 0.5  # Abaixo disso, começar uma etapa só geraria um timeout
+
+
+class PrazoEsgotado(Exception):
+    """
+    Raised when the deadline runs out; etapa names the step that was cut ("download", "navegacao", "axe"...).
+    """
+
+    def __init__(self, etapa: str):
+        super().__init__(f"Prazo esgotado em {etapa}")
+        self.etapa = etapa
+
+
+class Prazo:
+    """
+    Absolute deadline shared by every step of one analysis.
+
+    :param segundos: Budget from now (None or <= 0 = no deadline).
+
+    EN: Why? Timeouts must shrink as earlier steps consume time, including retries. How? Stores a time.monotonic() instant; limitar()/limitar_ms() turn a step's usual timeout into min(usual, remaining) and raise PrazoEsgotado if less than MINIMO_ETAPA_S is left. Immutable after creation, so it can be shared across threads.
+    PT: Por quê? Os timeouts precisam encolher conforme as etapas anteriores consomem tempo, inclusive retries. Como? Guarda um instante de time.monotonic(); limitar()/limitar_ms() transformam o timeout usual de uma etapa em min(usual, restante) e levantam PrazoEsgotado se restar menos que MINIMO_ETAPA_S. Imutável após a criação, então pode ser compartilhado entre threads.
+    """
+
+    def __init__(self, segundos: float = None):
+        self.segundos = segundos if segundos and segundos > 0 else None
+        self._fim = (
+            time.monotonic() + self.segundos if self.segundos is not None else math.inf
+        )
+
+    def restante(self) -> float:
+        """
+        Seconds left (math.inf without a deadline, never negative).
+        """
+        return max(self._fim - time.monotonic(), 0.0)
+
+    def esgotado(self) -> bool:
+        return self.restante() < MINIMO_ETAPA_S
+
+    def verificar(self, etapa: str) -> None:
+        """
+        Raises PrazoEsgotado(etapa) if the step cannot start any more.
+        """
+        if self.esgotado():
+            raise PrazoEsgotado(etapa)
+
+    def limitar(self, padrao_s: float, etapa: str) -> float:
+        """
+        Timeout for a step, in seconds.
+
+        :param padrao_s: The step's usual timeout.
+        :param etapa: Step name used if the deadline has already run out.
+        :return: min(padrao_s, remaining).
+        :raises PrazoEsgotado: If less than MINIMO_ETAPA_S is left.
+        """
+        self.verificar(etapa)
+        return min(padrao_s, self.restante())
+
+    def limitar_ms(self, padrao_ms: float, etapa: str) -> int | float:
+        """
+        limitar() in whole milliseconds, as Playwright expects.
+
+        :return: An int, or padrao_ms itself when both it and the remaining time are infinite (no deadline and no usual timeout).
+        """
+        limite_s = self.limitar(padrao_ms / 1000, etapa)
+        # int(inf) levanta OverflowError: sem prazo e sem timeout usual, devolve o padrão
+        return padrao_ms if math.isinf(limite_s) else int(limite_s * 1000)
+
+    def __repr__(self) -> str:
+        if self.segundos is None:
+            return "Prazo(sem limite)"
+        return f"Prazo({self.restante():.1f}s de {self.segundos:g}s)"
@@ -0,0 +1,87 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file records and replays the network traffic of audited pages as HAR archives. Why? The Playwright/Axe path could only be measured against live sites, so its timings were noisy and needed network access. How? Record mode passes record_har_path to the browser context (one archive per URL); replay mode serves that archive through BrowserContext.route_from_har and aborts anything not recorded, so audits run offline and reproducibly.
+# PT: Este arquivo grava e reproduz o tráfego de rede das páginas auditadas como arquivos HAR. Por quê? O caminho Playwright/Axe só podia ser medido contra sites ao vivo, então os tempos eram ruidosos e exigiam rede. Como? O modo de gravação passa record_har_path ao contexto do navegador (um arquivo por URL); o modo de reprodução serve esse arquivo via BrowserContext.route_from_har e aborta o que não foi gravado, então as auditorias rodam offline e de forma reprodutível.
+import hashlib
+import os
+
+from utils.validate_url import normalizar_url
+
+# EN: Fixture settings. Why? Any entry point (orchestrator, app, benchmark) can record or replay without code changes. How? PREVISIA_REDE_MODO is "gravar" or "reproduzir" (empty = live network); archives live in PREVISIA_REDE_DIR.
+# PT: Configuração das fixtures. Por quê? Qualquer ponto de entrada (orquestrador, app, bancada) pode gravar ou reproduzir sem mudar código. Como? PREVISIA_REDE_MODO é "gravar" ou "reproduzir" (vazio = rede ao vivo); os arquivos ficam em PREVISIA_REDE_DIR.
+GRAVAR = "gravar"
+REPRODUZIR = "reproduzir"
+MODO_REDE = os.environ.get("PREVISIA_REDE_MODO", "")
+DIRETORIO_HAR = os.environ.get("PREVISIA_REDE_DIR", "data/har")
+
+
+class RedeGravada:
+    """
+    Network fixtures of one directory, in record or replay mode.
+
+    :param modo: GRAVAR or REPRODUZIR.
+    :param diretorio: Directory of the HAR archives (created when recording).
+    :raises ValueError: If the mode is unknown.
+
+    EN: Why? Benchmarks of audits, resource blocking or the browser engine need the same bytes on every run. How? Archives are zip HARs (bodies attached) named by a hash of the normalized URL; opcoes_contexto() goes into browser.new_context() and instalar() routes the context from the archive. Page-level routes (PoliticaNavegacao) run first and fall back to the archive, so blocking still decides what is aborted. Record with blocking disabled to keep every resource in the archive.
+    PT: Por quê? Medições de auditorias, do bloqueio de recursos ou do motor do navegador precisam dos mesmos bytes em toda execução. Como? Os arquivos são HARs zip (corpos anexados) nomeados por um hash da URL normalizada; opcoes_contexto() vai para o browser.new_context() e instalar() roteia o contexto a partir do arquivo. As rotas da página (PoliticaNavegacao) rodam antes e recorrem ao arquivo, então o bloqueio continua decidindo o que é abortado. Grave com o bloqueio desligado para manter todos os recursos no arquivo.
+    """
+
+    def __init__(self, modo: str, diretorio: str = DIRETORIO_HAR):
+        if modo not in (GRAVAR, REPRODUZIR):
+            raise ValueError(
+                f"Modo de rede desconhecido: {modo!r}. Use {GRAVAR!r} ou {REPRODUZIR!r}."
+            )
+        self.modo = modo
+        self.diretorio = diretorio
+
+    def caminho(self, url: str) -> str:
+        """
+        Archive path of a URL (same file for its normalized variants).
+        """
+        resumo = hashlib.sha256(normalizar_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.diretorio, f"{resumo[:20]}.har.zip")
+
+    def opcoes_contexto(self, url: str) -> dict:
+        """
+        Keyword arguments for browser.new_context(); the archive is written when the context closes.
+        """
+        if self.modo != GRAVAR:
+            return {}
+        os.makedirs(self.diretorio, exist_ok=True)
+        return {"record_har_path": self.caminho(url), "record_har_mode": "minimal"}
+
+    def _arquivo_reproducao(self, url: str) -> str | None:
+        if self.modo != REPRODUZIR:
+            return None
+        caminho = self.caminho(url)
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"Sem gravação de rede para {url}: {caminho}")
+        return caminho
+
+    def instalar(self, contexto, url: str) -> None:
+        """
+        Serves the context's requests from the URL's archive (replay mode only).
+
+        :param contexto: Playwright BrowserContext.
+        :param url: URL the archive was recorded for.
+        :raises FileNotFoundError: If the URL was never recorded.
+        """
+        caminho = self._arquivo_reproducao(url)
+        if caminho is not None:
+            contexto.route_from_har(caminho, not_found="abort")
+
+    async def instalar_async(self, contexto, url: str) -> None:
+        """
+        instalar() for the asyncio Playwright API.
+        """
+        caminho = self._arquivo_reproducao(url)
+        if caminho is not None:
+            await contexto.route_from_har(caminho, not_found="abort")
+
+
+def rede_padrao() -> RedeGravada | None:
+    """
+    Fixtures configured by PREVISIA_REDE_MODO / PREVISIA_REDE_DIR (None = live network).
+    """
+    return RedeGravada(MODO_REDE, DIRETORIO_HAR) if MODO_REDE else None
@@ -0,0 +1,232 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements the hot-reloading model registry. Why? The app loaded models/ once at import, so deploying a retrained model meant restarting every worker and dropping in-flight analyses. How? A background thread watches models/ for versioned artifact sets (one subdirectory per version), validates the newest with a smoke inference and swaps it in with a single reference assignment; callers pin the model they got, so in-flight work finishes on the old version.
+# PT: Este arquivo implementa o registro de modelos com recarga a quente. Por quê? O app carregava models/ uma vez no import, então publicar um modelo retreinado exigia reiniciar todos os workers e descartar análises em andamento. Como? Uma thread em segundo plano observa models/ em busca de conjuntos de artefatos versionados (um subdiretório por versão), valida o mais novo com uma inferência de teste e o troca com uma única atribuição de referência; quem chama fixa o modelo que recebeu, então o trabalho em andamento termina na versão antiga.
+import collections
+import logging
+import os
+import shutil
+import threading
+import time
+
+from utils.modelo import (
+    ARQUIVO_FEATURES,
+    ARQUIVO_MODELO,
+    ARQUIVO_SCALER,
+    DIRETORIO_MODELO,
+    ModeloAcessibilidade,
+)
+
+logger = logging.getLogger(__name__)
+
+# EN: Registry settings. Why? Polling needs no extra dependency and works on any filesystem. How? Versions are subdirectories of models/ holding the three artifacts, ordered by name (use sortable names such as AAAAMMDD-HHMMSS); the flat files in models/ itself are the "base" version, used only when nothing else is loaded.
+# PT: Configuração do registro. Por quê? A verificação periódica não exige dependência extra e funciona em qualquer sistema de arquivos. Como? Versões são subdiretórios de models/ com os três artefatos, ordenados pelo nome (use nomes ordenáveis como AAAAMMDD-HHMMSS); os arquivos soltos em models/ são a versão "base", usada só quando nada mais está carregado.
+INTERVALO_VERIFICACAO_S = float(os.environ.get("PREVISIA_MODELOS_INTERVALO_S", 30))
+VERSAO_BASE = "base"
+ARTEFATOS = (ARQUIVO_MODELO, ARQUIVO_SCALER, ARQUIVO_FEATURES)
+MAX_TROCAS_HISTORICO = 20
+
+
+def _completo(caminho: str) -> bool:
+    return all(os.path.isfile(os.path.join(caminho, a)) for a in ARTEFATOS)
+
+
+def _assinatura(caminho: str) -> tuple:
+    # Tamanho e mtime de cada artefato: muda se a versão for republicada
+    return tuple(
+        (
+            os.stat(os.path.join(caminho, a)).st_mtime_ns,
+            os.path.getsize(os.path.join(caminho, a)),
+        )
+        for a in ARTEFATOS
+    )
+
+
+def listar_versoes(diretorio: str = DIRETORIO_MODELO) -> list:
+    """
+    Complete artifact sets found in the models directory, oldest first.
+
+    :param diretorio: Models directory.
+    :return: List of (version, path); "base" (the flat files) first, then subdirectories by name. Hidden names (publication in progress) are skipped.
+    """
+    versoes = [(VERSAO_BASE, diretorio)] if _completo(diretorio) else []
+    try:
+        entradas = sorted(os.scandir(diretorio), key=lambda e: e.name)
+    except FileNotFoundError:
+        return versoes
+    for entrada in entradas:
+        if (
+            entrada.is_dir()
+            and not entrada.name.startswith(".")
+            and _completo(entrada.path)
+        ):
+            versoes.append((entrada.name, entrada.path))
+    return versoes
+
+
+def publicar_versao(
+    origem: str, diretorio: str = DIRETORIO_MODELO, versao: str = None
+) -> str:
+    """
+    Copies an artifact set into a new version directory, atomically.
+
+    :param origem: Directory holding the three artifacts (e.g. the trainer's output).
+    :param diretorio: Models directory watched by the registry.
+    :param versao: Version name (default: current time as AAAAMMDD-HHMMSS, so it sorts last).
+    :return: Path of the published version.
+    :raises FileExistsError: If the version already exists.
+
+    EN: Why? A watcher must never see half-copied artifacts. How? Copies into a hidden temporary directory, then renames it (atomic on the same filesystem).
+    PT: Por quê? O observador nunca pode ver artefatos copiados pela metade. Como? Copia para um diretório temporário oculto e depois o renomeia (atômico no mesmo sistema de arquivos).
+    """
+    versao = versao or time.strftime("%Y%m%d-%H%M%S")
+    destino = os.path.join(diretorio, versao)
+    if os.path.exists(destino):
+        raise FileExistsError(f"Versão já existe: {destino}")
+    temporario = os.path.join(diretorio, f".publicando-{versao}-{os.getpid()}")
+    os.makedirs(temporario)
+    try:
+        for artefato in ARTEFATOS:
+            shutil.copy2(os.path.join(origem, artefato), temporario)
+        os.rename(temporario, destino)
+    finally:
+        if os.path.exists(temporario):
+            shutil.rmtree(temporario)
+    return destino
+
+
+class RegistroModelos:
+    """
+    Holds the active model and swaps in newer validated versions from the models directory.
+
+    :param diretorio: Models directory.
+    :param intervalo_s: Seconds between directory scans of the background watcher.
+
+    EN: Why? Retrained models must go live without a restart, and a broken artifact set must never replace a working one. How? verificar() loads the newest version not yet tried, runs ModeloAcessibilidade.validar() and only then replaces the active reference; rejected sets are remembered by file signature until they change. atual() returns the active model: keep that object for the whole request or job.
+    PT: Por quê? Modelos retreinados precisam entrar no ar sem reinício, e um conjunto de artefatos quebrado nunca pode substituir um que funciona. Como? verificar() carrega a versão mais nova ainda não tentada, roda ModeloAcessibilidade.validar() e só então substitui a referência ativa; conjuntos rejeitados são lembrados pela assinatura dos arquivos até mudarem. atual() devolve o modelo ativo: guarde esse objeto durante toda a requisição ou job.
+    """
+
+    def __init__(
+        self,
+        diretorio: str = DIRETORIO_MODELO,
+        intervalo_s: float = INTERVALO_VERIFICACAO_S,
+    ):
+        self.diretorio = diretorio
+        self.intervalo_s = intervalo_s
+        self._ativo = None
+        self._assinatura_ativa = None
+        self._carregado_em = None
+        self._rejeitadas = {}  # versão -> (assinatura, erro)
+        self._trocas = collections.deque(maxlen=MAX_TROCAS_HISTORICO)
+        self._previsoes = collections.Counter()
+        self._lock = threading.Lock()  # Só a troca, o histórico e os contadores
+        self._lock_verificacao = threading.Lock()  # Uma varredura por vez
+        self._parar = threading.Event()
+        self._thread = None
+
+    def atual(self) -> ModeloAcessibilidade | None:
+        """
+        The active model (None if no valid version was found).
+        """
+        return self._ativo
+
+    @property
+    def versao(self) -> str | None:
+        ativo = self._ativo
+        return ativo.versao if ativo is not None else None
+
+    def contar_previsao(self, versao: str) -> None:
+        """
+        Counts one prediction served by a version (for metricas()).
+        """
+        with self._lock:
+            self._previsoes[versao] += 1
+
+    def verificar(self) -> bool:
+        """
+        Scans the directory once and activates the newest valid version, if it is not the active one.
+
+        :return: True if the active model changed.
+
+        EN: Why? Loading and validating a version takes seconds (torch.load plus a smoke inference), and predictions count themselves under self._lock. How? Candidates are loaded and validated holding only the scan lock; self._lock is taken just for the reference swap and the bookkeeping, so predictions never wait for a reload.
+        PT: Por quê? Carregar e validar uma versão leva segundos (torch.load mais uma inferência de teste), e as previsões se contam sob self._lock. Como? Os candidatos são carregados e validados segurando só o lock da varredura; self._lock é tomado apenas para a troca da referência e a contabilidade, então as previsões nunca esperam uma recarga.
+        """
+        with self._lock_verificacao:
+            ativa = self.versao
+            for versao, caminho in reversed(listar_versoes(self.diretorio)):
+                try:
+                    assinatura = _assinatura(caminho)
+                except FileNotFoundError:
+                    continue  # Removida durante a varredura
+                if versao == ativa and (
+                    versao == VERSAO_BASE or assinatura == self._assinatura_ativa
+                ):
+                    return False
+                # A base é reescrita no lugar pelo trainer: só serve enquanto nada está carregado
+                if versao == VERSAO_BASE and ativa is not None:
+                    return False
+                rejeitada = self._rejeitadas.get(versao)
+                if rejeitada is not None and rejeitada[0] == assinatura:
+                    continue
+                try:
+                    candidato = ModeloAcessibilidade(caminho, versao=versao)
+                    candidato.validar()
+                except Exception as e:
+                    with self._lock:
+                        self._rejeitadas[versao] = (assinatura, str(e))
+                    logger.error(
+                        "Model version rejected",
+                        extra={"dados": {"versao": versao, "details": str(e)}},
+                    )
+                    continue
+                # Troca atômica: uma atribuição; quem já tem o modelo antigo termina com ele
+                with self._lock:
+                    self._ativo = candidato
+                    self._assinatura_ativa = assinatura
+                    self._carregado_em = time.time()
+                    self._rejeitadas.pop(versao, None)
+                    self._trocas.append(
+                        {"de": ativa, "para": versao, "em": self._carregado_em}
+                    )
+                logger.warning(
+                    "Model version activated",
+                    extra={"dados": {"de": ativa, "para": versao}},
+                )
+                return True
+            return False
+
+    def iniciar(self) -> None:
+        """
+        Starts the background watcher (daemon thread).
+        """
+        if self._thread is None and self.intervalo_s > 0:
+            self._thread = threading.Thread(
+                target=self._loop, name="registro-modelos", daemon=True
+            )
+            self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._parar.wait(self.intervalo_s):
+            try:
+                self.verificar()
+            except Exception as e:
+                # O observador nunca pode morrer: o app segue com o modelo ativo
+                logger.error("Model registry scan failed: %s", e)
+
+    def metricas(self) -> dict:
+        """
+        Active version, load time, recent swaps, rejected versions and predictions per version.
+        """
+        with self._lock:
+            return {
+                "versao_ativa": self.versao,
+                "carregado_em": self._carregado_em,
+                "trocas": list(self._trocas),
+                "rejeitadas": {v: erro for v, (_, erro) in self._rejeitadas.items()},
+                "previsoes_por_versao": dict(self._previsoes),
+            }
@@ -0,0 +1,181 @@
+# Univesp - Projeto Integrador IV - Engenharia de Computação - 2º Semestre 2025
+# Desenvolvido por: Eliezer Tavares de Oliveira (principal), Anderson Vianna Ferrari, Efrain Tobal Tavares, Lucas de Goes Vieira Junior
+# EN: This file implements confidence-based audit triage. Why? Every full request and every collected URL paid for a Chromium + Axe audit, even when the model was already confident from the static HTML. How? MC-dropout uncertainty of the quick prediction decides whether the audit runs; each decision, and the error observed when the audit did run, is appended to a JSONL log used to tune the threshold.
+# PT: Este arquivo implementa a triagem de auditorias por confiança. Por quê? Toda requisição completa e toda URL coletada pagavam uma auditoria Chromium + Axe, mesmo quando o modelo já estava confiante a partir do HTML estático. Como? A incerteza MC-dropout da previsão rápida decide se a auditoria roda; cada decisão, e o erro observado quando a auditoria rodou, é acrescentada a um log JSONL usado para calibrar o limiar.
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from utils.modelo import AMOSTRAS_MC, ModeloAcessibilidade
+
+logger = logging.getLogger(__name__)
+
+# EN: Triage settings. Why? Off unless a threshold is set; the right value depends on the audit budget. How? PREVISIA_TRIAGEM_LIMIAR is the maximum uncertainty (score points) accepted without an audit; a PREVISIA_TRIAGEM_CONTROLE share of confident URLs is audited anyway to measure the error of skipping.
+# PT: Configuração da triagem. Por quê? Desligada sem um limiar definido; o valor certo depende do orçamento de auditorias. Como? PREVISIA_TRIAGEM_LIMIAR é a incerteza máxima (pontos de score) aceita sem auditoria; uma fração PREVISIA_TRIAGEM_CONTROLE das URLs confiantes é auditada mesmo assim para medir o erro de pular.
+LIMIAR_TRIAGEM = float(os.environ.get("PREVISIA_TRIAGEM_LIMIAR", 0))
+FRACAO_CONTROLE = float(os.environ.get("PREVISIA_TRIAGEM_CONTROLE", 0.05))
+ARQUIVO_REGISTRO_TRIAGEM = os.environ.get(
+    "PREVISIA_TRIAGEM_REGISTRO", "data/triagem.jsonl"
+)
+
+# Motivos da decisão
+INCERTA = "incerta"
+CONTROLE = "controle"
+CONFIANTE = "confiante"
+
+
+def _sorteio_controle(url: str) -> float:
+    # Valor em [0, 1) fixo por URL: a mesma URL cai (ou não) no controle em toda execução
+    resumo = hashlib.sha256(url.encode("utf-8")).digest()
+    return int.from_bytes(resumo[:8], "big") / 2**64
+
+
+class Triagem:
+    """
+    Decides which URLs need a full audit and logs the decisions.
+
+    :param modelo: Default model (a loaded ModeloAcessibilidade); avaliar/avaliar_lote accept another one per call.
+    :param limiar: Maximum uncertainty (score points) accepted without an audit.
+    :param fracao_controle: Share of confident URLs audited anyway (0 disables).
+    :param caminho_registro: JSONL decision log.
+    :param origem: Label written to each record ("app" or "coleta").
+    :param amostras: MC-dropout passes per prediction.
+
+    EN: Why? The audit is the expensive step; the static prediction is cheap and often good enough. How? avaliar_lote() scores a batch in one pass; registrar() appends one JSON line per decision (thread-safe), with the Axe score and absolute error when an audit ran. Control URLs are chosen by a hash of the URL, so resumed runs make the same choice.
+    PT: Por quê? A auditoria é a etapa cara; a previsão estática é barata e muitas vezes suficiente. Como? avaliar_lote() pontua um lote em uma passada; registrar() acrescenta uma linha JSON por decisão (thread-safe), com o score do Axe e o erro absoluto quando uma auditoria rodou. As URLs de controle são escolhidas por um hash da URL, então execuções retomadas fazem a mesma escolha.
+    """
+
+    def __init__(
+        self,
+        modelo: ModeloAcessibilidade,
+        limiar: float = LIMIAR_TRIAGEM,
+        fracao_controle: float = FRACAO_CONTROLE,
+        caminho_registro: str = ARQUIVO_REGISTRO_TRIAGEM,
+        origem: str = "app",
+        amostras: int = AMOSTRAS_MC,
+    ):
+        if limiar <= 0:
+            raise ValueError(f"Limiar de triagem deve ser positivo: {limiar}")
+        self.modelo = modelo
+        self.limiar = limiar
+        self.fracao_controle = fracao_controle
+        self.caminho_registro = caminho_registro
+        self.origem = origem
+        self.amostras = amostras
+        self._lock = threading.Lock()
+
+    def avaliar_lote(self, itens: list, modelo: ModeloAcessibilidade = None) -> list:
+        """
+        Triage decisions for a batch.
+
+        :param itens: (url, quick-analysis features) pairs.
+        :param modelo: Model to score with (default: the one given at construction), e.g. the version pinned to a web request.
+        :return: One dict per pair with url, score (quick prediction), incerteza, auditar (bool), motivo (INCERTA, CONTROLE or CONFIANTE) and versao_modelo.
+        """
+        modelo = modelo or self.modelo
+        previsoes = modelo.prever_com_incerteza(
+            [features for _, features in itens], self.amostras
+        )
+        decisoes = []
+        for (url, _), (score, incerteza) in zip(itens, previsoes):
+            if incerteza > self.limiar:
+                motivo = INCERTA
+            elif _sorteio_controle(url) < self.fracao_controle:
+                motivo = CONTROLE
+            else:
+                motivo = CONFIANTE
+            decisoes.append(
+                {
+                    "url": url,
+                    "score": score,
+                    "incerteza": incerteza,
+                    "auditar": motivo != CONFIANTE,
+                    "motivo": motivo,
+                    "versao_modelo": modelo.versao,
+                }
+            )
+        return decisoes
+
+    def avaliar(
+        self, url: str, features: dict, modelo: ModeloAcessibilidade = None
+    ) -> dict:
+        """
+        Triage decision for one URL (see avaliar_lote).
+        """
+        return self.avaliar_lote([(url, features)], modelo)[0]
+
+    def registrar(self, decisao: dict, score_auditoria: int = None) -> None:
+        """
+        Appends a decision to the JSONL log.
+
+        :param decisao: Dict from avaliar/avaliar_lote.
+        :param score_auditoria: Axe score of the full audit, when it ran and succeeded (the observed error is computed from it).
+        """
+        registro = {
+            "em": round(time.time(), 3),
+            "origem": self.origem,
+            "url": decisao["url"],
+            "score_rapido": decisao["score"],
+            "incerteza": decisao["incerteza"],
+            "limiar": self.limiar,
+            "versao_modelo": decisao.get("versao_modelo"),
+            "auditada": decisao["auditar"],
+            "motivo": decisao["motivo"],
+            "score_auditoria": score_auditoria,
+            "erro": (
+                None
+                if score_auditoria is None
+                else abs(decisao["score"] - score_auditoria)
+            ),
+        }
+        logger.info("Triage decision", extra={"dados": registro})
+        linha = json.dumps(registro, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.caminho_registro) or ".", exist_ok=True)
+            with open(self.caminho_registro, "a", encoding="utf-8") as f:
+                f.write(linha)
+
+
+def resumir_registro(
+    caminho: str = ARQUIVO_REGISTRO_TRIAGEM, limiares: list = None
+) -> list:
+    """
+    Estimates, from a decision log, the audit share and skipping error per threshold.
+
+    :param caminho: JSONL decision log.
+    :param limiares: Candidate thresholds (default: the uncertainty quartiles found in the log).
+    :return: One dict per threshold with limiar, fracao_auditada, erro_medio_pulando (mean observed error of audited records below it) and amostras_erro.
+
+    EN: Why? Tuning trades audits for error. How? Any record with an observed error whose uncertainty is below a candidate threshold is an example of what skipping would have cost; control audits supply those examples below the current threshold.
+    PT: Por quê? Calibrar troca auditorias por erro. Como? Todo registro com erro observado cuja incerteza está abaixo de um limiar candidato é um exemplo do que pular teria custado; as auditorias de controle fornecem esses exemplos abaixo do limiar atual.
+    """
+    incertezas, observados = [], []
+    with open(caminho, encoding="utf-8") as f:
+        for texto in f:
+            registro = json.loads(texto)
+            incertezas.append(registro["incerteza"])
+            if registro["erro"] is not None:
+                observados.append((registro["incerteza"], registro["erro"]))
+    if not incertezas:
+        return []
+    if limiares is None:
+        ordenadas = sorted(incertezas)
+        limiares = sorted(
+            {ordenadas[int(len(ordenadas) * q)] for q in (0.25, 0.5, 0.75)}
+        )
+    resumo = []
+    for limiar in limiares:
+        erros = [erro for incerteza, erro in observados if incerteza <= limiar]
+        resumo.append(
+            {
+                "limiar": limiar,
+                "fracao_auditada": sum(i > limiar for i in incertezas)
+                / len(incertezas),
+                "erro_medio_pulando": sum(erros) / len(erros) if erros else None,
+                "amostras_erro": len(erros),
+            }
+        )
+    return resumo
@@ -8,13 +8,9 @@ import urllib.parse
 import re
 import logging
 
-# EN: Setup logging for URL validation. Why? To track which URLs are filtered and why, aiding debugging.
-# PT: Configura o logging para validação de URLs. Por quê? Para rastrear quais URLs são filtradas e por quê, auxiliando na depuração.
-logging.basicConfig(
-    filename="erros_validate_url.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+# EN: Module logger for URL validation; handlers are installed by the entry point (utils.log). Why? To track which URLs are filtered and why, aiding debugging.
+# PT: Logger do módulo de validação de URLs; os handlers são instalados pelo ponto de entrada (utils.log). Por quê? Para rastrear quais URLs são filtradas e por quê, auxiliando na depuração.
+logger = logging.getLogger(__name__)
 
 
 def is_navigable_url(url: str) -> bool:
@@ -32,8 +28,8 @@ def is_navigable_url(url: str) -> bool:
         # PT: Analisa a URL para extrair esquema e domínio. Por quê? Para validar o formato e evitar URLs malformadas.
         parsed = urllib.parse.urlparse(url)
         if not parsed.scheme in ("http", "https"):
-            logging.warning(
-                f"EN: Invalid scheme for {url}. PT: Esquema inválido para {url}."
+            logger.warning(
+                "EN: Invalid scheme for %s. PT: Esquema inválido para %s.", url, url
             )
             return False
 
@@ -41,8 +37,10 @@ def is_navigable_url(url: str) -> bool:
         # PT: Verifica padrões de domínio para excluir os não navegáveis comuns. Por quê? Evita CDNs sem listas fixas.
         cdn_patterns = r"\.(cdn|cloudfront|akamai|edgekey|edgesuite|msedge|akamaiedge|fastly|fbcdn|azurefd|aws)\."
         if re.search(cdn_patterns, parsed.netloc):
-            logging.info(
-                f"EN: Excluded CDN-like domain {parsed.netloc}. PT: Excluído domínio tipo CDN {parsed.netloc}."
+            logger.info(
+                "EN: Excluded CDN-like domain %s. PT: Excluído domínio tipo CDN %s.",
+                parsed.netloc,
+                parsed.netloc,
             )
             return False
 
@@ -53,21 +51,46 @@ def is_navigable_url(url: str) -> bool:
         )
         with urllib.request.urlopen(req, timeout=5) as response:
             if response.status != 200:
-                logging.warning(
-                    f"EN: Non-200 status for {url}: {response.status}. PT: Status não-200 para {url}: {response.status}."
+                logger.warning(
+                    "EN: Non-200 status for %s: %s. PT: Status não-200 para %s: %s.",
+                    url,
+                    response.status,
+                    url,
+                    response.status,
                 )
                 return False
             content_type = response.headers.get("Content-Type", "")
             if "text/html" not in content_type.lower():
-                logging.info(
-                    f"EN: Non-HTML content for {url}: {content_type}. PT: Conteúdo não-HTML para {url}: {content_type}."
+                logger.info(
+                    "EN: Non-HTML content for %s: %s. PT: Conteúdo não-HTML para %s: %s.",
+                    url,
+                    content_type,
+                    url,
+                    content_type,
                 )
                 return False
 
         return True
 
     except Exception as e:
-        logging.error(
-            f"EN: Error validating {url}: {str(e)}. PT: Erro ao validar {url}: {str(e)}."
+        logger.error(
+            "EN: Error validating %s: %s. PT: Erro ao validar %s: %s.", url, e, url, e
         )
         return False
+
+
+def normalizar_url(url: str) -> str:
+    """
+    Normalizes a URL for equality checks (lowercase scheme/host, no fragment, no trailing slash).
+
+    :param url: URL to normalize.
+    :return: Normalized URL.
+
+    EN: Why? Dedup and the feature store must treat "https://Site.com/" and "https://site.com" as the same key. How? urllib.parse split/unsplit.
+    PT: Por quê? A deduplicação e o armazém de features devem tratar "https://Site.com/" e "https://site.com" como a mesma chave. Como? split/unsplit do urllib.parse.
+    """
+    partes = urllib.parse.urlsplit(url)
+    caminho = partes.path.rstrip("/")
+    return urllib.parse.urlunsplit(
+        (partes.scheme.lower(), partes.netloc.lower(), caminho, partes.query, "")
+    )